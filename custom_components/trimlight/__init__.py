@@ -1,27 +1,50 @@
 from __future__ import annotations
 
+import logging
+from datetime import datetime, timedelta
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_CLIENT_ID, CONF_CLIENT_SECRET
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
 
 from .api import TrimlightApi, TrimlightCredentials
+from .cassette import CassetteRecorder
 from .const import (
+    CASSETTE_FLUSH_INTERVAL_SECONDS,
+    CASSETTE_MAX_BYTES,
+    CONF_BASE_URL,
     CONF_COMMIT_CUSTOM_PRESET,
     CONF_DEBUG_LOGGING,
     CONF_DEVICE_ID,
+    CONF_RECORD_API_TRAFFIC,
+    DEFAULT_BASE_URL,
     DEFAULT_COMMIT_CUSTOM_PRESET,
     DEFAULT_DEBUG_LOGGING,
+    DEFAULT_RECORD_API_TRAFFIC,
     DOMAIN,
-    build_builtin_presets_from_effects,
     build_builtin_presets_static,
 )
 from .coordinator import TrimlightCoordinator
 from .data import TrimlightData
-from .debug import async_log_event, get_debug_log_path
+from .services import async_setup_services
+from .debug import async_log_event, get_cassette_path, get_debug_log_path
+from .groups import async_fetch_groups
 from .storage import get_debug_cache_path, load_preset_cache, setup_preset_cache_listener
 
-PLATFORMS: list[str] = ["light", "select", "button", "sensor", "number"]
+_LOGGER = logging.getLogger(__name__)
+
+PLATFORMS: list[str] = ["light", "select", "button", "sensor", "number", "switch"]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -31,8 +54,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         client_secret=data[CONF_CLIENT_SECRET],
         device_id=data[CONF_DEVICE_ID],
     )
-    api = TrimlightApi(async_get_clientsession(hass), creds)
-    coordinator = TrimlightCoordinator(hass, api)
+    api = TrimlightApi(
+        async_get_clientsession(hass),
+        creds,
+        base_url=data.get(CONF_BASE_URL, DEFAULT_BASE_URL),
+    )
+    debug_logging = entry.options.get(CONF_DEBUG_LOGGING, DEFAULT_DEBUG_LOGGING)
+    if entry.options.get(CONF_RECORD_API_TRAFFIC, DEFAULT_RECORD_API_TRAFFIC):
+        # Record API traffic so it can be replayed offline with CassettePlayer.
+        recorder = CassetteRecorder(get_cassette_path(hass, entry.entry_id), max_bytes=CASSETTE_MAX_BYTES)
+        api.recorder = recorder
+
+        @callback
+        def _flush_cassette(_now: datetime | None = None) -> None:
+            hass.async_add_executor_job(recorder.flush)
+
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass, _flush_cassette, timedelta(seconds=CASSETTE_FLUSH_INTERVAL_SECONDS)
+            )
+        )
+        entry.async_on_unload(_flush_cassette)
+    coordinator = TrimlightCoordinator(hass, api, capture_raw=debug_logging)
 
     store, builtins, custom_cache = await load_preset_cache(hass, entry.entry_id)
     runtime = TrimlightData(
@@ -47,21 +90,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         commit_custom_preset=entry.options.get(
             CONF_COMMIT_CUSTOM_PRESET, DEFAULT_COMMIT_CUSTOM_PRESET
         ),
-        debug_logging=entry.options.get(CONF_DEBUG_LOGGING, DEFAULT_DEBUG_LOGGING),
+        debug_logging=debug_logging,
     )
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = runtime
 
     await coordinator.async_config_entry_first_refresh()
     if not runtime.builtins_refreshed:
-        effects = (coordinator.data or {}).get("effects") or []
-        builtins = build_builtin_presets_from_effects(effects)
+        builtins = list(coordinator.catalog.builtin_presets)
         if not builtins:
             builtins = build_builtin_presets_static()
         if builtins:
             runtime.builtins = builtins
             runtime.builtins_refreshed = True
 
+    try:
+        groups = await async_fetch_groups(api)
+    except Exception as exc:  # noqa: BLE001
+        _LOGGER.debug("Trimlight group list unavailable: %s", exc)
+        groups = []
+    runtime.groups = [group for group in groups if group.master_device_id == creds.device_id]
+
     await async_log_event(
         hass,
         runtime,
@@ -72,9 +121,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "debug_logging": runtime.debug_logging,
         },
         debug_log_path=runtime.debug_log_path,
+        groups=[group.name for group in runtime.groups],
     )
 
-    setup_preset_cache_listener(hass, runtime, coordinator)
+    entry.async_on_unload(setup_preset_cache_listener(hass, runtime, coordinator))
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
     return True
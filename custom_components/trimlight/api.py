@@ -6,11 +6,18 @@ import hmac
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import aiohttp
 import async_timeout
 
+from .const import DEFAULT_BASE_URL, MAX_SEGMENT_PIXELS
+
+if TYPE_CHECKING:
+    from .cassette import CassetteRecorder
+
+_SOLID_PAYLOAD_CACHE_SIZE = 64
+
 
 @dataclass(frozen=True)
 class TrimlightCredentials:
@@ -24,13 +31,17 @@ class TrimlightApi:
         self,
         session: aiohttp.ClientSession,
         creds: TrimlightCredentials,
-        base_url: str = "https://trimlight.ledhue.com/trimlight",
+        base_url: str = DEFAULT_BASE_URL,
         timeout_s: float = 10.0,
+        recorder: CassetteRecorder | None = None,
     ) -> None:
         self._session = session
         self._creds = creds
         self._base_url = base_url.rstrip("/")
         self._timeout_s = timeout_s
+        self.recorder = recorder
+        # Color pickers revisit the same colors; reuse their request bodies.
+        self._solid_payloads: dict[tuple[int, int, int], dict[str, Any]] = {}
 
     def _timestamp_ms(self) -> int:
         return int(time.time() * 1000)
@@ -60,6 +71,31 @@ class TrimlightApi:
         *,
         params: dict[str, Any] | None = None,
         payload: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        recorder = self.recorder
+        if recorder is None:
+            return await self._send(method, path, params=params, payload=payload)
+
+        started = time.monotonic()
+        try:
+            response = await self._send(method, path, params=params, payload=payload)
+        except Exception as exc:
+            recorder.record(
+                method, path, params=params, payload=payload, started_monotonic=started, error=exc
+            )
+            raise
+        recorder.record(
+            method, path, params=params, payload=payload, started_monotonic=started, response=response
+        )
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        payload: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
         url = self._url(path)
         headers = self._headers()
@@ -74,17 +110,28 @@ class TrimlightApi:
                 resp.raise_for_status()
                 return await resp.json()
 
-    async def get_devices(self, page: int = 0) -> dict[str, Any]:
-        path = "/v1/oauth/resources/devices"
+    async def _get_with_post_fallback(self, path: str, body: dict[str, Any]) -> dict[str, Any]:
+        # The documented GET endpoints are rejected by some API deployments; POST works there.
         try:
-            return await self._request("GET", path, params={"page": page})
+            return await self._request("GET", path, params=body)
         except aiohttp.ClientResponseError as exc:
             if exc.status != 405:
                 raise
         except aiohttp.ContentTypeError:
             pass
 
-        return await self._request("POST", path, payload={"page": page})
+        return await self._request("POST", path, payload=body)
+
+    async def get_devices(self, page: int = 0) -> dict[str, Any]:
+        return await self._get_with_post_fallback("/v1/oauth/resources/devices", {"page": page})
+
+    async def get_group_list(self, page: int = 0) -> dict[str, Any]:
+        """List groups; page 0 returns every group."""
+        return await self._get_with_post_fallback("/v1/oauth/resources/groups", {"page": page})
+
+    async def sync_group(self, group_id: str) -> dict[str, Any]:
+        """Copy the group's master device state to the other group members."""
+        return await self._get_with_post_fallback("/v1/oauth/resources/group/sync", {"groupId": group_id})
 
     async def get_device_detail(self) -> dict[str, Any]:
         payload = {
@@ -120,19 +167,25 @@ class TrimlightApi:
         }
         return await self._request("POST", "/v1/oauth/resources/device/effect/preview", payload=payload)
 
-    async def preview_solid(self, rgb_hex: str, brightness: int = 255) -> dict[str, Any]:
+    async def preview_solid(
+        self, rgb_hex: str, brightness: int = 255, pixel_count: int = MAX_SEGMENT_PIXELS
+    ) -> dict[str, Any]:
         rgb_hex = rgb_hex.strip().lstrip("#")
-        color_int = int(rgb_hex, 16)
-        payload = {
-            "deviceId": self._creds.device_id,
-            "payload": {
-                "category": 1,
-                "mode": 0,
-                "speed": 0,
-                "brightness": int(brightness),
-                "pixels": [{"index": 0, "count": 60, "color": color_int, "disable": False}],
-            },
-        }
+        key = (int(rgb_hex, 16), int(brightness), int(pixel_count))
+        payload = self._solid_payloads.get(key)
+        if payload is None:
+            if len(self._solid_payloads) >= _SOLID_PAYLOAD_CACHE_SIZE:
+                self._solid_payloads.pop(next(iter(self._solid_payloads)))
+            payload = self._solid_payloads[key] = {
+                "deviceId": self._creds.device_id,
+                "payload": {
+                    "category": 1,
+                    "mode": 0,
+                    "speed": 0,
+                    "brightness": key[1],
+                    "pixels": [{"index": 0, "count": key[2], "color": key[0], "disable": False}],
+                },
+            }
         return await self._request("POST", "/v1/oauth/resources/device/effect/preview", payload=payload)
 
     async def preview_effect(
@@ -230,6 +283,61 @@ class TrimlightApi:
         payload = {"deviceId": self._creds.device_id, "payload": {"id": int(effect_id)}}
         return await self._request("POST", "/v1/oauth/resources/device/effect/view", payload=payload)
 
+    async def delete_effect(self, effect_id: int) -> dict[str, Any]:
+        payload = {"deviceId": self._creds.device_id, "payload": {"id": int(effect_id)}}
+        return await self._request("POST", "/v1/oauth/resources/device/effect/delete", payload=payload)
+
+    async def set_combined_effect(self, effect_ids: list[int], interval: int) -> dict[str, Any]:
+        payload = {
+            "deviceId": self._creds.device_id,
+            "payload": {
+                "effectIds": [int(effect_id) for effect_id in effect_ids],
+                "interval": int(interval),
+            },
+        }
+        return await self._request(
+            "POST", "/v1/oauth/resources/device/combined-effect/save", payload=payload
+        )
+
+    async def set_overlay_effects(self, overlays: list[dict[str, int]]) -> dict[str, Any]:
+        """Replace the overlay list; an empty list removes every overlay."""
+        payload = {
+            "deviceId": self._creds.device_id,
+            "payload": {"overlayEffects": [dict(overlay) for overlay in overlays]},
+        }
+        return await self._request("POST", "/v1/oauth/resources/device/effect/overlay", payload=payload)
+
+    async def save_daily_schedule(self, schedule: dict[str, Any]) -> dict[str, Any]:
+        now = datetime.now()
+        payload = {
+            "deviceId": self._creds.device_id,
+            "payload": {**schedule, "currentDate": {"month": now.month, "day": now.day}},
+        }
+        return await self._request("POST", "/v1/oauth/resources/device/daily/save", payload=payload)
+
+    async def save_calendar_schedule(self, schedule: dict[str, Any]) -> dict[str, Any]:
+        payload = {"deviceId": self._creds.device_id, "payload": dict(schedule)}
+        return await self._request("POST", "/v1/oauth/resources/device/calendar/save", payload=payload)
+
+    async def delete_calendar_schedule(self, schedule_id: int) -> dict[str, Any]:
+        payload = {"deviceId": self._creds.device_id, "payload": {"id": int(schedule_id)}}
+        return await self._request("POST", "/v1/oauth/resources/device/calendar/delete", payload=payload)
+
+    async def backup_device_data(self, backup_time: str) -> dict[str, Any]:
+        """Ask the cloud to store a backup; ``backup_time`` is "yyyy-MM-dd HH:mm:ss TZ"."""
+        payload = {"deviceId": self._creds.device_id, "payload": {"backupTime": backup_time}}
+        return await self._request("POST", "/v1/oauth/resources/device/data/backup", payload=payload)
+
+    async def get_device_backup(self) -> dict[str, Any]:
+        payload = {"deviceId": self._creds.device_id}
+        return await self._request("POST", "/v1/oauth/resources/device/data/backup/get", payload=payload)
+
+    async def restore_device_backup(self, backup_key: str) -> dict[str, Any]:
+        payload = {"deviceId": self._creds.device_id, "payload": {"backupKey": backup_key}}
+        return await self._request(
+            "POST", "/v1/oauth/resources/device/data/backup/restore", payload=payload
+        )
+
     @staticmethod
     def _current_date_payload() -> dict[str, int]:
         now = datetime.now()
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Mapping
+
+from .catalog import effect_content_hash
+from .models import Effect
+from .overlays import plan_overlays
+from .schedules import SchedulePlan, plan_calendar, plan_daily
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+BACKUP_STORAGE_VERSION = 1
+BACKUP_STORAGE_KEY = "trimlight_backups"
+
+# Row-valued sections are stored as lists of blob hashes so identical rows are
+# kept once across every snapshot in the store.
+_ROW_SECTIONS = ("custom_effects", "daily", "calendar")
+_VALUE_SECTIONS = ("combined_effect", "overlay_effects")
+
+
+def backup_timestamp(now: datetime) -> str:
+    """Format ``now`` the way the cloud backup endpoint expects: "yyyy-MM-dd HH:mm:ss TZ"."""
+    return f"{now:%Y-%m-%d %H:%M:%S} {now.tzname() or 'UTC'}"
+
+
+def capture_snapshot(coordinator_data: Mapping[str, Any]) -> dict[str, Any]:
+    """Pick the restorable controller state out of the coordinator's catalog view."""
+    combined = coordinator_data.get("combined_effect") or {}
+    return {
+        "custom_effects": [dict(effect) for effect in coordinator_data.get("custom_effects") or []],
+        "daily": [dict(row) for row in coordinator_data.get("daily") or []],
+        "calendar": [dict(row) for row in coordinator_data.get("calendar") or []],
+        "combined_effect": {
+            "effectIds": list(combined.get("effectIds") or []),
+            "interval": combined.get("interval"),
+        },
+        "overlay_effects": [dict(row) for row in coordinator_data.get("overlay_effects") or []],
+    }
+
+
+def snapshot_hash(content: Mapping[str, Any]) -> str:
+    return effect_content_hash(content)
+
+
+@dataclass(slots=True)
+class RestorePlan:
+    """Writes needed to bring a controller back to a stored snapshot.
+
+    ``id_map`` maps snapshot effect ids to the ids they have on this
+    controller. Effects in ``new_effects`` are saved with id -1 and only get
+    their id once the controller has stored them.
+    """
+
+    effect_saves: list[Effect] = field(default_factory=list)
+    effect_deletes: list[int] = field(default_factory=list)
+    schedules: SchedulePlan = field(default_factory=SchedulePlan)
+    combined_effect: dict[str, Any] | None = None
+    overlay_effects: list[dict[str, int]] | None = None
+    unchanged_effects: int = 0
+    id_map: dict[int, int] = field(default_factory=dict)
+    new_effects: dict[int, Effect] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.effect_saves
+            or self.effect_deletes
+            or self.schedules
+            or self.combined_effect is not None
+            or self.overlay_effects is not None
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "effect_saves": [{"id": effect.get("id"), "name": effect.get("name")} for effect in self.effect_saves],
+            "effect_deletes": list(self.effect_deletes),
+            "unchanged_effects": self.unchanged_effects,
+            "id_map": dict(self.id_map),
+            "schedules": self.schedules.as_dict(),
+            "combined_effect": self.combined_effect,
+            "overlay_effects": self.overlay_effects,
+        }
+
+
+def _effect_body_hash(effect: Mapping[str, Any]) -> str:
+    # Ids differ between controllers and the saved category reads back as 1 or 2.
+    return effect_content_hash({key: value for key, value in effect.items() if key not in ("id", "category")})
+
+
+def _effect_name(effect: Mapping[str, Any]) -> str:
+    return (effect.get("name") or "").strip()
+
+
+def plan_effect_restore(
+    snapshot: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    same_device: bool,
+    prune_effects: bool = False,
+) -> RestorePlan:
+    """Match snapshot effects to the controller's and plan the effect writes.
+
+    On the controller the snapshot came from, effects are matched by id first.
+    Otherwise, as after a factory reset or on a replacement controller, ids
+    mean nothing and effects are matched by content, then by name (updated in
+    place). Unmatched effects are saved as new with id -1. Controller effects
+    nothing matched are only deleted with ``prune_effects``.
+    """
+    plan = RestorePlan()
+    unclaimed = {
+        int(effect["id"]): effect
+        for effect in current.get("custom_effects") or []
+        if effect.get("id") is not None
+    }
+
+    def _claim(snapshot_id: int, effect: Mapping[str, Any], match: Mapping[str, Any]) -> None:
+        match_id = int(match["id"])
+        del unclaimed[match_id]
+        plan.id_map[snapshot_id] = match_id
+        if _effect_body_hash(match) == _effect_body_hash(effect):
+            plan.unchanged_effects += 1
+        else:
+            plan.effect_saves.append({**effect, "id": match_id})
+
+    pending: list[Mapping[str, Any]] = []
+    for effect in snapshot.get("custom_effects") or []:
+        if effect.get("id") is None:
+            continue
+        match = unclaimed.get(int(effect["id"])) if same_device else None
+        if match is not None:
+            _claim(int(effect["id"]), effect, match)
+        else:
+            pending.append(effect)
+
+    unmatched: list[Mapping[str, Any]] = []
+    for effect in pending:
+        body = _effect_body_hash(effect)
+        match = next((row for row in unclaimed.values() if _effect_body_hash(row) == body), None)
+        if match is not None:
+            _claim(int(effect["id"]), effect, match)
+        else:
+            unmatched.append(effect)
+
+    for effect in unmatched:
+        name = _effect_name(effect)
+        match = next((row for row in unclaimed.values() if name and _effect_name(row) == name), None)
+        if match is not None:
+            _claim(int(effect["id"]), effect, match)
+        else:
+            new_effect = {**effect, "id": -1}
+            plan.new_effects[int(effect["id"])] = new_effect
+            plan.effect_saves.append(new_effect)
+
+    if prune_effects:
+        plan.effect_deletes = sorted(unclaimed)
+    return plan
+
+
+def resolve_new_effect_ids(plan: RestorePlan, current_effects: list[Mapping[str, Any]]) -> list[str]:
+    """Find the ids the controller gave to effects saved as new; returns names not found.
+
+    An exact content match is preferred; a name match covers fields the
+    controller fills in on save.
+    """
+    claimed = set(plan.id_map.values())
+    missing: list[str] = []
+    for snapshot_id, effect in plan.new_effects.items():
+        candidates = [
+            row for row in current_effects if row.get("id") is not None and int(row["id"]) not in claimed
+        ]
+        body = _effect_body_hash(effect)
+        name = _effect_name(effect)
+        match = next((row for row in candidates if _effect_body_hash(row) == body), None) or next(
+            (row for row in candidates if name and _effect_name(row) == name), None
+        )
+        if match is None:
+            missing.append(_effect_name(effect))
+            continue
+        plan.id_map[snapshot_id] = int(match["id"])
+        claimed.add(int(match["id"]))
+    return missing
+
+
+def plan_link_restore(snapshot: Mapping[str, Any], current: Mapping[str, Any], plan: RestorePlan) -> RestorePlan:
+    """Plan schedules, the combined effect and overlays with effect ids mapped onto this controller.
+
+    Run it once every id in ``plan.id_map`` is known. Ids the snapshot does not
+    hold as custom effects (built-in effects) are kept as they are. Schedules
+    reuse the schedule manager's slot diffing, and the calendar is replaced as
+    a whole.
+    """
+
+    def _remap(effect_id: Any) -> Any:
+        if effect_id is None:
+            return None
+        return plan.id_map.get(int(effect_id), effect_id)
+
+    plan_daily(
+        {
+            row["id"]: {**row, "effectId": _remap(row.get("effectId"))}
+            for row in snapshot.get("daily") or []
+            if row.get("id") is not None
+        },
+        list(current.get("daily") or []),
+        plan.schedules,
+    )
+    plan_calendar(
+        [{**row, "effectId": _remap(row.get("effectId"))} for row in snapshot.get("calendar") or []],
+        list(current.get("calendar") or []),
+        plan.schedules,
+    )
+
+    wanted = snapshot.get("combined_effect") or {}
+    wanted_ids = [_remap(effect_id) for effect_id in wanted.get("effectIds") or []]
+    have = current.get("combined_effect") or {}
+    if wanted_ids and (
+        wanted_ids != list(have.get("effectIds") or []) or wanted.get("interval") != have.get("interval")
+    ):
+        plan.combined_effect = {"effectIds": wanted_ids, "interval": wanted.get("interval")}
+
+    plan.overlay_effects = plan_overlays(
+        list(current.get("overlay_effects") or []),
+        replace=[
+            {**overlay, "targetEffect": _remap(overlay.get("targetEffect"))}
+            for overlay in snapshot.get("overlay_effects") or []
+        ],
+    )
+    return plan
+
+
+class BackupStore:
+    """Named controller snapshots kept in Home Assistant storage.
+
+    Rows are stored once under their content hash and snapshots only list the
+    hashes, so backing up many controllers with the same presets stays small.
+    The store is shared by every config entry, which lets a snapshot taken on
+    one controller be restored onto another.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        # Imported here so the snapshot and restore planning above loads without Home Assistant.
+        from homeassistant.helpers.storage import Store
+
+        self._store = Store(hass, BACKUP_STORAGE_VERSION, BACKUP_STORAGE_KEY)
+        self._snapshots: dict[str, dict[str, Any]] = {}
+        self._blobs: dict[str, Any] = {}
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        if self._loaded:
+            return
+        stored = await self._store.async_load() or {}
+        self._snapshots = dict(stored.get("snapshots") or {})
+        self._blobs = dict(stored.get("blobs") or {})
+        self._loaded = True
+
+    def names(self) -> list[str]:
+        return sorted(self._snapshots)
+
+    def info(self, name: str) -> dict[str, Any] | None:
+        record = self._snapshots.get(name)
+        if record is None:
+            return None
+        return {key: value for key, value in record.items() if key != "sections"}
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        record = self._snapshots.get(name)
+        if record is None:
+            return None
+        sections = record["sections"]
+        content: dict[str, Any] = {
+            section: [dict(self._blobs[row_hash]) for row_hash in sections.get(section) or []]
+            for section in _ROW_SECTIONS
+        }
+        for section in _VALUE_SECTIONS:
+            content[section] = sections.get(section)
+        return content
+
+    async def async_save(
+        self,
+        name: str,
+        content: Mapping[str, Any],
+        *,
+        device_id: str,
+        created_at: str,
+        cloud_backup: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        sections: dict[str, Any] = {}
+        for section in _ROW_SECTIONS:
+            hashes = []
+            for row in content.get(section) or []:
+                row_hash = effect_content_hash(row)
+                self._blobs.setdefault(row_hash, dict(row))
+                hashes.append(row_hash)
+            sections[section] = hashes
+        for section in _VALUE_SECTIONS:
+            sections[section] = content.get(section)
+
+        self._snapshots[name] = {
+            "name": name,
+            "device_id": device_id,
+            "created_at": created_at,
+            "content_hash": snapshot_hash(content),
+            "cloud_backup": cloud_backup,
+            "sections": sections,
+        }
+        self._drop_unreferenced_blobs()
+        await self._store.async_save({"snapshots": self._snapshots, "blobs": self._blobs})
+        return self.info(name) or {}
+
+    async def async_delete(self, name: str) -> bool:
+        if self._snapshots.pop(name, None) is None:
+            return False
+        self._drop_unreferenced_blobs()
+        await self._store.async_save({"snapshots": self._snapshots, "blobs": self._blobs})
+        return True
+
+    def _drop_unreferenced_blobs(self) -> None:
+        referenced = {
+            row_hash
+            for record in self._snapshots.values()
+            for section in _ROW_SECTIONS
+            for row_hash in record["sections"].get(section) or []
+        }
+        self._blobs = {row_hash: row for row_hash, row in self._blobs.items() if row_hash in referenced}
+
+
+def get_backup_store(hass: HomeAssistant) -> BackupStore:
+    store = hass.data.get(BACKUP_STORAGE_KEY)
+    if store is None:
+        store = hass.data[BACKUP_STORAGE_KEY] = BackupStore(hass)
+    return store
@@ -5,7 +5,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import build_builtin_presets_from_effects, build_builtin_presets_static
+from .const import build_builtin_presets_static
 from .data import get_data
 from .debug import async_log_event
 from .entity import TrimlightEntity
@@ -21,6 +21,7 @@ async def async_setup_entry(
 
 class TrimlightRefreshButton(TrimlightEntity, ButtonEntity):
     _attr_name = "Trimlight Refresh Presets"
+    _coordinator_view = "catalog"
 
     def __init__(self, hass: HomeAssistant, entry_id: str, coordinator) -> None:
         super().__init__(hass, entry_id, coordinator)
@@ -36,8 +37,7 @@ class TrimlightRefreshButton(TrimlightEntity, ButtonEntity):
         )
 
         if not data.builtins_refreshed:
-            effects = (data.coordinator.data or {}).get("effects") or []
-            builtins = build_builtin_presets_from_effects(effects)
+            builtins = list(data.coordinator.catalog.builtin_presets)
             if not builtins:
                 builtins = build_builtin_presets_static()
             if builtins:
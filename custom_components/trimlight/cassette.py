@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import aiohttp
+
+from .api import TrimlightApi, TrimlightCredentials
+
+CASSETTE_FORMAT = "trimlight-cassette"
+CASSETTE_VERSION = 1
+
+# Request keys that differ per device or per call and are not worth keeping
+# (or matching on) in a cassette, at any depth: schedule saves nest
+# currentDate inside "payload".
+_VOLATILE_PAYLOAD_KEYS = ("deviceId", "currentDate")
+
+
+def _strip_volatile(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _strip_volatile(item) for key, item in value.items() if key not in _VOLATILE_PAYLOAD_KEYS
+        }
+    if isinstance(value, list):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def _request_key(method: str, path: str, params: Any, payload: Any) -> str:
+    return json.dumps([method.upper(), path, params, payload], sort_keys=True, separators=(",", ":"))
+
+
+@dataclass(slots=True)
+class CassetteEntry:
+    offset_ms: float
+    duration_ms: float
+    method: str
+    path: str
+    params: dict[str, Any] | None
+    payload: dict[str, Any] | None
+    response: dict[str, Any] | None = None
+    error: str | None = None
+    status: int | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        record: dict[str, Any] = {
+            "t": self.offset_ms,
+            "d": self.duration_ms,
+            "m": self.method,
+            "p": self.path,
+        }
+        if self.params is not None:
+            record["q"] = self.params
+        if self.payload is not None:
+            record["b"] = self.payload
+        if self.response is not None:
+            record["r"] = self.response
+        if self.error is not None:
+            record["e"] = self.error
+        if self.status is not None:
+            record["s"] = self.status
+        return record
+
+    @classmethod
+    def from_dict(cls, record: dict[str, Any]) -> "CassetteEntry":
+        return cls(
+            offset_ms=float(record.get("t", 0.0)),
+            duration_ms=float(record.get("d", 0.0)),
+            method=str(record["m"]),
+            path=str(record["p"]),
+            params=record.get("q"),
+            payload=record.get("b"),
+            response=record.get("r"),
+            error=record.get("e"),
+            status=record.get("s"),
+        )
+
+    @property
+    def key(self) -> str:
+        return _request_key(self.method, self.path, self.params, self.payload)
+
+
+class CassetteRecorder:
+    """Collects TrimlightApi._request traffic as compact JSON lines.
+
+    ``record`` only buffers in memory; ``flush`` does the blocking file write
+    and is meant to run in an executor on a timer. With ``max_bytes``, a file
+    that has grown past the limit is moved to ``<path>.1`` (replacing any older
+    one) and a new session is started.
+    """
+
+    def __init__(self, path: str, *, max_bytes: int | None = None) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self._pending: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin: float | None = None
+        self._header_written = False
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None,
+        payload: dict[str, Any] | None,
+        started_monotonic: float,
+        response: dict[str, Any] | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        now = time.monotonic()
+        if self._origin is None:
+            self._origin = started_monotonic
+        status = getattr(error, "status", None) if error is not None else None
+        entry = CassetteEntry(
+            offset_ms=round((started_monotonic - self._origin) * 1000, 1),
+            duration_ms=round((now - started_monotonic) * 1000, 1),
+            method=method.upper(),
+            path=path,
+            params=params,
+            payload=_strip_volatile(payload),
+            response=response,
+            error=f"{type(error).__name__}: {error}" if error is not None else None,
+            status=status if isinstance(status, int) else None,
+        )
+        with self._lock:
+            self._pending.append(entry.as_dict())
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            if self.max_bytes is not None and os.path.exists(self.path):
+                if os.path.getsize(self.path) >= self.max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+                    self._header_written = False
+            with open(self.path, "a", encoding="utf-8") as handle:
+                if not self._header_written:
+                    header = {
+                        "format": CASSETTE_FORMAT,
+                        "version": CASSETTE_VERSION,
+                        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+                    }
+                    handle.write(json.dumps(header, separators=(",", ":")))
+                    handle.write("\n")
+                    self._header_written = True
+                for record in pending:
+                    handle.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+                    handle.write("\n")
+
+
+class CassetteMismatchError(Exception):
+    """Raised when replay receives a request the cassette has no response for."""
+
+
+def load_cassette(path: str) -> list[CassetteEntry]:
+    """Load entries from a cassette file.
+
+    A file may hold several recording sessions; each session restarts at its
+    own header and offsets are made continuous across them.
+    """
+    entries: list[CassetteEntry] = []
+    base_offset = 0.0
+    session_end = 0.0
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("format") == CASSETTE_FORMAT:
+                if int(record.get("version", 0)) > CASSETTE_VERSION:
+                    raise ValueError(f"Unsupported cassette version: {record.get('version')}")
+                base_offset = session_end
+                continue
+            entry = CassetteEntry.from_dict(record)
+            entry.offset_ms += base_offset
+            session_end = max(session_end, entry.offset_ms + entry.duration_ms)
+            entries.append(entry)
+    return entries
+
+
+class CassettePlayer:
+    """Serves recorded responses back in place of the cloud API.
+
+    Requests are matched against unused entries with the same method, path,
+    params and payload, in recorded order; when nothing matches exactly, the
+    next unused entry for the same method and path is used unless ``strict``.
+    ``realtime`` replays each response after its recorded duration, otherwise
+    responses are returned as fast as possible.
+    """
+
+    def __init__(
+        self,
+        entries: list[CassetteEntry],
+        *,
+        realtime: bool = False,
+        strict: bool = False,
+        speed: float = 1.0,
+    ) -> None:
+        self.entries = entries
+        self.realtime = realtime
+        self.strict = strict
+        self.speed = speed
+        self._used = [False] * len(entries)
+        self.served: list[CassetteEntry] = []
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs: Any) -> "CassettePlayer":
+        return cls(load_cassette(path), **kwargs)
+
+    @property
+    def remaining(self) -> int:
+        return self._used.count(False)
+
+    def _take(self, method: str, path: str, params: Any, payload: Any) -> CassetteEntry:
+        key = _request_key(method, path, params, payload)
+        fallback: int | None = None
+        for index, entry in enumerate(self.entries):
+            if self._used[index] or entry.method != method or entry.path != path:
+                continue
+            if entry.key == key:
+                fallback = index
+                break
+            if fallback is None and not self.strict:
+                fallback = index
+        if fallback is None:
+            raise CassetteMismatchError(f"No recorded response for {method} {path} {payload}")
+        self._used[fallback] = True
+        return self.entries[fallback]
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        payload: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        entry = self._take(method.upper(), path, params, _strip_volatile(payload))
+        self.served.append(entry)
+        if self.realtime and entry.duration_ms > 0:
+            await asyncio.sleep(entry.duration_ms / 1000.0 / self.speed)
+        if entry.error is not None:
+            if entry.status is not None:
+                raise aiohttp.ClientResponseError(
+                    None,  # type: ignore[arg-type]
+                    (),
+                    status=entry.status,
+                    message=entry.error,
+                )
+            if entry.error.startswith("TimeoutError"):
+                raise asyncio.TimeoutError(entry.error)
+            raise aiohttp.ClientError(entry.error)
+        return dict(entry.response or {})
+
+
+class ReplayTrimlightApi(TrimlightApi):
+    """TrimlightApi that answers every request from a cassette."""
+
+    def __init__(self, player: CassettePlayer, creds: TrimlightCredentials | None = None) -> None:
+        super().__init__(
+            None,  # type: ignore[arg-type]
+            creds or TrimlightCredentials(client_id="replay", client_secret="replay", device_id="replay"),
+        )
+        self.player = player
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: dict[str, Any] | None = None,
+        payload: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        return await self.player.request(method, path, params=params, payload=payload)
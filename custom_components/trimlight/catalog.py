@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+from .const import builtin_preset_from_effect
+from .effects import normalize_effect_mode
+from .models import BuiltinPreset, Effect
+
+
+def effect_content_hash(effect: Mapping[str, Any]) -> str:
+    encoded = json.dumps(effect, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class CatalogChanges:
+    added: list[int] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+    modified: list[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    def as_dict(self) -> dict[str, list[int]]:
+        return {"added": self.added, "removed": self.removed, "modified": self.modified}
+
+
+@dataclass(slots=True)
+class _CatalogEntry:
+    content_hash: str
+    effect_id: int | None
+    category: int | None
+    custom: Effect | None = None
+    builtin: BuiltinPreset | None = None
+    builtin_source: Effect | None = None
+
+
+class EffectCatalog:
+    """Normalized view of the device effect catalog, rebuilt incrementally.
+
+    Each raw effect is keyed by its content hash so unchanged rows are reused
+    as-is between polls; only added, removed or modified effects are
+    normalized again.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, _CatalogEntry] = {}
+        self._order: tuple[str, ...] = ()
+        self.builtin_effects: list[Effect] = []
+        self.custom_effects: list[Effect] = []
+        self.builtin_presets: list[BuiltinPreset] = []
+        self.fingerprint: str | None = None
+
+    def update(self, effects: list[Effect]) -> CatalogChanges:
+        hashes = tuple(effect_content_hash(effect) for effect in effects)
+        if hashes == self._order:
+            return CatalogChanges()
+
+        previous = self._entries
+        entries: dict[str, _CatalogEntry] = {}
+        for content_hash, effect in zip(hashes, effects):
+            if content_hash in entries:
+                continue
+            entry = previous.get(content_hash)
+            if entry is None:
+                entry = self._build_entry(content_hash, effect)
+            entries[content_hash] = entry
+
+        changes = self._diff(previous, entries)
+        self._entries = entries
+        self._order = hashes
+        self.fingerprint = hashlib.sha1("".join(hashes).encode("ascii")).hexdigest()
+
+        ordered = [entries[content_hash] for content_hash in dict.fromkeys(hashes)]
+        self.builtin_effects = [e.builtin_source for e in ordered if e.builtin is not None]
+        self.custom_effects = sorted(
+            (e.custom for e in ordered if e.custom is not None),
+            key=lambda e: e.get("id", 9999),
+        )
+        self.builtin_presets = sorted(
+            (e.builtin for e in ordered if e.builtin is not None),
+            key=lambda r: (r.get("mode", 0), r.get("name", "")),
+        )
+        return changes
+
+    @staticmethod
+    def _build_entry(content_hash: str, effect: Effect) -> _CatalogEntry:
+        category = effect.get("category")
+        entry = _CatalogEntry(
+            content_hash=content_hash,
+            effect_id=effect.get("id"),
+            category=category,
+        )
+        # Devices may report custom effects as category 1 or 2 depending on firmware/API.
+        if category in (1, 2):
+            custom = dict(effect)
+            normalize_effect_mode(custom)
+            entry.custom = custom
+        elif category == 0:
+            entry.builtin = builtin_preset_from_effect(effect)
+            entry.builtin_source = effect
+        return entry
+
+    @staticmethod
+    def _diff(
+        previous: Mapping[str, _CatalogEntry], current: Mapping[str, _CatalogEntry]
+    ) -> CatalogChanges:
+        previous_ids = {
+            e.effect_id: e.content_hash for e in previous.values() if e.effect_id is not None
+        }
+        current_ids = {
+            e.effect_id: e.content_hash for e in current.values() if e.effect_id is not None
+        }
+        return CatalogChanges(
+            added=sorted(i for i in current_ids if i not in previous_ids),
+            removed=sorted(i for i in previous_ids if i not in current_ids),
+            modified=sorted(
+                i for i, h in current_ids.items() if i in previous_ids and previous_ids[i] != h
+            ),
+        )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import time
+from typing import Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+
+@dataclass(slots=True)
+class CommandIntent:
+    name: str
+    task: asyncio.Task
+    started_monotonic: float
+    followup: bool = False
+
+
+class CommandPipeline:
+    """Per-device command pipeline where the newest intent wins.
+
+    Submitting an intent cancels the in-flight one at its next await point and
+    waits for it to unwind before the new sequence starts. Follow-ups such as
+    delayed reapplies never preempt a running command; they are dropped.
+    """
+
+    def __init__(self) -> None:
+        self._active: CommandIntent | None = None
+
+    @property
+    def active(self) -> CommandIntent | None:
+        active = self._active
+        if active is None or active.task.done():
+            return None
+        return active
+
+    def submit(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        sequence: Callable[[], Awaitable[None]],
+        *,
+        followup: bool = False,
+    ) -> tuple[CommandIntent | None, CommandIntent | None]:
+        """Start a command; returns (started intent or None if dropped, superseded intent)."""
+        previous = self.active
+        if followup and previous is not None:
+            return None, None
+        if previous is not None:
+            previous.task.cancel()
+
+        async def _run() -> None:
+            if previous is not None:
+                await asyncio.wait({previous.task})
+            await sequence()
+
+        intent = CommandIntent(
+            name=name,
+            task=hass.async_create_task(_run()),
+            started_monotonic=time.monotonic(),
+            followup=followup,
+        )
+        self._active = intent
+        return intent, previous
@@ -13,8 +13,10 @@ from .const import (
     CONF_COMMIT_CUSTOM_PRESET,
     CONF_DEBUG_LOGGING,
     CONF_DEVICE_ID,
+    CONF_RECORD_API_TRAFFIC,
     DEFAULT_COMMIT_CUSTOM_PRESET,
     DEFAULT_DEBUG_LOGGING,
+    DEFAULT_RECORD_API_TRAFFIC,
     DOMAIN,
 )
 
@@ -77,6 +79,10 @@ class TrimlightOptionsFlow(config_entries.OptionsFlow):
                     CONF_DEBUG_LOGGING,
                     default=options.get(CONF_DEBUG_LOGGING, DEFAULT_DEBUG_LOGGING),
                 ): bool,
+                vol.Optional(
+                    CONF_RECORD_API_TRAFFIC,
+                    default=options.get(CONF_RECORD_API_TRAFFIC, DEFAULT_RECORD_API_TRAFFIC),
+                ): bool,
             }
         )
 
@@ -1,28 +1,48 @@
 from .presets import BUILTIN_ANIMATIONS
 
 DOMAIN = "trimlight"
+DEFAULT_BASE_URL = "https://trimlight.ledhue.com/trimlight"
 
 DEFAULT_POLL_INTERVAL_SECONDS = 600
 FORCED_ON_GRACE_SECONDS = 20
+CONFIRMED_POWER_STATE_MAX_AGE_SECONDS = 300
 VERIFY_REFRESH_DELAY_SECONDS = 5
 
+# The controller cycles through up to five saved effects; schedules refer to
+# that playlist by a fixed effect id.
+COMBINED_EFFECT_ID = 200
+MAX_COMBINED_EFFECTS = 5
+
+# Custom effect pixels are run-length segments: up to 30 of them, each
+# covering at most 60 pixels. The pattern repeats along the strip.
+MAX_PIXEL_SEGMENTS = 30
+MAX_SEGMENT_PIXELS = 60
+
 CONF_DEVICE_ID = "device_id"
+# Not exposed in the config flow; lets tooling point an entry at a local API.
+CONF_BASE_URL = "base_url"
 CONF_COMMIT_CUSTOM_PRESET = "commit_custom_preset"
 CONF_DEBUG_LOGGING = "debug_logging"
+CONF_RECORD_API_TRAFFIC = "record_api_traffic"
 DEFAULT_COMMIT_CUSTOM_PRESET = True
 DEFAULT_DEBUG_LOGGING = False
+DEFAULT_RECORD_API_TRAFFIC = False
+
+# A cassette past this size is rotated to a single ".1" file before the next write.
+CASSETTE_MAX_BYTES = 5 * 1024 * 1024
+CASSETTE_FLUSH_INTERVAL_SECONDS = 30
+
+
+def builtin_preset_from_effect(effect: dict) -> dict:
+    name = (effect.get("name") or "").strip()
+    if not name:
+        mode = effect.get("mode")
+        name = BUILTIN_ANIMATIONS.get(mode, f"Mode {mode}")
+    return {"id": effect.get("id", effect.get("mode")), "name": name, "mode": effect.get("mode")}
 
 
 def build_builtin_presets_from_effects(effects: list[dict]) -> list[dict]:
-    builtins = []
-    for e in effects:
-        if e.get("category") != 0:
-            continue
-        name = (e.get("name") or "").strip()
-        if not name:
-            mode = e.get("mode")
-            name = BUILTIN_ANIMATIONS.get(mode, f"Mode {mode}")
-        builtins.append({"id": e.get("id", e.get("mode")), "name": name, "mode": e.get("mode")})
+    builtins = [builtin_preset_from_effect(e) for e in effects if e.get("category") == 0]
     builtins.sort(key=lambda r: (r.get("mode", 0), r.get("name", "")))
     return builtins
 
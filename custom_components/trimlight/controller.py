@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from .api import TrimlightApi
 from .data import TrimlightData
@@ -14,9 +14,66 @@ from .effects import (
     find_custom_preset_by_state,
     get_effect_mode,
     infer_builtin_preview_params,
+    solid_color_of,
+    solid_pixel_count,
 )
+from .overlays import plan_overlays
 
 _CUSTOM_EFFECT_UPDATE_SECOND_RUN_DELAY_SECONDS = 0.9
+_CUSTOM_EFFECT_SAVE_BATCH_SECONDS = 0.3
+_SOLID_COLOR_BATCH_SECONDS = 0.15
+
+
+def _custom_preset_unchanged(
+    data: TrimlightData,
+    preset: dict[str, Any],
+    effect_id: int,
+    brightness: int,
+    speed: int,
+) -> bool:
+    if effect_id in data.pending_custom_saves or data.custom_save_in_flight_id == effect_id:
+        return False
+    try:
+        return int(preset["brightness"]) == brightness and int(preset["speed"]) == speed
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+async def _save_custom_preset_batched(
+    api: TrimlightApi, data: TrimlightData, effect_id: int
+) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+    """Save the newest pending edit for a custom preset.
+
+    Edits that arrive during the short batch window or while the save is in
+    flight only replace the pending values, so a burst of slider changes ends
+    in a single save of the final values. Returns (None, None) when another
+    call already saved the pending edit.
+
+    The callers of queued edits have already returned, so a queued edit is
+    saved even when the save before it failed; only the last result is
+    returned.
+    """
+    async with data.custom_save_lock:
+        data.custom_save_in_flight_id = effect_id
+        try:
+            await asyncio.sleep(_CUSTOM_EFFECT_SAVE_BATCH_SECONDS)
+            effect = data.pending_custom_saves.pop(effect_id, None)
+            if effect is None:
+                return None, None
+            while True:
+                try:
+                    response = await api.save_effect(
+                        effect, int(effect["brightness"]), speed=int(effect["speed"])
+                    )
+                except Exception:
+                    if effect_id not in data.pending_custom_saves:
+                        raise
+                else:
+                    if effect_id not in data.pending_custom_saves:
+                        return response, effect
+                effect = data.pending_custom_saves.pop(effect_id)
+        finally:
+            data.custom_save_in_flight_id = None
 
 
 def _update_custom_preset_cache(
@@ -80,14 +137,25 @@ async def apply_effect_update(
     *,
     brightness: int | None = None,
     speed: int | None = None,
+    preview_only: bool = False,
 ) -> None:
+    """Apply brightness/speed to whatever is running.
+
+    With ``preview_only`` a custom preset is previewed instead of saved, even
+    when presets are committed; transitions use it for their intermediate steps.
+    """
     brightness = data.last_brightness if brightness is None else int(brightness)
     speed = data.last_speed if speed is None else int(speed)
 
     current_effect = (coordinator_data or {}).get("current_effect") or {}
     effect_id = (coordinator_data or {}).get("current_effect_id")
+    solid_color = solid_color_of(current_effect) if effect_id in (None, -1) else None
+    if solid_color is not None:
+        # A previewed solid color has no preset behind it; keep the color.
+        await apply_solid_color(data, solid_color, brightness)
+        return
     category = (coordinator_data or {}).get("current_effect_category")
-    effects = coordinator_data.get("effects") or []
+    effects = coordinator_data.get("builtin_effects") or []
 
     async def _apply_builtin_match(
         match: dict[str, Any],
@@ -219,49 +287,75 @@ async def apply_effect_update(
             updated_match["brightness"] = int(brightness)
             updated_match["speed"] = int(speed)
 
-            response: dict[str, Any]
+            response: dict[str, Any] | None
             run_response: dict[str, Any] | None = None
             second_run_response: dict[str, Any] | None = None
             committed = False
+            save_skipped = False
+            coalesced = False
             effect_match_id = int(match.get("id")) if match.get("id") is not None else effect_id
 
-            if data.commit_custom_preset and effect_match_id is not None:
-                response = await api.save_effect(updated_match, brightness, speed=speed)
-                if response.get("code") == 0:
-                    committed = True
+            if data.commit_custom_preset and not preview_only and effect_match_id is not None:
+                if _custom_preset_unchanged(data, match, effect_match_id, brightness, speed):
+                    # The stored preset already has these values; just run it.
+                    save_skipped = True
                     run_response = await api.run_effect(effect_match_id)
-                    if run_response.get("code") != 0:
-                        response = dict(response)
-                        response["_run_effect_response"] = run_response
+                    response = run_response
+                else:
+                    data.pending_custom_saves[effect_match_id] = updated_match
+                    if data.custom_save_in_flight_id == effect_match_id:
+                        # The in-flight save picks up these values when it finishes.
+                        response = None
                     else:
-                        should_second_run = True
-                        pending = data.pending_transition
-                        if (
-                            pending is not None
-                            and pending.target_kind == "custom"
-                            and pending.target_id not in (None, effect_match_id)
-                        ):
-                            should_second_run = False
-                        latest_selected = find_custom_preset_by_name(
-                            presets, data.last_selected_custom_preset
-                        )
-                        latest_selected_id = (
-                            int(latest_selected.get("id"))
-                            if latest_selected is not None and latest_selected.get("id") is not None
-                            else None
+                        response, saved_effect = await _save_custom_preset_batched(
+                            api, data, effect_match_id
                         )
-                        if latest_selected_id not in (None, effect_match_id):
-                            should_second_run = False
-                        if should_second_run:
-                            await asyncio.sleep(_CUSTOM_EFFECT_UPDATE_SECOND_RUN_DELAY_SECONDS)
-                            second_run_response = await api.run_effect(effect_match_id)
-                            if second_run_response.get("code") != 0:
-                                response = dict(response)
-                                response["_second_run_effect_response"] = second_run_response
+                        if saved_effect is not None:
+                            updated_match = saved_effect
+                            brightness = int(saved_effect["brightness"])
+                            speed = int(saved_effect["speed"])
+                    coalesced = response is None
+                    if response is not None and response.get("code") == 0:
+                        committed = True
+                        run_response = await api.run_effect(effect_match_id)
+                        if run_response.get("code") != 0:
+                            response = dict(response)
+                            response["_run_effect_response"] = run_response
+
+                if run_response is not None and run_response.get("code") == 0:
+                    should_second_run = True
+                    pending = data.pending_transition
+                    if (
+                        pending is not None
+                        and pending.target_kind == "custom"
+                        and pending.target_id not in (None, effect_match_id)
+                    ):
+                        should_second_run = False
+                    latest_selected = find_custom_preset_by_name(
+                        presets, data.last_selected_custom_preset
+                    )
+                    latest_selected_id = (
+                        int(latest_selected.get("id"))
+                        if latest_selected is not None and latest_selected.get("id") is not None
+                        else None
+                    )
+                    if latest_selected_id not in (None, effect_match_id):
+                        should_second_run = False
+                    if should_second_run:
+                        await asyncio.sleep(_CUSTOM_EFFECT_UPDATE_SECOND_RUN_DELAY_SECONDS)
+                        second_run_response = await api.run_effect(effect_match_id)
+                        if second_run_response.get("code") != 0:
+                            response = dict(response or {})
+                            response["_second_run_effect_response"] = second_run_response
             else:
                 response = await api.preview_effect(updated_match, brightness, speed=speed)
 
-            if response.get("code") == 0 and (run_response is None or run_response.get("code") == 0):
+            succeeded = coalesced or (
+                response is not None
+                and response.get("code") == 0
+                and (run_response is None or run_response.get("code") == 0)
+            )
+            if succeeded:
                 effect_name = (match.get("name") or "").strip()
                 if effect_name:
                     data.last_selected_preset = effect_name
@@ -283,7 +377,14 @@ async def apply_effect_update(
                     brightness=brightness,
                     speed=speed,
                 )
-            event_name = "effect_update_save_custom" if committed else "effect_update_preview_custom"
+            if coalesced:
+                event_name = "effect_update_save_coalesced"
+            elif save_skipped:
+                event_name = "effect_update_run_custom"
+            elif committed:
+                event_name = "effect_update_save_custom"
+            else:
+                event_name = "effect_update_preview_custom"
             await async_log_event(
                 data.coordinator.hass,
                 data,
@@ -298,6 +399,7 @@ async def apply_effect_update(
                 run_response=run_response,
                 second_run_response=second_run_response,
                 committed=committed,
+                save_skipped=save_skipped,
             )
             return
 
@@ -378,3 +480,125 @@ async def apply_effect_update(
             )
             return
         await _apply_builtin_match(match, matched_via="current_state")
+
+
+def next_solid_color_request(data: TrimlightData) -> int:
+    """Number a solid color request in the order it was made."""
+    data.solid_color_requests += 1
+    return data.solid_color_requests
+
+
+async def apply_solid_color(
+    data: TrimlightData,
+    color: int,
+    brightness: int,
+    *,
+    request: int | None = None,
+    before_send: Callable[[], Awaitable[Any]] | None = None,
+) -> dict[str, Any] | None:
+    """Preview one solid color, coalescing bursts of changes.
+
+    The state is updated optimistically right away. Calls that arrive during
+    the batch window or while a preview is in flight only replace the pending
+    color, and the lock holder previews the newest one before it releases the
+    lock. ``request`` is the number from ``next_solid_color_request`` taken
+    when the color was asked for; a call that reaches here after a newer
+    request is dropped. ``before_send`` (for example switching the controller
+    on) runs while holding the lock. Returns None when another call sends the
+    color or a newer one replaced it.
+    """
+    if request is None:
+        request = next_solid_color_request(data)
+    if request < data.solid_color_queued:
+        return None
+    data.solid_color_queued = request
+    coordinator = data.coordinator
+    data.pending_solid_color = (int(color), int(brightness))
+    pixel_count = solid_pixel_count((coordinator.data or {}).get("ports"))
+    solid_effect = {
+        "id": -1,
+        "category": 1,
+        "mode": 0,
+        "speed": 0,
+        "brightness": int(brightness),
+        "pixels": [{"index": 0, "count": pixel_count, "color": int(color), "disable": False}],
+    }
+    _optimistically_apply_effect_update(
+        data, coordinator.data or {}, solid_effect, effect_id=-1, brightness=brightness, speed=0
+    )
+    if data.solid_color_lock.locked():
+        return None
+
+    response: dict[str, Any] | None = None
+    sent = 0
+    async with data.solid_color_lock:
+        if before_send is not None:
+            await before_send()
+        await asyncio.sleep(_SOLID_COLOR_BATCH_SECONDS)
+        # No await between the last check and releasing the lock, so every
+        # color set while it is held is either sent here or finds it free.
+        while data.pending_solid_color is not None:
+            color, brightness = data.pending_solid_color
+            data.pending_solid_color = None
+            response = await data.api.preview_solid(f"{color:06x}", brightness, pixel_count=pixel_count)
+            sent += 1
+            if response.get("code") != 0:
+                data.pending_solid_color = None
+                break
+    await async_log_event(
+        coordinator.hass,
+        data,
+        "solid_color_preview",
+        coordinator_data=coordinator.data or {},
+        color=f"#{color:06x}",
+        requested_brightness=brightness,
+        pixel_count=pixel_count,
+        previews_sent=sent,
+        response=response,
+    )
+    return response
+
+
+async def apply_overlay_update(
+    data: TrimlightData,
+    *,
+    add: list[dict[str, int]] | None = None,
+    remove: list[dict[str, int]] | None = None,
+    replace: list[dict[str, int]] | None = None,
+    source: str,
+) -> dict[str, Any] | None:
+    """Write the overlay list only when it differs from the controller's.
+
+    Returns the API response, or None when the update was a no-op.
+    """
+    coordinator = data.coordinator
+    async with data.overlay_lock:
+        coord = coordinator.data or {}
+        current = coord.get("overlay_effects") or []
+        desired = plan_overlays(current, add=add or (), remove=remove or (), replace=replace)
+        if desired is None:
+            await async_log_event(
+                coordinator.hass,
+                data,
+                "overlay_update_skipped",
+                coordinator_data=coord,
+                source=source,
+                overlays=current,
+            )
+            return None
+
+        response = await data.api.set_overlay_effects(desired)
+        await async_log_event(
+            coordinator.hass,
+            data,
+            "overlay_update",
+            coordinator_data=coord,
+            source=source,
+            previous=current,
+            overlays=desired,
+            response=response,
+        )
+        if response.get("code") == 0:
+            # The next poll re-reads the catalog view, so no verification refresh is needed.
+            coordinator.async_set_updated_data({**(coordinator.data or {}), "overlay_effects": desired})
+        return response
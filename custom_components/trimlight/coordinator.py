@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import time
+from dataclasses import dataclass
 from datetime import timedelta
-from typing import Any
+from typing import Any, Callable
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import TrimlightApi
-from .const import DEFAULT_POLL_INTERVAL_SECONDS
-from .effects import normalize_custom_effects, normalize_effect_mode
+from .catalog import CatalogChanges, EffectCatalog
+from .const import CONFIRMED_POWER_STATE_MAX_AGE_SECONDS, DEFAULT_POLL_INTERVAL_SECONDS
+from .effects import normalize_effect_mode
 
 
 def _is_placeholder_off_state(
@@ -42,8 +47,52 @@ def _is_placeholder_off_state(
     return True
 
 
+@dataclass(slots=True)
+class ConfirmedPowerState:
+    """Power state last reported by the controller itself.
+
+    Only device detail responses and successful switch commands update this;
+    optimistic UI updates never do.
+    """
+
+    is_on: bool | None = None
+    confirmed_monotonic: float | None = None
+    source: str | None = None
+
+    def confirm(self, is_on: bool | None, source: str) -> None:
+        self.is_on = is_on
+        self.confirmed_monotonic = time.monotonic() if is_on is not None else None
+        self.source = source
+
+    def is_known_on(self, max_age_s: float = CONFIRMED_POWER_STATE_MAX_AGE_SECONDS) -> bool:
+        if self.is_on is not True or self.confirmed_monotonic is None:
+            return False
+        return time.monotonic() - self.confirmed_monotonic <= float(max_age_s)
+
+
+_CATALOG_KEYS = ("effects", "daily", "calendar", "combinedEffect", "overlayEffects", "ports")
+
+
+def _catalog_fingerprint(payload: dict[str, Any]) -> str:
+    sections = {key: payload.get(key) for key in _CATALOG_KEYS}
+    encoded = json.dumps(sections, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
 class TrimlightCoordinator(DataUpdateCoordinator[dict[str, Any]]):
-    def __init__(self, hass: HomeAssistant, api: TrimlightApi) -> None:
+    """Polls device detail and splits it into a status view and a catalog view.
+
+    The status view (switch state and current effect) is parsed on every
+    refresh. The catalog view (effects, schedules, combined and overlay
+    effects, ports) is only re-parsed when its fingerprint changes.
+    ``catalog_revision`` goes up whenever the catalog view in ``data`` is
+    replaced, whether by a refresh or by ``async_set_updated_data``, and catalog
+    listeners are only notified in that case.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, api: TrimlightApi, *, capture_raw: bool = False
+    ) -> None:
         self._logger = logging.getLogger(__name__)
         super().__init__(
             hass,
@@ -52,6 +101,82 @@ class TrimlightCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             update_interval=timedelta(seconds=DEFAULT_POLL_INTERVAL_SECONDS),
         )
         self._api = api
+        self.capture_raw = capture_raw
+        self.raw_data: dict[str, Any] | None = None
+        self.catalog = EffectCatalog()
+        self.catalog_changes = CatalogChanges()
+        self._catalog_fingerprint: str | None = None
+        self._catalog_view: dict[str, Any] = {
+            "builtin_effects": [],
+            "custom_effects": [],
+            "daily": [],
+            "calendar": [],
+            "combined_effect": None,
+            "overlay_effects": [],
+            "ports": [],
+        }
+        self.catalog_revision = 0
+        self._notified_catalog: tuple[Any, ...] | None = None
+        self._catalog_listeners: list[CALLBACK_TYPE] = []
+        self.power_state = ConfirmedPowerState()
+
+    @callback
+    def async_add_catalog_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for catalog changes only, not for every status refresh."""
+        self._catalog_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in self._catalog_listeners:
+                self._catalog_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        # Catalog sections are replaced rather than mutated, so comparing their
+        # identities is enough to spot a change, including optimistic pushes.
+        data = self.data or {}
+        catalog = tuple(data.get(key) for key in self._catalog_view)
+        notified = self._notified_catalog
+        catalog_changed = notified is None or any(
+            new is not old for new, old in zip(catalog, notified)
+        )
+        if catalog_changed:
+            self._notified_catalog = catalog
+            self.catalog_revision += 1
+        super().async_update_listeners()
+        if not catalog_changed:
+            return
+        for update_callback in list(self._catalog_listeners):
+            update_callback()
+
+    def _refresh_catalog(self, payload: dict[str, Any]) -> dict[str, Any]:
+        # Partial payloads without an effects list carry no catalog information.
+        if payload.get("effects") is None:
+            return self._catalog_view
+
+        fingerprint = _catalog_fingerprint(payload)
+        if fingerprint == self._catalog_fingerprint:
+            self.catalog_changes = CatalogChanges()
+            return self._catalog_view
+
+        # Unchanged effects are reused from the previous update so coordinator
+        # snapshots keep pointing at one shared copy.
+        self.catalog_changes = self.catalog.update(payload.get("effects") or [])
+        if self.catalog_changes:
+            self._logger.debug("Trimlight effect catalog changed: %s", self.catalog_changes.as_dict())
+        self._catalog_fingerprint = fingerprint
+        self._catalog_view = {
+            "builtin_effects": self.catalog.builtin_effects,
+            "custom_effects": self.catalog.custom_effects,
+            "daily": list(payload.get("daily") or []),
+            "calendar": list(payload.get("calendar") or []),
+            "combined_effect": payload.get("combinedEffect"),
+            "overlay_effects": list(payload.get("overlayEffects") or []),
+            "ports": list(payload.get("ports") or []),
+        }
+        return self._catalog_view
 
     async def _async_update_data(self) -> dict[str, Any]:
         try:
@@ -59,9 +184,14 @@ class TrimlightCoordinator(DataUpdateCoordinator[dict[str, Any]]):
         except Exception as exc:  # noqa: BLE001
             raise UpdateFailed(str(exc)) from exc
 
+        # Raw responses are only retained for debugging; entities work from the
+        # parsed fields below.
+        self.raw_data = data if self.capture_raw else None
+
         payload = (data.get("payload") or {}) if isinstance(data, dict) else {}
-        effects = (payload.get("effects") or []) if isinstance(payload, dict) else []
-        custom_effects = normalize_custom_effects(effects)
+        if not isinstance(payload, dict):
+            payload = {}
+        catalog_view = self._refresh_catalog(payload)
 
         current_effect = dict(payload.get("currentEffect") or {})
         normalize_effect_mode(current_effect)
@@ -90,21 +220,19 @@ class TrimlightCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 "Device detail returned placeholder state after power-on; preserving previous coordinator state"
             )
             preserved = dict(previous)
-            preserved.update(
-                {
-                    "raw": data,
-                    "payload": payload,
-                    "effects": effects or previous.get("effects", []),
-                    "custom_effects": custom_effects or previous.get("custom_effects", []),
-                }
-            )
+            preserved.update(catalog_view)
+            preserved["device_id"] = payload.get("deviceId") or previous.get("device_id")
             return preserved
 
+        if switch_state is not None:
+            # 2 is timer mode, where the lights follow the schedule.
+            self.power_state.confirm(
+                {0: False, 1: True}.get(switch_state), "device_detail"
+            )
+
         return {
-            "raw": data,
-            "payload": payload,
-            "effects": effects,
-            "custom_effects": custom_effects,
+            **catalog_view,
+            "device_id": payload.get("deviceId") or previous.get("device_id"),
             "current_effect": current_effect,
             "current_effect_id": current_effect_id,
             "current_effect_category": current_category,
@@ -8,8 +8,10 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
 
 from .api import TrimlightApi
+from .commands import CommandPipeline
 from .const import DOMAIN
 from .coordinator import TrimlightCoordinator
+from .groups import TrimlightGroup
 from .models import BuiltinPreset, Effect, Pixel
 
 
@@ -57,6 +59,22 @@ class TrimlightData:
     pending_transition: PendingTransition | None = None
     pending_speed: int | None = None
     pending_speed_until: float | None = None
+    pending_custom_saves: dict[int, Effect] = field(default_factory=dict)
+    custom_save_in_flight_id: int | None = None
+    custom_save_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    commands: CommandPipeline = field(default_factory=CommandPipeline)
+    # Newest requested (color, brightness); a burst of picker changes is sent once.
+    pending_solid_color: tuple[int, int] | None = None
+    # Numbers handed out to color requests, and the newest one queued so far.
+    solid_color_requests: int = 0
+    solid_color_queued: int = 0
+    solid_color_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Smoothed preview call latency, used to size brightness transition steps.
+    preview_latency_s: float | None = None
+    # Overlay writes replace the whole list, so read-modify-write must not interleave.
+    overlay_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Groups whose master device is this entry's controller.
+    groups: list[TrimlightGroup] = field(default_factory=list)
     debug_log_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
 
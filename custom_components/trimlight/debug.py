@@ -19,6 +19,10 @@ def get_debug_log_path(hass: HomeAssistant, entry_id: str) -> str:
     return hass.config.path(f"trimlight_debug_{entry_id}.jsonl")
 
 
+def get_cassette_path(hass: HomeAssistant, entry_id: str) -> str:
+    return hass.config.path(f"trimlight_cassette_{entry_id}.jsonl")
+
+
 def snapshot_coordinator_state(coordinator_data: Mapping[str, Any] | None) -> dict[str, Any]:
     data = coordinator_data or {}
     current_effect = dict(data.get("current_effect") or {})
@@ -37,7 +41,10 @@ def snapshot_coordinator_state(coordinator_data: Mapping[str, Any] | None) -> di
 
 
 def snapshot_runtime_state(data: TrimlightData) -> dict[str, Any]:
+    power_state = data.coordinator.power_state
     return {
+        "confirmed_power_on": power_state.is_on,
+        "confirmed_power_source": power_state.source,
         "last_brightness": data.last_brightness,
         "last_speed": data.last_speed,
         "last_selected_preset": data.last_selected_preset,
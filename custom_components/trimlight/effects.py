@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from typing import Any, Iterable, Mapping
 
+from .const import MAX_SEGMENT_PIXELS
 from .models import BuiltinPreset, Effect
 
 _EFFECT_MODE_KEYS = ("effectMode", "effect_mode", "effect_mode_id", "modeId")
@@ -69,6 +71,112 @@ def find_custom_preset_by_name(
     return None
 
 
+def find_saved_effect_by_name(
+    custom_effects: Iterable[Effect], builtin_effects: Iterable[Effect], name: str | None
+) -> Effect | None:
+    """Resolve a preset name or "name (id N)" label to an effect saved on the controller."""
+    if not name:
+        return None
+    wanted = name.strip()
+    custom_effects = list(custom_effects)
+    if " (id " in wanted and wanted.endswith(")"):
+        try:
+            effect_id = int(wanted.rsplit(" (id ", 1)[1][:-1])
+        except ValueError:
+            effect_id = None
+        match = find_custom_preset_by_id(custom_effects, effect_id)
+        if match is not None:
+            return match
+    match = find_custom_preset_by_name(custom_effects, wanted)
+    if match is not None:
+        return match
+    return next((e for e in builtin_effects if (e.get("name") or "").strip() == wanted), None)
+
+
+def saved_effect_name(
+    custom_effects: Iterable[Effect], builtin_effects: Iterable[Effect], effect_id: int
+) -> str:
+    for effect in (*custom_effects, *builtin_effects):
+        if effect.get("id") == effect_id:
+            return (effect.get("name") or "").strip() or f"id {effect_id}"
+    return f"id {effect_id}"
+
+
+def port_pixel_total(ports: Iterable[Mapping[str, Any]] | None) -> int:
+    """Pixels covered by the device's ports; 0 when the port setup is unknown."""
+    total = 0
+    for port in ports or ():
+        try:
+            total += max(0, int(port.get("end", 0)) - int(port.get("start", 0)) + 1)
+        except (TypeError, ValueError):
+            continue
+    return total
+
+
+def solid_pixel_count(ports: Iterable[Mapping[str, Any]] | None) -> int:
+    """Pixels a one-segment solid color should cover, from the device's port setup."""
+    total = port_pixel_total(ports)
+    if total <= 0:
+        return MAX_SEGMENT_PIXELS
+    return min(total, MAX_SEGMENT_PIXELS)
+
+
+def solid_color_of(effect: Mapping[str, Any] | None) -> int | None:
+    """Return the color when ``effect`` is a static custom effect of one color."""
+    if not effect or effect.get("category") not in (1, 2) or get_effect_mode(effect) != 0:
+        return None
+    pixels = effect.get("pixels")
+    if not isinstance(pixels, list) or not pixels:
+        return None
+    colors = {
+        int(pixel.get("color", 0) or 0)
+        for pixel in pixels
+        if isinstance(pixel, Mapping) and not pixel.get("disable") and int(pixel.get("count", 0) or 0) > 0
+    }
+    return colors.pop() if len(colors) == 1 else None
+
+
+CUSTOM_EFFECT_PREFIX = "Custom: "
+
+
+@dataclass(slots=True)
+class EffectIndex:
+    """Light effect names with constant-time lookups in both directions."""
+
+    effect_list: list[str] = field(default_factory=list)
+    # effect name -> ("builtin" | "custom", select option)
+    targets: dict[str, tuple[str, str]] = field(default_factory=dict)
+    # ("builtin" | "custom", select option) -> effect name
+    names: dict[tuple[str, str], str] = field(default_factory=dict)
+    custom_ids: dict[int, str] = field(default_factory=dict)
+
+    def add(self, name: str, kind: str, option: str) -> None:
+        self.effect_list.append(name)
+        self.targets[name] = (kind, option)
+        self.names[(kind, option)] = name
+
+
+def build_effect_index(
+    builtins: Iterable[BuiltinPreset], custom_options: Iterable[tuple[str, Effect]]
+) -> EffectIndex:
+    """Merge built-in names and custom option labels into one effect list.
+
+    Custom labels already carry an "(id N)" suffix when custom names repeat;
+    a custom label that matches a built-in name gets the "Custom: " prefix.
+    """
+    index = EffectIndex()
+    for preset in builtins:
+        name = (preset.get("name") or "").strip()
+        if name and name not in index.targets:
+            index.add(name, "builtin", preset["name"])
+    for label, effect in custom_options:
+        name = label if label not in index.targets else f"{CUSTOM_EFFECT_PREFIX}{label}"
+        index.add(name, "custom", label)
+        if effect.get("id") is not None:
+            index.custom_ids[int(effect["id"])] = name
+    return index
+
+
 def _pixel_signature(pixels: Any) -> tuple[tuple[int, int, int, bool], ...] | None:
     if not isinstance(pixels, list):
         return None
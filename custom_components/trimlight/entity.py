@@ -1,25 +1,67 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
+from typing import Any, Awaitable, Callable, TypeVar
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, VERIFY_REFRESH_DELAY_SECONDS
 from .coordinator import TrimlightCoordinator
 from .data import PendingTransition, TrimlightData, get_data
 from .debug import async_log_event
+from .groups import DeviceCommand, TrimlightGroup, async_group_command
 
 _LOGGER = logging.getLogger(__name__)
 _PENDING_TRANSITION_STABLE_HOLD_SECONDS = 12.0
 
+_T = TypeVar("_T")
+
 
 class TrimlightEntity(CoordinatorEntity[TrimlightCoordinator]):
+    # "status" entities write state on every coordinator update; "catalog"
+    # entities only when the catalog view or availability changes. Status
+    # entities derive catalog values through _from_catalog, so a status refresh
+    # does not rebuild them.
+    _coordinator_view = "status"
+
     def __init__(self, hass: HomeAssistant, entry_id: str, coordinator: TrimlightCoordinator) -> None:
         super().__init__(coordinator)
         self._hass = hass
         self._entry_id = entry_id
+        self._catalog_values: dict[str, tuple[Any, Any]] = {}
+        self._written_catalog_revision: int | None = None
+        self._written_available: bool | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if self._coordinator_view == "catalog":
+            revision = self.coordinator.catalog_revision
+            available = self.available
+            if revision == self._written_catalog_revision and available == self._written_available:
+                return
+            self._written_catalog_revision = revision
+            self._written_available = available
+        super()._handle_coordinator_update()
+
+    def _from_catalog(self, key: str, source: Any, build: Callable[[], _T]) -> _T:
+        """Reuse a value built from ``source`` until ``source`` is replaced.
+
+        Catalog lists are replaced rather than mutated, so identity tells when
+        the value needs rebuilding.
+        """
+        cached = self._catalog_values.get(key)
+        if cached is not None and cached[0] is source:
+            return cached[1]
+        value = build()
+        self._catalog_values[key] = (source, value)
+        return value
+
+    def _custom_presets(self) -> list[dict]:
+        return (self.coordinator.data or {}).get("custom_effects") or self._data.custom_cache
 
     @property
     def _data(self) -> TrimlightData:
@@ -28,8 +70,7 @@ class TrimlightEntity(CoordinatorEntity[TrimlightCoordinator]):
     @property
     def device_info(self) -> dict:
         data = self.coordinator.data or {}
-        payload = data.get("payload") or {}
-        device_id = payload.get("deviceId")
+        device_id = data.get("device_id")
         if not device_id:
             device_id = self._data.api._creds.device_id
 
@@ -162,6 +203,53 @@ class TrimlightEntity(CoordinatorEntity[TrimlightCoordinator]):
         data.pending_speed = None
         data.pending_speed_until = None
 
+    async def _run_command(
+        self,
+        intent: str,
+        sequence: Callable[[], Awaitable[None]],
+        *,
+        followup: bool = False,
+    ) -> bool:
+        """Run a command sequence through the device pipeline.
+
+        Returns False when the sequence was dropped or superseded by a newer intent.
+        """
+        data = self._data
+        command, superseded = data.commands.submit(
+            self._hass, intent, sequence, followup=followup
+        )
+        if command is None:
+            active = data.commands.active
+            await async_log_event(
+                self._hass,
+                data,
+                "command_dropped",
+                coordinator_data=self.coordinator.data or {},
+                intent=intent,
+                active_intent=active.name if active is not None else None,
+            )
+            return False
+        if superseded is not None:
+            _LOGGER.debug("Command '%s' superseded by '%s'", superseded.name, intent)
+            await async_log_event(
+                self._hass,
+                data,
+                "command_superseded",
+                coordinator_data=self.coordinator.data or {},
+                intent=intent,
+                superseded_intent=superseded.name,
+                superseded_followup=superseded.followup,
+                superseded_age_s=round(time.monotonic() - superseded.started_monotonic, 3),
+            )
+        try:
+            await command.task
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise
+            return False
+        return True
+
     def _keep_pending_transition_visible_after_match(
         self,
         pending: PendingTransition,
@@ -272,3 +360,56 @@ class TrimlightEntity(CoordinatorEntity[TrimlightCoordinator]):
         data.verify_refresh_handle = self._hass.loop.call_later(
             delay_s, _refresh
         )
+
+
+class TrimlightGroupEntity(TrimlightEntity):
+    """Entity for a Trimlight group, owned by the config entry of the group's master device.
+
+    State mirrors the master controller; commands go to the master and are
+    copied to the other members with a group sync.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        coordinator: TrimlightCoordinator,
+        group: TrimlightGroup,
+    ) -> None:
+        super().__init__(hass, entry_id, coordinator)
+        self._group = group
+
+    @property
+    def device_info(self) -> dict:
+        master = super().device_info
+        return {
+            "identifiers": {(DOMAIN, f"group_{self._group.group_id}")},
+            "name": f"Trimlight {self._group.name}",
+            "manufacturer": "Trimlight",
+            "model": "Group",
+            "via_device": next(iter(master["identifiers"])),
+        }
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        return {
+            "group_id": self._group.group_id,
+            "master_device_id": self._group.master_device_id,
+            "device_ids": list(self._group.device_ids),
+        }
+
+    async def _async_group_command(self, action: str, command: DeviceCommand) -> None:
+        data = self._data
+        result = await async_group_command(self._hass, data, self._group, command)
+        await async_log_event(
+            self._hass,
+            data,
+            "group_command",
+            coordinator_data=self.coordinator.data or {},
+            action=action,
+            group_name=self._group.name,
+            **result,
+        )
+        self._schedule_verification_refresh(source=f"group:{action}")
+        if result.get("error"):
+            raise HomeAssistantError(f"Trimlight group '{self._group.name}' {action}: {result['error']}")
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+
+from .api import TrimlightApi
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .data import TrimlightData
+
+_LOGGER = logging.getLogger(__name__)
+_GROUP_FANOUT_CONCURRENCY = 4
+
+# Runs one command against a single device's runtime data.
+DeviceCommand = Callable[["TrimlightData"], Awaitable[dict[str, Any] | None]]
+
+
+@dataclass(slots=True)
+class TrimlightGroup:
+    group_id: str
+    name: str
+    master_device_id: str | None
+    device_ids: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_payload(cls, row: dict[str, Any]) -> "TrimlightGroup":
+        master = row.get("masterDevice") or {}
+        return cls(
+            group_id=str(row.get("groupId")),
+            name=(row.get("name") or "").strip() or f"Group {row.get('groupId')}",
+            master_device_id=master.get("deviceId"),
+            device_ids=[d.get("deviceId") for d in row.get("devices") or [] if d.get("deviceId")],
+        )
+
+
+async def async_fetch_groups(api: TrimlightApi) -> list[TrimlightGroup]:
+    response = await api.get_group_list()
+    if response.get("code") not in (None, 0):
+        raise RuntimeError(f"group list failed: code={response.get('code')} desc={response.get('desc')}")
+    payload = response.get("payload") or {}
+    rows = payload.get("data") if isinstance(payload, dict) else payload
+    return [TrimlightGroup.from_payload(row) for row in rows or [] if row.get("groupId")]
+
+
+def find_device_data(hass: HomeAssistant, device_id: str) -> TrimlightData | None:
+    for data in (hass.data.get(DOMAIN) or {}).values():
+        if data.api._creds.device_id == device_id:
+            return data
+    return None
+
+
+def _succeeded(response: dict[str, Any] | None) -> bool:
+    return isinstance(response, dict) and response.get("code") in (None, 0)
+
+
+def _describe(response: dict[str, Any] | None) -> str:
+    if not isinstance(response, dict):
+        return "no command sent"
+    return f"code={response.get('code')} desc={response.get('desc')}"
+
+
+async def async_group_command(
+    hass: HomeAssistant,
+    master: TrimlightData,
+    group: TrimlightGroup,
+    command: DeviceCommand,
+) -> dict[str, Any]:
+    """Apply ``command`` to the master device, then copy it to the group with one sync call.
+
+    If the sync call fails, the command is sent to every other member that has
+    a loaded config entry instead, a few devices at a time. When the master
+    command fails nothing is synced. ``result["error"]`` describes any device
+    the command did not reach.
+    """
+    master_response = await command(master)
+    result: dict[str, Any] = {
+        "group_id": group.group_id,
+        "master_response": master_response,
+        "mode": "sync",
+    }
+    if not _succeeded(master_response):
+        # Syncing now would copy the master's previous state to every member.
+        result["mode"] = "none"
+        result["error"] = f"master {master.api._creds.device_id} failed: {_describe(master_response)}"
+        return result
+
+    sync_error: str | None = None
+    try:
+        sync_response = await master.api.sync_group(group.group_id)
+    except Exception as exc:  # noqa: BLE001
+        sync_error = str(exc)
+    else:
+        result["sync_response"] = sync_response
+        if _succeeded(sync_response):
+            _request_member_refreshes(hass, group)
+            return result
+        sync_error = f"code={sync_response.get('code')} desc={sync_response.get('desc')}"
+
+    _LOGGER.warning("Group sync failed for '%s' (%s); sending to members directly", group.name, sync_error)
+    result["mode"] = "fanout"
+    result["sync_error"] = sync_error
+
+    members: dict[str, TrimlightData] = {}
+    skipped: list[str] = []
+    for device_id in group.device_ids:
+        if device_id == master.api._creds.device_id:
+            continue
+        data = find_device_data(hass, device_id)
+        if data is None:
+            skipped.append(device_id)
+        else:
+            members[device_id] = data
+
+    semaphore = asyncio.Semaphore(_GROUP_FANOUT_CONCURRENCY)
+
+    async def _run(data: TrimlightData) -> dict[str, Any] | None:
+        async with semaphore:
+            return await command(data)
+
+    responses = await asyncio.gather(*(_run(data) for data in members.values()), return_exceptions=True)
+    result["members"] = {
+        device_id: (f"{type(response).__name__}: {response}" if isinstance(response, BaseException) else response)
+        for device_id, response in zip(members, responses)
+    }
+    result["skipped_members"] = skipped
+    failed = [
+        device_id
+        for device_id, response in zip(members, responses)
+        if isinstance(response, BaseException) or not _succeeded(response)
+    ]
+    result["failed_members"] = failed
+    problems = [f"failed on {', '.join(failed)}"] if failed else []
+    if skipped:
+        problems.append(f"not loaded for {', '.join(skipped)}")
+    if problems:
+        result["error"] = f"group sync failed ({sync_error}); command {'; '.join(problems)}"
+    _request_member_refreshes(hass, group)
+    return result
+
+
+def _request_member_refreshes(hass: HomeAssistant, group: TrimlightGroup) -> None:
+    for device_id in group.device_ids:
+        data = find_device_data(hass, device_id)
+        if data is not None:
+            hass.async_create_task(data.coordinator.async_request_refresh())
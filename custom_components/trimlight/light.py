@@ -3,16 +3,36 @@ from __future__ import annotations
 import time
 from typing import Any
 
-from homeassistant.components.light import ATTR_BRIGHTNESS, ColorMode, LightEntity
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_EFFECT,
+    ATTR_RGB_COLOR,
+    ATTR_TRANSITION,
+    ColorMode,
+    LightEntity,
+    LightEntityFeature,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import FORCED_ON_GRACE_SECONDS
-from .controller import apply_effect_update
-from .data import get_data
+from .controller import apply_effect_update, apply_solid_color, next_solid_color_request
+from .data import TrimlightData, get_data
 from .debug import async_log_event
-from .entity import TrimlightEntity
+from .effects import (
+    EffectIndex,
+    build_effect_index,
+    find_builtin_preset,
+    get_effect_mode,
+    solid_color_of,
+)
+from .entity import TrimlightGroupEntity
+from .select import BuiltinPresetActions, CustomPresetActions
+from .transitions import TRANSITION_INTENT, async_run_brightness_transition
+
+_SOLID_COLOR_INTENT = "solid_color"
 
 
 async def async_setup_entry(
@@ -20,17 +40,60 @@ async def async_setup_entry(
 ) -> None:
     data = get_data(hass, entry.entry_id)
     coordinator = data.coordinator
-    async_add_entities([TrimlightLight(hass, entry.entry_id, coordinator)])
+    entities: list[LightEntity] = [TrimlightLight(hass, entry.entry_id, coordinator)]
+    entities.extend(
+        TrimlightGroupLight(hass, entry.entry_id, coordinator, group) for group in data.groups
+    )
+    async_add_entities(entities)
 
 
-class TrimlightLight(TrimlightEntity, LightEntity):
+class TrimlightLight(BuiltinPresetActions, CustomPresetActions, LightEntity):
     _attr_name = "Trimlight"
-    _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
-    _attr_color_mode = ColorMode.BRIGHTNESS
+    _attr_supported_color_modes = {ColorMode.RGB}
+    _attr_color_mode = ColorMode.RGB
+    _attr_supported_features = LightEntityFeature.TRANSITION | LightEntityFeature.EFFECT
 
     def __init__(self, hass: HomeAssistant, entry_id: str, coordinator) -> None:
         super().__init__(hass, entry_id, coordinator)
         self._attr_unique_id = f"{entry_id}_light"
+        self._effect_index = EffectIndex()
+        self._effect_index_sources: tuple[list, list] | None = None
+
+    def _current_effect_index(self) -> EffectIndex:
+        # The builtin and custom lists are replaced, not mutated, when the
+        # catalog changes, so identity tells whether the index is stale.
+        data = self._data
+        presets = (self.coordinator.data or {}).get("custom_effects") or data.custom_cache
+        sources = self._effect_index_sources
+        if sources is None or sources[0] is not data.builtins or sources[1] is not presets:
+            self._effect_index = build_effect_index(data.builtins, self._cached_option_entries(presets))
+            self._effect_index_sources = (data.builtins, presets)
+        return self._effect_index
+
+    @property
+    def effect_list(self) -> list[str]:
+        return self._current_effect_index().effect_list
+
+    @property
+    def effect(self) -> str | None:
+        if self._is_effectively_on() is not True:
+            return None
+        index = self._current_effect_index()
+        pending = self._active_pending_transition()
+        if pending is not None:
+            return index.names.get((pending.target_kind, pending.target_name))
+        data = self.coordinator.data or {}
+        effect_id = self._safe_int(data.get("current_effect_id"))
+        category = data.get("current_effect_category")
+        if category in (1, 2) and effect_id is not None:
+            return index.custom_ids.get(effect_id)
+        if category == 0:
+            match = find_builtin_preset(
+                self._data.builtins, effect_id, get_effect_mode(data.get("current_effect"))
+            )
+            if match is not None:
+                return index.names.get(("builtin", match["name"]))
+        return None
 
     @property
     def is_on(self) -> bool | None:
@@ -44,12 +107,79 @@ class TrimlightLight(TrimlightEntity, LightEntity):
             return self._data.last_brightness
         return int(brightness)
 
+    @property
+    def rgb_color(self) -> tuple[int, int, int] | None:
+        # Only a solid color has a single RGB value; presets report none.
+        data = self.coordinator.data or {}
+        if data.get("current_effect_id") not in (None, -1):
+            return None
+        color = solid_color_of(data.get("current_effect"))
+        if color is None:
+            return None
+        return (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+
     async def async_turn_on(self, **kwargs: Any) -> None:
+        brightness = kwargs.get(ATTR_BRIGHTNESS)
+        transition = kwargs.get(ATTR_TRANSITION)
+        effect = kwargs.get(ATTR_EFFECT)
+        if effect is not None:
+            target = self._current_effect_index().targets.get(effect)
+            if target is None:
+                raise HomeAssistantError(f"Unknown Trimlight effect '{effect}'")
+            kind, option = target
+            await self._run_command(
+                f"light_effect:{effect}", lambda: self._async_apply_effect(kind, option, brightness)
+            )
+            return
+
+        rgb = kwargs.get(ATTR_RGB_COLOR)
+        if rgb is not None:
+            red, green, blue = (int(value) for value in rgb)
+            color = (red << 16) | (green << 8) | blue
+            level = int(brightness) if brightness is not None else int(self.brightness or 255)
+            # Numbered before any await, so an older color can never replace this one.
+            request = next_solid_color_request(self._data)
+            active = self._data.commands.active
+            if active is not None and active.name == _SOLID_COLOR_INTENT:
+                # The running color command sends this one when its current call returns.
+                known_on = self._data.coordinator.power_state.is_known_on()
+                await apply_solid_color(
+                    self._data,
+                    color,
+                    level,
+                    request=request,
+                    before_send=None if known_on else self._async_switch_on,
+                )
+                return
+            await self._run_command(
+                _SOLID_COLOR_INTENT, lambda: self._async_set_solid_color(color, level, request)
+            )
+            return
+
+        if transition and brightness is not None:
+            await self._run_command(
+                TRANSITION_INTENT,
+                lambda: self._async_transition_on(int(brightness), float(transition)),
+            )
+            return
+
+        active = self._data.commands.active
+        if active is not None and active.name == TRANSITION_INTENT:
+            # A plain turn_on still has to stop a running fade.
+            await self._run_command("light_turn_on", lambda: self._async_turn_on(brightness))
+            return
+        await self._async_turn_on(brightness)
+
+    async def _async_turn_on(self, brightness: int | None) -> None:
         data = self._data
         api = data.api
-        brightness = kwargs.get(ATTR_BRIGHTNESS)
 
-        switch_resp = await api.set_switch_state(1)
+        # Brightness-only turn_on calls while the controller is confirmed on
+        # do not need another switch round trip.
+        switch_resp = None
+        switch_skipped = brightness is not None and data.coordinator.power_state.is_known_on()
+        if not switch_skipped:
+            switch_resp = await self._async_switch_on()
 
         # Optimistic UI update: mark on immediately
         coord_data = self.coordinator.data or {}
@@ -73,16 +203,132 @@ class TrimlightLight(TrimlightEntity, LightEntity):
             coordinator_data=optimistic,
             requested_brightness=brightness,
             switch_response=switch_resp,
+            switch_skipped=switch_skipped,
+        )
+
+        self._schedule_verification_refresh()
+
+    async def _async_apply_effect(self, kind: str, option: str, brightness: int | None) -> None:
+        """Power on, select the preset and set brightness as one command."""
+        data = self._data
+        if kind == "builtin":
+            # The built-in preview carries the brightness, so one call covers both.
+            if brightness is not None:
+                data.last_brightness = int(brightness)
+            await self._async_apply_builtin_preset(option)
+            return
+
+        # Saved custom presets run with their stored brightness; only a
+        # different requested brightness needs the extra update.
+        await self._async_apply_custom_preset(option)
+        if brightness is not None and int(brightness) != data.last_brightness:
+            data.last_brightness = int(brightness)
+            await apply_effect_update(
+                data.api, data, self.coordinator.data or {}, brightness=int(brightness)
+            )
+
+    async def _async_transition_on(self, target: int, duration_s: float) -> None:
+        """Fade to ``target`` with preview-only steps, then apply it once for real."""
+        data = self._data
+        api = data.api
+        was_on = bool(self.is_on)
+        start = int(self.brightness or target) if was_on else 1
+        if not was_on:
+            # Start dark so switching on does not flash the previous brightness.
+            await apply_effect_update(
+                api, data, self.coordinator.data or {}, brightness=start, preview_only=True
+            )
+            await self._async_turn_on(None)
+
+        async def _preview(value: int) -> None:
+            await apply_effect_update(
+                api, data, self.coordinator.data or {}, brightness=value, preview_only=True
+            )
+
+        began = time.monotonic()
+        steps = await async_run_brightness_transition(
+            data, start=start, target=target, duration_s=duration_s, preview=_preview
+        )
+        data.last_brightness = target
+        await apply_effect_update(api, data, self.coordinator.data or {}, brightness=target)
+        await async_log_event(
+            self._hass,
+            data,
+            "brightness_transition",
+            coordinator_data=self.coordinator.data or {},
+            start_brightness=start,
+            requested_brightness=target,
+            requested_transition_s=duration_s,
+            elapsed_s=round(time.monotonic() - began, 3),
+            steps=steps,
+            preview_latency_s=data.preview_latency_s,
         )
+        self._schedule_verification_refresh()
+
+    async def _async_switch_on(self) -> dict[str, Any]:
+        data = self._data
+        switch_resp = await data.api.set_switch_state(1)
+        if switch_resp.get("code") == 0:
+            data.coordinator.power_state.confirm(True, "set_switch_state")
+        return switch_resp
+
+    async def _async_set_solid_color(self, color: int, brightness: int, request: int) -> None:
+        data = self._data
+        self._cancel_pending_followups()
+        self._clear_pending_transition()
+        switch_resp = None
+        switch_skipped = data.coordinator.power_state.is_known_on()
+
+        async def _switch_on() -> None:
+            nonlocal switch_resp
+            switch_resp = await self._async_switch_on()
+
+        data.forced_on_until = time.monotonic() + FORCED_ON_GRACE_SECONDS
+        data.forced_off_until = None
 
+        # Switching on happens under the color lock, so a newer color that
+        # arrives meanwhile is sent after this one rather than before it.
+        response = await apply_solid_color(
+            data,
+            color,
+            brightness,
+            request=request,
+            before_send=None if switch_skipped else _switch_on,
+        )
+        if response is None or response.get("code") == 0:
+            data.last_brightness = brightness
+            # Brightness changes should keep the color, not re-apply the last preset.
+            data.last_selected_preset = None
+            data.last_selected_custom_preset = None
+            data.last_selected_custom_mode = None
+            data.last_known_preset = None
+        await async_log_event(
+            self._hass,
+            data,
+            "light_solid_color",
+            coordinator_data=self.coordinator.data or {},
+            color=f"#{color:06x}",
+            requested_brightness=brightness,
+            switch_response=switch_resp,
+            switch_skipped=switch_skipped,
+            response=response,
+        )
         self._schedule_verification_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
+        # Turning off supersedes any preset sequence still issuing run_effect calls.
+        # ATTR_TRANSITION is ignored: the fade previews would stay on the
+        # controller and the next turn_on would come back at the dimmed level.
+        await self._run_command("power_off", self._async_power_off)
+
+    async def _async_power_off(self) -> None:
         data = self._data
         api = data.api
         self._cancel_pending_followups()
         self._clear_pending_transition()
         switch_resp = await api.set_switch_state(0)
+        if switch_resp.get("code") == 0:
+            data.coordinator.power_state.confirm(False, "set_switch_state")
         coord_data = self.coordinator.data or {}
         optimistic = dict(coord_data)
         optimistic["switch_state"] = 0
@@ -105,3 +351,55 @@ class TrimlightLight(TrimlightEntity, LightEntity):
             switch_response=switch_resp,
         )
         self._schedule_verification_refresh()
+
+
+class TrimlightGroupLight(TrimlightGroupEntity, LightEntity):
+    _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
+    _attr_color_mode = ColorMode.BRIGHTNESS
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, coordinator, group) -> None:
+        super().__init__(hass, entry_id, coordinator, group)
+        self._attr_name = f"Trimlight {group.name}"
+        self._attr_unique_id = f"{entry_id}_group_{group.group_id}_light"
+
+    @property
+    def is_on(self) -> bool | None:
+        return self._is_effectively_on()
+
+    @property
+    def brightness(self) -> int | None:
+        brightness = (self.coordinator.data or {}).get("brightness")
+        if brightness is None:
+            return self._data.last_brightness
+        return int(brightness)
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        brightness = kwargs.get(ATTR_BRIGHTNESS)
+
+        async def _power_on(member: TrimlightData) -> dict:
+            resp = await member.api.set_switch_state(1)
+            if resp.get("code") == 0:
+                member.coordinator.power_state.confirm(True, "set_switch_state")
+            if brightness is not None:
+                member.last_brightness = int(brightness)
+                await apply_effect_update(
+                    member.api, member, member.coordinator.data or {}, brightness=int(brightness)
+                )
+            return resp
+
+        await self._run_command(
+            f"group_power_on:{self._group.group_id}",
+            lambda: self._async_group_command("power_on", _power_on),
+        )
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        async def _power_off(member: TrimlightData) -> dict:
+            resp = await member.api.set_switch_state(0)
+            if resp.get("code") == 0:
+                member.coordinator.power_state.confirm(False, "set_switch_state")
+            return resp
+
+        await self._run_command(
+            f"group_power_off:{self._group.group_id}",
+            lambda: self._async_group_command("power_off", _power_off),
+        )
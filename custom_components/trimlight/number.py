@@ -21,6 +21,7 @@ from .effects import (
     get_effect_mode,
     is_builtin_like_state,
 )
+from .transitions import TRANSITION_INTENT
 
 _CUSTOM_SPEED_SECOND_APPLY_DELAY_SECONDS = 0.9
 _CUSTOM_SPEED_REAPPLY_DELAY_SECONDS = 4.5
@@ -236,7 +237,9 @@ class TrimlightSpeedNumber(TrimlightEntity, NumberEntity):
             )
 
         def _start_reapply() -> None:
-            self._hass.async_create_task(_reapply_if_needed())
+            self._hass.async_create_task(
+                self._run_command("speed_reapply", _reapply_if_needed, followup=True)
+            )
 
         data.speed_reapply_handle = self._hass.loop.call_later(delay_s, _start_reapply)
 
@@ -252,6 +255,15 @@ class TrimlightSpeedNumber(TrimlightEntity, NumberEntity):
         return round((float(speed) / 255.0) * 100.0, 1)
 
     async def async_set_native_value(self, value: float) -> None:
+        active = self._data.commands.active
+        if active is not None and active.name == TRANSITION_INTENT:
+            # A speed change is a new command, so it has to stop a running fade
+            # before the fade's remaining steps and final save race with it.
+            await self._run_command("effect_speed", lambda: self._async_set_speed(value))
+            return
+        await self._async_set_speed(value)
+
+    async def _async_set_speed(self, value: float) -> None:
         speed = int(round((float(value) / 100.0) * 255.0))
         data = self._data
         api = data.api
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+OVERLAY_TYPES = {
+    "lightning": 0,
+    "snow": 1,
+}
+
+
+def normalize_overlays(overlays: Iterable[dict[str, Any]] | None) -> list[dict[str, int]]:
+    """Sorted, de-duplicated overlay list so two lists compare equal when the device state would."""
+    keys = {
+        (int(overlay["overlayType"]), int(overlay["targetEffect"]))
+        for overlay in overlays or []
+        if overlay.get("overlayType") is not None and overlay.get("targetEffect") is not None
+    }
+    return [{"overlayType": overlay_type, "targetEffect": target} for overlay_type, target in sorted(keys)]
+
+
+def plan_overlays(
+    current: Iterable[dict[str, Any]] | None,
+    *,
+    add: Iterable[dict[str, Any]] = (),
+    remove: Iterable[dict[str, Any]] = (),
+    replace: Iterable[dict[str, Any]] | None = None,
+) -> list[dict[str, int]] | None:
+    """Return the overlay list to write, or None when the controller already has it."""
+    existing = normalize_overlays(current)
+    if replace is not None:
+        desired = normalize_overlays(replace)
+    else:
+        removed = {(o["overlayType"], o["targetEffect"]) for o in normalize_overlays(remove)}
+        desired = normalize_overlays(
+            [o for o in existing if (o["overlayType"], o["targetEffect"]) not in removed] + list(add)
+        )
+    return None if desired == existing else desired
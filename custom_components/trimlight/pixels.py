@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from itertools import groupby
+from typing import Sequence
+
+from .const import MAX_PIXEL_SEGMENTS, MAX_SEGMENT_PIXELS
+from .models import Pixel
+
+# Per-LED colors are 0xRRGGBB ints; None marks a disabled (unlit) pixel.
+LedColor = int | None
+
+
+def encode_pixel_runs(leds: Sequence[LedColor]) -> list[Pixel]:
+    """Encode per-LED colors into the fewest segments the controller accepts.
+
+    Neighbouring LEDs of the same color collapse into one run, and a run longer
+    than a segment can hold is split into as few full segments as possible.
+    Raises ValueError when the result needs more segments than the firmware allows.
+    """
+    pixels: list[Pixel] = []
+    for color, run in groupby(leds):
+        remaining = sum(1 for _ in run)
+        while remaining > 0:
+            count = min(remaining, MAX_SEGMENT_PIXELS)
+            pixels.append(
+                {
+                    "index": len(pixels),
+                    "count": count,
+                    "color": 0 if color is None else int(color),
+                    "disable": color is None,
+                }
+            )
+            remaining -= count
+    if len(pixels) > MAX_PIXEL_SEGMENTS:
+        raise ValueError(
+            f"Pattern needs {len(pixels)} segments; the controller accepts {MAX_PIXEL_SEGMENTS}"
+        )
+    return pixels
+
+
+def repeat_colors(colors: Sequence[LedColor], pixels_per_color: int) -> list[LedColor]:
+    """One period of a repeating pattern: each color lit for ``pixels_per_color`` LEDs."""
+    return [color for color in colors for _ in range(int(pixels_per_color))]
+
+
+def _mix(start: int, end: int, fraction: float) -> int:
+    mixed = 0
+    for shift in (16, 8, 0):
+        a = (start >> shift) & 0xFF
+        b = (end >> shift) & 0xFF
+        mixed |= round(a + (b - a) * fraction) << shift
+    return mixed
+
+
+def gradient_colors(stops: Sequence[int], length: int, bands: int | None = None) -> list[LedColor]:
+    """Blend ``stops`` across ``length`` LEDs in ``bands`` equal steps of solid color.
+
+    A smooth per-LED blend would need one segment per LED, so the gradient is
+    quantized. The default band count is the most segments the firmware
+    accepts (or ``length`` if that is smaller).
+    """
+    if not stops:
+        raise ValueError("A gradient needs at least one color")
+    length = int(length)
+    bands = min(length, MAX_PIXEL_SEGMENTS) if bands is None else max(1, min(int(bands), length))
+    if len(stops) == 1 or bands == 1:
+        return [stops[0]] * length
+
+    band_colors: list[int] = []
+    for band in range(bands):
+        position = band / (bands - 1) * (len(stops) - 1)
+        left = min(int(position), len(stops) - 2)
+        band_colors.append(_mix(stops[left], stops[left + 1], position - left))
+    # Spread any remainder over the first bands so band sizes differ by at most one.
+    size, extra = divmod(length, bands)
+    return [color for band, color in enumerate(band_colors) for _ in range(size + (band < extra))]
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import IO, Any, Iterable, Mapping
+
+from .catalog import effect_content_hash
+from .models import BuiltinPreset, Effect
+
+PRESET_FILE_FORMAT = "trimlight-presets"
+PRESET_FILE_VERSION = 1
+# Files ending in .gz are gzip-compressed; everything else is plain text.
+COMPRESSED_SUFFIX = ".gz"
+
+_PRESET_CONTENT_KEYS = ("name", "mode", "speed", "brightness", "pixels")
+
+
+def preset_content_hash(effect: Mapping[str, Any]) -> str:
+    """Hash what a custom preset looks like, ignoring its device-specific id and category."""
+    return effect_content_hash({key: effect.get(key) for key in _PRESET_CONTENT_KEYS})
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(COMPRESSED_SUFFIX):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def write_preset_file(
+    path: str,
+    header: Mapping[str, Any],
+    builtins: Iterable[BuiltinPreset],
+    custom_effects: Iterable[Effect],
+) -> int:
+    """Write a JSON Lines preset file one record at a time; returns the custom preset count.
+
+    The first line is the versioned header, followed by one line per
+    built-in preset and one per custom preset.
+    """
+    written = 0
+    with _open(path, "w") as handle:
+        handle.write(json.dumps({"format": PRESET_FILE_FORMAT, "version": PRESET_FILE_VERSION, **header}))
+        handle.write("\n")
+        for preset in builtins:
+            record = {
+                "type": "builtin",
+                "id": preset.get("id"),
+                "mode": preset.get("mode"),
+                "name": preset.get("name"),
+            }
+            handle.write(json.dumps(record, separators=(",", ":")))
+            handle.write("\n")
+        for effect in custom_effects:
+            record = {"type": "custom", "hash": preset_content_hash(effect), "effect": dict(effect)}
+            handle.write(json.dumps(record, separators=(",", ":")))
+            handle.write("\n")
+            written += 1
+    return written
+
+
+def open_preset_file(path: str) -> tuple[IO[str], dict[str, Any]]:
+    """Open a preset file and check its header; the caller reads records and closes it."""
+    handle = _open(path, "r")
+    try:
+        header = json.loads(handle.readline() or "{}")
+        if header.get("format") != PRESET_FILE_FORMAT:
+            raise ValueError(f"{path} is not a Trimlight preset file")
+        if int(header.get("version", 0)) > PRESET_FILE_VERSION:
+            raise ValueError(
+                f"{path} is preset file version {header.get('version')}; "
+                f"this integration reads up to {PRESET_FILE_VERSION}"
+            )
+    except Exception:
+        handle.close()
+        raise
+    return handle, header
+
+
+def read_custom_presets(handle: IO[str], limit: int) -> list[Effect]:
+    """Read up to ``limit`` custom presets from an open preset file; [] at end of file."""
+    effects: list[Effect] = []
+    while len(effects) < limit:
+        line = handle.readline()
+        if not line:
+            break
+        line = line.strip()
+        if not line:
+            continue
+        record = json.loads(line)
+        if record.get("type") == "custom" and isinstance(record.get("effect"), dict):
+            effects.append(record["effect"])
+    return effects
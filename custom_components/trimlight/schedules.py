@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+DAILY_SCHEDULE_SLOTS = 2
+CALENDAR_SCHEDULE_SLOTS = 60
+
+# Table [6] "Repitition" in the Trimlight EDGE API PDFs (1.3.0 and 1.4.0) in docs/.
+# The .txt extracts of those PDFs leave the table out.
+REPETITIONS = {
+    "today": 0,
+    "everyday": 1,
+    "weekdays": 2,
+    "weekend": 3,
+}
+
+_DAILY_KEYS = ("enable", "effectId", "repetition", "startTime", "endTime")
+_CALENDAR_KEYS = ("effectId", "startDate", "endDate", "startTime", "endTime")
+
+
+def schedule_time(hours: int, minutes: int) -> dict[str, int]:
+    return {"hours": int(hours), "minutes": int(minutes)}
+
+
+def schedule_date(month: int, day: int) -> dict[str, int]:
+    return {"month": int(month), "day": int(day)}
+
+
+def _content_key(schedule: Mapping[str, Any], keys: tuple[str, ...]) -> str:
+    return json.dumps({key: schedule.get(key) for key in keys}, sort_keys=True, separators=(",", ":"))
+
+
+def daily_content_key(schedule: Mapping[str, Any]) -> str:
+    return _content_key(schedule, _DAILY_KEYS)
+
+
+def calendar_content_key(schedule: Mapping[str, Any]) -> str:
+    return _content_key(schedule, _CALENDAR_KEYS)
+
+
+@dataclass(slots=True)
+class SchedulePlan:
+    """Slot writes needed to move the controller from its current schedules to the desired ones."""
+
+    daily_saves: list[dict[str, Any]] = field(default_factory=list)
+    calendar_saves: list[dict[str, Any]] = field(default_factory=list)
+    calendar_deletes: list[int] = field(default_factory=list)
+    unchanged: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.daily_saves or self.calendar_saves or self.calendar_deletes)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "daily_saves": [s["id"] for s in self.daily_saves],
+            "calendar_saves": [s["id"] for s in self.calendar_saves],
+            "calendar_deletes": list(self.calendar_deletes),
+            "unchanged": self.unchanged,
+        }
+
+
+def plan_daily(
+    desired: Mapping[int, Mapping[str, Any]], current: list[Mapping[str, Any]], plan: SchedulePlan
+) -> SchedulePlan:
+    """Add a save for each desired daily slot whose content differs from the controller's."""
+    current_by_id = {row.get("id"): row for row in current}
+    for slot, schedule in sorted(desired.items()):
+        if not 0 <= slot < DAILY_SCHEDULE_SLOTS:
+            raise ValueError(f"Daily schedule slot {slot} is out of range")
+        existing = current_by_id.get(slot)
+        if existing is not None and daily_content_key(existing) == daily_content_key(schedule):
+            plan.unchanged += 1
+            continue
+        plan.daily_saves.append({"id": slot, **{key: schedule.get(key) for key in _DAILY_KEYS}})
+    return plan
+
+
+def plan_calendar(
+    desired: list[Mapping[str, Any]], current: list[Mapping[str, Any]], plan: SchedulePlan
+) -> SchedulePlan:
+    """Fit the desired calendar schedules into the 60 slots with as few writes as possible.
+
+    Schedules already stored in some slot stay where they are. New schedules
+    overwrite slots that are no longer wanted before taking empty ones, and
+    any slot left over is deleted.
+    """
+    if len(desired) > CALENDAR_SCHEDULE_SLOTS:
+        raise ValueError(
+            f"{len(desired)} calendar schedules requested; the controller holds {CALENDAR_SCHEDULE_SLOTS}"
+        )
+
+    slots_by_key: dict[str, list[int]] = {}
+    for row in sorted(current, key=lambda r: r.get("id", 0)):
+        slots_by_key.setdefault(calendar_content_key(row), []).append(int(row["id"]))
+
+    kept: set[int] = set()
+    pending: list[Mapping[str, Any]] = []
+    for schedule in desired:
+        slots = slots_by_key.get(calendar_content_key(schedule))
+        if slots:
+            kept.add(slots.pop(0))
+            plan.unchanged += 1
+        else:
+            pending.append(schedule)
+
+    occupied = sorted(int(row["id"]) for row in current)
+    reusable = [slot for slot in occupied if slot not in kept]
+    free = [slot for slot in range(CALENDAR_SCHEDULE_SLOTS) if slot not in occupied]
+    for schedule in pending:
+        slot = reusable.pop(0) if reusable else free.pop(0)
+        plan.calendar_saves.append({"id": slot, **{key: schedule.get(key) for key in _CALENDAR_KEYS}})
+    plan.calendar_deletes.extend(reusable)
+    return plan
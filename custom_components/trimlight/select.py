@@ -13,13 +13,14 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import CUSTOM_EFFECT_MODES, FORCED_ON_GRACE_SECONDS
-from .data import get_data
+from .data import TrimlightData, get_data
 from .debug import async_log_event
-from .entity import TrimlightEntity
+from .entity import TrimlightEntity, TrimlightGroupEntity
 from .effects import (
     find_builtin_preset,
     find_builtin_preset_by_name,
     find_custom_preset_by_state,
+    find_saved_effect_by_name,
     get_effect_mode,
     infer_builtin_preview_params,
     is_builtin_like_state,
@@ -156,21 +157,19 @@ async def async_setup_entry(
 ) -> None:
     data = get_data(hass, entry.entry_id)
     coordinator = data.coordinator
-    async_add_entities(
-        [
-            TrimlightBuiltInSelect(hass, entry.entry_id, coordinator),
-            TrimlightCustomSelect(hass, entry.entry_id, coordinator),
-            TrimlightCustomModeSelect(hass, entry.entry_id, coordinator),
-        ]
+    entities: list[SelectEntity] = [
+        TrimlightBuiltInSelect(hass, entry.entry_id, coordinator),
+        TrimlightCustomSelect(hass, entry.entry_id, coordinator),
+        TrimlightCustomModeSelect(hass, entry.entry_id, coordinator),
+    ]
+    entities.extend(
+        TrimlightGroupPresetSelect(hass, entry.entry_id, coordinator, group) for group in data.groups
     )
+    async_add_entities(entities)
 
 
-class TrimlightBuiltInSelect(TrimlightEntity, SelectEntity):
-    _attr_name = "Trimlight Built-in Preset"
-
-    def __init__(self, hass: HomeAssistant, entry_id: str, coordinator) -> None:
-        super().__init__(hass, entry_id, coordinator)
-        self._attr_unique_id = f"{entry_id}_builtin_select"
+class BuiltinPresetActions(TrimlightEntity):
+    """Applies built-in presets; shared by the built-in select and the light's effect list."""
 
     @staticmethod
     def _safe_int(value: object, default: int | None = None) -> int | None:
@@ -179,73 +178,6 @@ class TrimlightBuiltInSelect(TrimlightEntity, SelectEntity):
         except (TypeError, ValueError):
             return default
 
-    @property
-    def options(self) -> list[str]:
-        builtins = self._data.builtins
-        return [row["name"] for row in builtins]
-
-    @property
-    def current_option(self) -> str | None:
-        data = self.coordinator.data or {}
-        is_on = self._is_effectively_on()
-        if is_on is not True:
-            return None
-        current_effect = data.get("current_effect") or {}
-        builtins = self._data.builtins
-        current_category = data.get("current_effect_category")
-        effect_id = self._safe_int(data.get("current_effect_id"))
-        pending = self._active_pending_transition()
-        if pending is not None:
-            if pending.target_kind == "builtin":
-                if matches_builtin_target(
-                    builtins,
-                    current_effect,
-                    current_category,
-                    effect_id,
-                    target_name=pending.target_name,
-                    target_id=pending.target_id,
-                    target_mode=pending.target_mode,
-                ):
-                    if self._keep_pending_transition_visible_after_match(pending):
-                        return pending.target_name
-                else:
-                    return pending.target_name
-            elif pending.target_kind == "custom":
-                if matches_custom_target(
-                    self._data.custom_cache,
-                    current_effect,
-                    current_category,
-                    effect_id,
-                    target_name=pending.target_name,
-                    target_id=pending.target_id,
-                    builtins=builtins,
-                ):
-                    if self._keep_pending_transition_visible_after_match(pending):
-                        return None
-                else:
-                    return None
-        name_match = find_builtin_preset_by_name(builtins, (current_effect.get("name") or "").strip())
-        if name_match is not None:
-            return name_match["name"]
-        raw_switch_state = data.get("switch_state")
-        forced_on_override = raw_switch_state is not None and int(raw_switch_state) == 0 and is_on is True
-        if forced_on_override:
-            last_known = self._data.last_known_builtin_preset
-            if last_known and self._data.last_known_preset == last_known:
-                return last_known
-            return None
-        current_mode = get_effect_mode(current_effect)
-        builtin_like = is_builtin_like_state(builtins, current_effect, current_category, effect_id)
-        if current_category != 0 and not builtin_like:
-            return None
-        match = find_builtin_preset(builtins, effect_id, current_mode)
-        if match is not None:
-            return match["name"]
-        last_known = self._data.last_known_builtin_preset
-        if last_known:
-            return last_known
-        return None
-
     def _optimistic_builtin_selection(
         self,
         *,
@@ -413,21 +345,13 @@ class TrimlightBuiltInSelect(TrimlightEntity, SelectEntity):
                 )
 
         def _start_reapply() -> None:
-            self._hass.async_create_task(_reapply_if_needed())
+            self._hass.async_create_task(
+                self._run_command(f"builtin_reapply:{option}", _reapply_if_needed, followup=True)
+            )
 
         data.builtin_reapply_handle = self._hass.loop.call_later(delay_s, _start_reapply)
 
-    @property
-    def extra_state_attributes(self) -> dict:
-        data = self.coordinator.data or {}
-        effect_id = data.get("current_effect_id")
-        builtins = self._data.builtins
-        return {
-            "current_id": effect_id,
-            "builtins": [{"id": b.get("id"), "mode": b.get("mode"), "name": b.get("name")} for b in builtins],
-        }
-
-    async def async_select_option(self, option: str) -> None:
+    async def _async_apply_builtin_preset(self, option: str) -> None:
         data = self._data
         builtins = data.builtins
         match = next((row for row in builtins if row["name"] == option), None)
@@ -449,19 +373,24 @@ class TrimlightBuiltInSelect(TrimlightEntity, SelectEntity):
             current_category=current_category,
             effect_id=current_effect_id,
         )
-        # Ensure the lights are on when a preset is selected.
+        # Ensure the lights are on when a preset is selected, unless the
+        # controller recently confirmed that it already is.
         switch_resp = None
-        try:
-            switch_resp = await api.set_switch_state(1)
-        except Exception:
-            pass
+        switch_skipped = data.coordinator.power_state.is_known_on()
+        if not switch_skipped:
+            try:
+                switch_resp = await api.set_switch_state(1)
+            except Exception:
+                pass
+            if _resp_code(switch_resp) == 0:
+                data.coordinator.power_state.confirm(True, "set_switch_state")
         # Keep UI on for a short grace window while the controller catches up.
         data.forced_on_until = time.monotonic() + FORCED_ON_GRACE_SECONDS
         brightness = data.last_brightness
         speed = data.last_speed
         selected_mode = int(match.get("mode", match.get("id")))
         current_effect = current.get("current_effect") or {}
-        effects = current.get("effects") or []
+        effects = current.get("builtin_effects") or []
         pixel_len, reverse = infer_builtin_preview_params(
             int(match.get("id", selected_mode)), current_effect, effects
         )
@@ -535,6 +464,7 @@ class TrimlightBuiltInSelect(TrimlightEntity, SelectEntity):
             preset=match,
             applied_via=applied_via,
             switch_response=switch_resp,
+            switch_skipped=switch_skipped,
             preview_response=preview_resp,
             alt_preview_response=alt_preview_resp,
             view_response=view_resp,
@@ -559,12 +489,100 @@ class TrimlightBuiltInSelect(TrimlightEntity, SelectEntity):
         )
 
 
-class TrimlightCustomSelect(TrimlightEntity, SelectEntity):
-    _attr_name = "Trimlight Custom Preset"
+class TrimlightBuiltInSelect(BuiltinPresetActions, SelectEntity):
+    _attr_name = "Trimlight Built-in Preset"
 
     def __init__(self, hass: HomeAssistant, entry_id: str, coordinator) -> None:
         super().__init__(hass, entry_id, coordinator)
-        self._attr_unique_id = f"{entry_id}_custom_select"
+        self._attr_unique_id = f"{entry_id}_builtin_select"
+
+    @property
+    def options(self) -> list[str]:
+        builtins = self._data.builtins
+        return self._from_catalog("options", builtins, lambda: [row["name"] for row in builtins])
+
+    @property
+    def current_option(self) -> str | None:
+        data = self.coordinator.data or {}
+        is_on = self._is_effectively_on()
+        if is_on is not True:
+            return None
+        current_effect = data.get("current_effect") or {}
+        builtins = self._data.builtins
+        current_category = data.get("current_effect_category")
+        effect_id = self._safe_int(data.get("current_effect_id"))
+        pending = self._active_pending_transition()
+        if pending is not None:
+            if pending.target_kind == "builtin":
+                if matches_builtin_target(
+                    builtins,
+                    current_effect,
+                    current_category,
+                    effect_id,
+                    target_name=pending.target_name,
+                    target_id=pending.target_id,
+                    target_mode=pending.target_mode,
+                ):
+                    if self._keep_pending_transition_visible_after_match(pending):
+                        return pending.target_name
+                else:
+                    return pending.target_name
+            elif pending.target_kind == "custom":
+                if matches_custom_target(
+                    self._data.custom_cache,
+                    current_effect,
+                    current_category,
+                    effect_id,
+                    target_name=pending.target_name,
+                    target_id=pending.target_id,
+                    builtins=builtins,
+                ):
+                    if self._keep_pending_transition_visible_after_match(pending):
+                        return None
+                else:
+                    return None
+        name_match = find_builtin_preset_by_name(builtins, (current_effect.get("name") or "").strip())
+        if name_match is not None:
+            return name_match["name"]
+        raw_switch_state = data.get("switch_state")
+        forced_on_override = raw_switch_state is not None and int(raw_switch_state) == 0 and is_on is True
+        if forced_on_override:
+            last_known = self._data.last_known_builtin_preset
+            if last_known and self._data.last_known_preset == last_known:
+                return last_known
+            return None
+        current_mode = get_effect_mode(current_effect)
+        builtin_like = is_builtin_like_state(builtins, current_effect, current_category, effect_id)
+        if current_category != 0 and not builtin_like:
+            return None
+        match = find_builtin_preset(builtins, effect_id, current_mode)
+        if match is not None:
+            return match["name"]
+        last_known = self._data.last_known_builtin_preset
+        if last_known:
+            return last_known
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        data = self.coordinator.data or {}
+        effect_id = data.get("current_effect_id")
+        builtins = self._data.builtins
+        return {
+            "current_id": effect_id,
+            "builtins": self._from_catalog(
+                "builtins_attribute",
+                builtins,
+                lambda: [{"id": b.get("id"), "mode": b.get("mode"), "name": b.get("name")} for b in builtins],
+            ),
+        }
+
+    async def async_select_option(self, option: str) -> None:
+        await self._run_command(f"builtin_preset:{option}", lambda: self._async_apply_builtin_preset(option))
+
+
+class CustomPresetActions(TrimlightEntity):
+    """Applies saved custom presets; shared by the custom select and the light's effect list."""
 
     @staticmethod
     def _base_name(effect: dict) -> str:
@@ -606,10 +624,13 @@ class TrimlightCustomSelect(TrimlightEntity, SelectEntity):
             rows.append((label, effect))
         return rows
 
+    def _cached_option_entries(self, presets: list[dict]) -> list[tuple[str, dict]]:
+        return self._from_catalog("option_entries", presets, lambda: self._option_entries(presets))
+
     def _resolve_selected_effect(
         self, option: str, presets: list[dict]
     ) -> tuple[dict | None, str | None]:
-        rows = self._option_entries(presets)
+        rows = self._cached_option_entries(presets)
         for label, effect in rows:
             if label == option:
                 return effect, label
@@ -753,126 +774,15 @@ class TrimlightCustomSelect(TrimlightEntity, SelectEntity):
                 )
 
         def _start_reapply() -> None:
-            self._hass.async_create_task(_reapply_if_needed())
+            self._hass.async_create_task(
+                self._run_command(
+                    f"custom_reapply:{selected_label}", _reapply_if_needed, followup=True
+                )
+            )
 
         data.custom_reapply_handle = self._hass.loop.call_later(delay_s, _start_reapply)
 
-    @property
-    def options(self) -> list[str]:
-        data = self._data
-        presets = (self.coordinator.data or {}).get("custom_effects") or data.custom_cache
-        return [label for label, _ in self._option_entries(presets)]
-
-    @property
-    def current_option(self) -> str | None:
-        data = self.coordinator.data or {}
-        is_on = self._is_effectively_on()
-        if is_on is not True:
-            return None
-        runtime = self._data
-        presets = (data.get("custom_effects") or runtime.custom_cache)
-        rows = self._option_entries(presets)
-        current_effect = data.get("current_effect") or {}
-        current_category = data.get("current_effect_category")
-        effect_id = self._safe_int(data.get("current_effect_id"))
-        pending = self._active_pending_transition()
-        if pending is not None:
-            if pending.target_kind == "custom":
-                if matches_custom_target(
-                    presets,
-                    current_effect,
-                    current_category,
-                    effect_id,
-                    target_name=pending.target_name,
-                    target_id=pending.target_id,
-                    builtins=runtime.builtins,
-                ):
-                    if self._keep_pending_transition_visible_after_match(pending):
-                        return pending.target_name
-                else:
-                    return pending.target_name
-            elif pending.target_kind == "builtin":
-                if matches_builtin_target(
-                    runtime.builtins,
-                    current_effect,
-                    current_category,
-                    effect_id,
-                    target_name=pending.target_name,
-                    target_id=pending.target_id,
-                    target_mode=pending.target_mode,
-                ):
-                    if self._keep_pending_transition_visible_after_match(pending):
-                        return None
-                else:
-                    return None
-        raw_switch_state = data.get("switch_state")
-        forced_on_override = raw_switch_state is not None and int(raw_switch_state) == 0 and is_on is True
-        remembered_custom_active = (
-            runtime.last_known_custom_preset is not None
-            and runtime.last_known_preset == runtime.last_known_custom_preset
-        )
-        if forced_on_override:
-            last_selected = runtime.last_selected_custom_preset
-            if last_selected:
-                return last_selected
-            if remembered_custom_active:
-                return runtime.last_known_custom_preset
-            return None
-
-        if current_category not in (1, 2, None):
-            return None
-        if is_builtin_like_state(runtime.builtins, current_effect, current_category, effect_id):
-            return None
-        if effect_id is not None:
-            for label, effect in rows:
-                if effect.get("id") == effect_id:
-                    return label
-
-        inferred = find_custom_preset_by_state(presets, current_effect, effect_id)
-        if inferred is not None:
-            inferred_id = self._safe_int(inferred.get("id"))
-            if inferred_id is not None:
-                for label, effect in rows:
-                    if self._safe_int(effect.get("id")) == inferred_id:
-                        return label
-
-        # If the device reports a preview (id = -1) or no match, fall back
-        # to the last selected preset while the lights are on.
-        last_selected = runtime.last_selected_custom_preset
-        if last_selected:
-            return last_selected
-        last_known = runtime.last_known_custom_preset
-        if last_known:
-            return last_known
-        return None
-
-    @property
-    def extra_state_attributes(self) -> dict:
-        data = self.coordinator.data or {}
-        presets = (data.get("custom_effects") or self._data.custom_cache)
-        rows = self._option_entries(presets)
-        presets_list = [{"id": e.get("id"), "name": self._base_name(e)} for e in presets]
-        name_to_id: dict[str, int] = {}
-        duplicates: set[str] = set()
-        for item in presets_list:
-            name = item["name"]
-            if name in name_to_id:
-                duplicates.add(name)
-            else:
-                name_to_id[name] = item["id"]
-        for dup in duplicates:
-            name_to_id.pop(dup, None)
-
-        option_to_id = {label: effect.get("id") for label, effect in rows}
-
-        return {
-            "current_id": data.get("current_effect_id"),
-            "presets": presets_list,
-            "name_to_id": name_to_id,
-            "option_to_id": option_to_id,
-        }
-
-    async def async_select_option(self, option: str) -> None:
+    async def _async_apply_custom_preset(self, option: str) -> None:
         data = self._data
         coord = self.coordinator.data or {}
         presets = coord.get("custom_effects") or data.custom_cache
@@ -895,6 +805,7 @@ class TrimlightCustomSelect(TrimlightEntity, SelectEntity):
         correlation_id = uuid.uuid4().hex[:8]
         api = data.api
         was_off = int(coord.get("switch_state", 0) or 0) == 0
+        needs_power_on = was_off and not data.coordinator.power_state.is_known_on()
         current_effect = coord.get("current_effect") or {}
         current_category = coord.get("current_effect_category")
         current_effect_id = self._safe_int(coord.get("current_effect_id"))
@@ -913,7 +824,7 @@ class TrimlightCustomSelect(TrimlightEntity, SelectEntity):
         pixels = match.get("pixels")
         pixel_count = len(pixels) if isinstance(pixels, list) else None
         _LOGGER.info(
-            "Custom preset selected: cid=%s option='%s' name='%s' id=%s mode=%s pixels=%s was_off=%s from_builtin=%s apply=run_effect",
+            "Custom preset selected: cid=%s option='%s' name='%s' id=%s mode=%s pixels=%s was_off=%s power_on=%s from_builtin=%s apply=run_effect",
             correlation_id,
             selected_label,
             selected_name,
@@ -921,6 +832,7 @@ class TrimlightCustomSelect(TrimlightEntity, SelectEntity):
             selected_mode,
             pixel_count,
             was_off,
+            needs_power_on,
             originated_from_builtin,
         )
 
@@ -969,6 +881,7 @@ class TrimlightCustomSelect(TrimlightEntity, SelectEntity):
             brightness=brightness,
             speed=speed,
             was_off=was_off,
+            needs_power_on=needs_power_on,
             originated_from_builtin=originated_from_builtin,
             pixels=match.get("pixels"),
         )
@@ -977,13 +890,15 @@ class TrimlightCustomSelect(TrimlightEntity, SelectEntity):
         data.forced_on_until = time.monotonic() + FORCED_ON_GRACE_SECONDS
 
         try:
-            if was_off:
+            if needs_power_on:
                 # Only force manual mode when the controller is actually off.
                 switch_ok, switch_resp = await _call_with_retry(
                     action="Custom preset switch-on",
                     correlation_id=correlation_id,
                     request=lambda: api.set_switch_state(1),
                 )
+                if switch_ok:
+                    data.coordinator.power_state.confirm(True, "set_switch_state")
                 await async_log_event(
                     self._hass,
                     data,
@@ -1057,6 +972,138 @@ class TrimlightCustomSelect(TrimlightEntity, SelectEntity):
             )
 
 
+class TrimlightCustomSelect(CustomPresetActions, SelectEntity):
+    _attr_name = "Trimlight Custom Preset"
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, coordinator) -> None:
+        super().__init__(hass, entry_id, coordinator)
+        self._attr_unique_id = f"{entry_id}_custom_select"
+
+    @property
+    def options(self) -> list[str]:
+        presets = self._custom_presets()
+        return self._from_catalog(
+            "options", presets, lambda: [label for label, _ in self._cached_option_entries(presets)]
+        )
+
+    @property
+    def current_option(self) -> str | None:
+        data = self.coordinator.data or {}
+        is_on = self._is_effectively_on()
+        if is_on is not True:
+            return None
+        runtime = self._data
+        presets = self._custom_presets()
+        rows = self._cached_option_entries(presets)
+        current_effect = data.get("current_effect") or {}
+        current_category = data.get("current_effect_category")
+        effect_id = self._safe_int(data.get("current_effect_id"))
+        pending = self._active_pending_transition()
+        if pending is not None:
+            if pending.target_kind == "custom":
+                if matches_custom_target(
+                    presets,
+                    current_effect,
+                    current_category,
+                    effect_id,
+                    target_name=pending.target_name,
+                    target_id=pending.target_id,
+                    builtins=runtime.builtins,
+                ):
+                    if self._keep_pending_transition_visible_after_match(pending):
+                        return pending.target_name
+                else:
+                    return pending.target_name
+            elif pending.target_kind == "builtin":
+                if matches_builtin_target(
+                    runtime.builtins,
+                    current_effect,
+                    current_category,
+                    effect_id,
+                    target_name=pending.target_name,
+                    target_id=pending.target_id,
+                    target_mode=pending.target_mode,
+                ):
+                    if self._keep_pending_transition_visible_after_match(pending):
+                        return None
+                else:
+                    return None
+        raw_switch_state = data.get("switch_state")
+        forced_on_override = raw_switch_state is not None and int(raw_switch_state) == 0 and is_on is True
+        remembered_custom_active = (
+            runtime.last_known_custom_preset is not None
+            and runtime.last_known_preset == runtime.last_known_custom_preset
+        )
+        if forced_on_override:
+            last_selected = runtime.last_selected_custom_preset
+            if last_selected:
+                return last_selected
+            if remembered_custom_active:
+                return runtime.last_known_custom_preset
+            return None
+
+        if current_category not in (1, 2, None):
+            return None
+        if is_builtin_like_state(runtime.builtins, current_effect, current_category, effect_id):
+            return None
+        if effect_id is not None:
+            for label, effect in rows:
+                if effect.get("id") == effect_id:
+                    return label
+
+        inferred = find_custom_preset_by_state(presets, current_effect, effect_id)
+        if inferred is not None:
+            inferred_id = self._safe_int(inferred.get("id"))
+            if inferred_id is not None:
+                for label, effect in rows:
+                    if self._safe_int(effect.get("id")) == inferred_id:
+                        return label
+
+        # If the device reports a preview (id = -1) or no match, fall back
+        # to the last selected preset while the lights are on.
+        last_selected = runtime.last_selected_custom_preset
+        if last_selected:
+            return last_selected
+        last_known = runtime.last_known_custom_preset
+        if last_known:
+            return last_known
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        data = self.coordinator.data or {}
+        presets = self._custom_presets()
+        return {
+            "current_id": data.get("current_effect_id"),
+            **self._from_catalog("preset_attributes", presets, lambda: self._preset_attributes(presets)),
+        }
+
+    def _preset_attributes(self, presets: list[dict]) -> dict:
+        rows = self._cached_option_entries(presets)
+        presets_list = [{"id": e.get("id"), "name": self._base_name(e)} for e in presets]
+        name_to_id: dict[str, int] = {}
+        duplicates: set[str] = set()
+        for item in presets_list:
+            name = item["name"]
+            if name in name_to_id:
+                duplicates.add(name)
+            else:
+                name_to_id[name] = item["id"]
+        for dup in duplicates:
+            name_to_id.pop(dup, None)
+
+        option_to_id = {label: effect.get("id") for label, effect in rows}
+
+        return {
+            "presets": presets_list,
+            "name_to_id": name_to_id,
+            "option_to_id": option_to_id,
+        }
+
+    async def async_select_option(self, option: str) -> None:
+        await self._run_command(f"custom_preset:{option}", lambda: self._async_apply_custom_preset(option))
+
+
 class TrimlightCustomModeSelect(TrimlightEntity, SelectEntity):
     _attr_name = "Trimlight Custom Effect Mode"
 
@@ -1083,8 +1130,10 @@ class TrimlightCustomModeSelect(TrimlightEntity, SelectEntity):
             if is_on is not True:
                 return None
             runtime = self._data
-            presets = (data.get("custom_effects") or runtime.custom_cache)
-            custom_ids = {self._safe_int(e.get("id")) for e in presets}
+            presets = self._custom_presets()
+            custom_ids = self._from_catalog(
+                "custom_ids", presets, lambda: {self._safe_int(e.get("id")) for e in presets}
+            )
 
             current_effect = data.get("current_effect") or {}
             current_category = data.get("current_effect_category")
@@ -1194,6 +1243,9 @@ class TrimlightCustomModeSelect(TrimlightEntity, SelectEntity):
             return {"current_mode_id": None, "modes": modes}
 
     async def async_select_option(self, option: str) -> None:
+        await self._run_command(f"custom_mode:{option}", lambda: self._async_apply_option(option))
+
+    async def _async_apply_option(self, option: str) -> None:
         data = self._data
         coord = self.coordinator.data or {}
         api = data.api
@@ -1254,3 +1306,64 @@ class TrimlightCustomModeSelect(TrimlightEntity, SelectEntity):
             response=response,
         )
         self._schedule_verification_refresh()
+
+
+class TrimlightGroupPresetSelect(TrimlightGroupEntity, SelectEntity):
+    """Runs a saved preset on every controller in a group.
+
+    Members resolve the preset by name, since effect ids differ per controller.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, coordinator, group) -> None:
+        super().__init__(hass, entry_id, coordinator, group)
+        self._attr_name = f"Trimlight {group.name} Preset"
+        self._attr_unique_id = f"{entry_id}_group_{group.group_id}_preset"
+
+    @property
+    def options(self) -> list[str]:
+        presets = self._custom_presets()
+        return self._from_catalog("options", presets, lambda: self._preset_names(presets))
+
+    @staticmethod
+    def _preset_names(presets: list[dict]) -> list[str]:
+        names = [(e.get("name") or "").strip() for e in presets]
+        return list(dict.fromkeys(name for name in names if name))
+
+    @property
+    def current_option(self) -> str | None:
+        if self._is_effectively_on() is not True:
+            return None
+        data = self.coordinator.data or {}
+        presets = self._custom_presets()
+        match = find_custom_preset_by_state(
+            presets, data.get("current_effect") or {}, self._safe_int(data.get("current_effect_id"))
+        )
+        name = (match.get("name") or "").strip() if match is not None else None
+        return name if name in self.options else None
+
+    @staticmethod
+    def _safe_int(value: object, default: int | None = None) -> int | None:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    async def async_select_option(self, option: str) -> None:
+        async def _run_preset(member: TrimlightData) -> dict | None:
+            coord = member.coordinator.data or {}
+            effect = find_saved_effect_by_name(
+                coord.get("custom_effects") or member.custom_cache,
+                coord.get("builtin_effects") or [],
+                option,
+            )
+            if effect is None or effect.get("id") is None:
+                _LOGGER.warning(
+                    "Preset '%s' is not saved on %s; skipping", option, member.api._creds.device_id
+                )
+                return None
+            return await member.api.run_effect(int(effect["id"]))
+
+        await self._run_command(
+            f"group_preset:{self._group.group_id}:{option}",
+            lambda: self._async_group_command(f"preset:{option}", _run_preset),
+        )
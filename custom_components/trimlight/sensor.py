@@ -15,6 +15,7 @@ from .effects import (
     is_builtin_like_state,
     matches_builtin_target,
     matches_custom_target,
+    saved_effect_name,
 )
 
 
@@ -23,7 +24,12 @@ async def async_setup_entry(
 ) -> None:
     data = get_data(hass, entry.entry_id)
     coordinator = data.coordinator
-    async_add_entities([TrimlightCurrentPresetSensor(hass, entry.entry_id, coordinator)])
+    async_add_entities(
+        [
+            TrimlightCurrentPresetSensor(hass, entry.entry_id, coordinator),
+            TrimlightPlaylistSensor(hass, entry.entry_id, coordinator),
+        ]
+    )
 
 
 class TrimlightCurrentPresetSensor(TrimlightEntity, SensorEntity):
@@ -53,7 +59,7 @@ class TrimlightCurrentPresetSensor(TrimlightEntity, SensorEntity):
         current_mode = get_effect_mode(current_effect)
 
         runtime = self._data
-        presets = (data.get("custom_effects") or runtime.custom_cache)
+        presets = self._custom_presets()
         builtins = runtime.builtins
         pending = self._active_pending_transition()
 
@@ -159,6 +165,18 @@ class TrimlightCurrentPresetSensor(TrimlightEntity, SensorEntity):
 
         return "Unknown"
 
+    @classmethod
+    def _preset_lookup(cls, presets: list[dict]) -> tuple[dict[int, dict], dict[str, dict]]:
+        # First match wins, as with the linear scans this replaces.
+        by_id: dict[int, dict] = {}
+        by_name: dict[str, dict] = {}
+        for effect in presets:
+            effect_id = cls._safe_int(effect.get("id"))
+            if effect_id is not None:
+                by_id.setdefault(effect_id, effect)
+            by_name.setdefault((effect.get("name") or "").strip(), effect)
+        return by_id, by_name
+
     @property
     def extra_state_attributes(self) -> dict:
         data = self.coordinator.data or {}
@@ -167,7 +185,7 @@ class TrimlightCurrentPresetSensor(TrimlightEntity, SensorEntity):
         effect_id = self._safe_int(data.get("current_effect_id"))
         current_category = data.get("current_effect_category")
         runtime = self._data
-        presets = (data.get("custom_effects") or runtime.custom_cache)
+        presets = self._custom_presets()
         custom_state = self._hass.states.get("select.trimlight_custom_preset")
         builtins = runtime.builtins
         pending = self._active_pending_transition()
@@ -177,13 +195,15 @@ class TrimlightCurrentPresetSensor(TrimlightEntity, SensorEntity):
                 return False
             return value not in {"unknown", "unavailable", "none", ""}
 
+        by_id, by_name = self._from_catalog("preset_lookup", presets, lambda: self._preset_lookup(presets))
+
         def _find_custom_effect_by_target(target_id: int | None, target_name: str | None) -> dict | None:
             if target_id is not None:
-                match = next((e for e in presets if self._safe_int(e.get("id")) == target_id), None)
+                match = by_id.get(target_id)
                 if match is not None:
                     return match
             if target_name:
-                return next((e for e in presets if (e.get("name") or "").strip() == target_name), None)
+                return by_name.get(target_name)
             return None
 
         raw_switch_state = data.get("switch_state")
@@ -265,10 +285,7 @@ class TrimlightCurrentPresetSensor(TrimlightEntity, SensorEntity):
                 matched_id = name_to_id.get(selected_label)
             if matched_id is not None:
                 matched_id = int(matched_id)
-                resolved_custom_effect = next(
-                    (e for e in presets if e.get("id") == matched_id),
-                    None,
-                )
+                resolved_custom_effect = by_id.get(matched_id)
                 if resolved_custom_effect is not None:
                     resolved_effect_id = matched_id
                     current_category = 2
@@ -310,3 +327,41 @@ class TrimlightCurrentPresetSensor(TrimlightEntity, SensorEntity):
             "current_effect_reverse": current_effect.get("reverse"),
             "current_effect_pixels": pixels,
         }
+
+
+class TrimlightPlaylistSensor(TrimlightEntity, SensorEntity):
+    """The combined effect the controller cycles through on its own."""
+
+    _attr_name = "Trimlight Playlist"
+    _coordinator_view = "catalog"
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, coordinator) -> None:
+        super().__init__(hass, entry_id, coordinator)
+        self._attr_unique_id = f"{entry_id}_playlist"
+
+    def _preset_names(self) -> list[str]:
+        data = self.coordinator.data or {}
+        combined = data.get("combined_effect") or {}
+        custom_effects = data.get("custom_effects") or self._data.custom_cache
+        builtin_effects = data.get("builtin_effects") or []
+        return [
+            saved_effect_name(custom_effects, builtin_effects, int(effect_id))
+            for effect_id in combined.get("effectIds") or []
+        ]
+
+    @property
+    def native_value(self) -> str | None:
+        # No playlist reads as unknown rather than a name a preset could have.
+        names = self._preset_names()
+        if not names:
+            return None
+        return ", ".join(names)[:255]
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        combined = (self.coordinator.data or {}).get("combined_effect") or {}
+        return {
+            "effect_ids": list(combined.get("effectIds") or []),
+            "presets": self._preset_names(),
+            "interval_minutes": combined.get("interval"),
+        }
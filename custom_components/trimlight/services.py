@@ -0,0 +1,739 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.const import SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.sun import get_astral_event_date
+from homeassistant.util import color as color_util, dt as dt_util
+
+from .backups import (
+    backup_timestamp,
+    capture_snapshot,
+    get_backup_store,
+    plan_effect_restore,
+    plan_link_restore,
+    resolve_new_effect_ids,
+)
+from .const import (
+    COMBINED_EFFECT_ID,
+    CUSTOM_EFFECT_MODES,
+    DOMAIN,
+    MAX_COMBINED_EFFECTS,
+    MAX_PIXEL_SEGMENTS,
+    MAX_SEGMENT_PIXELS,
+)
+from .controller import apply_overlay_update
+from .data import TrimlightData
+from .debug import async_log_event
+from .effects import find_custom_preset_by_name, find_saved_effect_by_name, port_pixel_total
+from .overlays import OVERLAY_TYPES
+from .pixels import LedColor, encode_pixel_runs, gradient_colors, repeat_colors
+from .preset_files import open_preset_file, preset_content_hash, read_custom_presets, write_preset_file
+from .schedules import (
+    DAILY_SCHEDULE_SLOTS,
+    REPETITIONS,
+    SchedulePlan,
+    plan_calendar,
+    plan_daily,
+    schedule_date,
+    schedule_time,
+)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_PRESETS = "presets"
+ATTR_INTERVAL = "interval"
+ATTR_SCHEDULE = "schedule"
+ATTR_SCHEDULES = "schedules"
+ATTR_ENABLED = "enabled"
+ATTR_PRESET = "preset"
+ATTR_REPETITION = "repetition"
+ATTR_START_TIME = "start_time"
+ATTR_END_TIME = "end_time"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+ATTR_OVERLAYS = "overlays"
+ATTR_TYPE = "type"
+ATTR_MODE = "mode"
+ATTR_NAME = "name"
+ATTR_CLOUD = "cloud"
+ATTR_PRUNE_EFFECTS = "prune_effects"
+ATTR_SPEED = "speed"
+ATTR_BRIGHTNESS = "brightness"
+ATTR_COLORS = "colors"
+ATTR_PIXELS_PER_COLOR = "pixels_per_color"
+ATTR_GRADIENT = "gradient"
+ATTR_LENGTH = "length"
+ATTR_BANDS = "bands"
+ATTR_LEDS = "leds"
+ATTR_PATH = "path"
+
+SERVICE_SET_PLAYLIST = "set_playlist"
+SERVICE_SET_DAILY_SCHEDULE = "set_daily_schedule"
+SERVICE_SET_CALENDAR_SCHEDULES = "set_calendar_schedules"
+SERVICE_SET_OVERLAYS = "set_overlays"
+SERVICE_BACKUP = "backup"
+SERVICE_RESTORE = "restore"
+SERVICE_BUILD_EFFECT = "build_effect"
+SERVICE_EXPORT_PRESETS = "export_presets"
+SERVICE_IMPORT_PRESETS = "import_presets"
+
+EVENT_PRESET_IMPORT_PROGRESS = f"{DOMAIN}_preset_import_progress"
+_IMPORT_CONCURRENCY = 3
+# Presets read from the file per executor hop; only one batch is held at a time.
+_IMPORT_BATCH_SIZE = 20
+
+OVERLAY_MODES = ("replace", "add", "remove")
+
+# Schedules can point at the combined effect instead of a single preset.
+PLAYLIST_PRESET = "playlist"
+
+_SUN_TIME = re.compile(r"^(sunrise|sunset)\s*(?:([+-])\s*(\d{1,2}):(\d{2}))?$")
+_MONTH_DAY = re.compile(r"^(\d{1,2})-(\d{1,2})$")
+
+
+def _time_or_sun_event(value: Any) -> str:
+    text = cv.string(value).strip().lower()
+    if _SUN_TIME.match(text) is None:
+        cv.time(text)
+    return text
+
+
+def _month_day(value: Any) -> dict[str, int]:
+    match = _MONTH_DAY.match(cv.string(value).strip())
+    if match is None:
+        raise vol.Invalid(f"Expected MM-DD, got '{value}'")
+    month, day = int(match.group(1)), int(match.group(2))
+    try:
+        # 2000 is a leap year, so 02-29 is accepted.
+        datetime(2000, month, day)
+    except ValueError as exc:
+        raise vol.Invalid(f"Invalid date '{value}'") from exc
+    return schedule_date(month, day)
+
+
+def _led_color(value: Any) -> LedColor:
+    """Accept [r, g, b], "#rrggbb", a CSS color name, or "off" for an unlit pixel."""
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)):
+        if len(value) != 3:
+            raise vol.Invalid(f"Expected [r, g, b], got {value}")
+        red, green, blue = (vol.All(vol.Coerce(int), vol.Range(min=0, max=255))(c) for c in value)
+        return (red << 16) | (green << 8) | blue
+    text = cv.string(value).strip().lower()
+    if text == "off":
+        return None
+    hex_text = text.lstrip("#")
+    if len(hex_text) == 6:
+        try:
+            return int(hex_text, 16)
+        except ValueError:
+            pass
+    try:
+        red, green, blue = color_util.color_name_to_rgb(text)
+    except ValueError as exc:
+        raise vol.Invalid(f"Unknown color '{value}'") from exc
+    return (red << 16) | (green << 8) | blue
+
+
+def _lit_color(value: Any) -> int:
+    color = _led_color(value)
+    if color is None:
+        raise vol.Invalid("Gradient colors cannot be 'off'")
+    return color
+
+
+def _custom_mode(value: Any) -> int:
+    if isinstance(value, str) and not value.strip().isdigit():
+        wanted = value.strip().lower()
+        for mode, name in CUSTOM_EFFECT_MODES.items():
+            if name.lower() == wanted:
+                return mode
+        raise vol.Invalid(f"Unknown custom effect mode '{value}'")
+    return vol.All(vol.Coerce(int), vol.In(list(CUSTOM_EFFECT_MODES)))(value)
+
+
+_ENTRY_SCHEMA = {vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string}
+
+SET_PLAYLIST_SCHEMA = vol.Schema(
+    {
+        **_ENTRY_SCHEMA,
+        vol.Required(ATTR_PRESETS): vol.All(
+            cv.ensure_list, [cv.string], vol.Length(min=1, max=MAX_COMBINED_EFFECTS)
+        ),
+        vol.Required(ATTR_INTERVAL): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+    }
+)
+
+SET_DAILY_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        **_ENTRY_SCHEMA,
+        vol.Required(ATTR_SCHEDULE): vol.All(vol.Coerce(int), vol.Range(min=1, max=DAILY_SCHEDULE_SLOTS)),
+        vol.Optional(ATTR_ENABLED, default=True): cv.boolean,
+        vol.Optional(ATTR_PRESET): cv.string,
+        vol.Optional(ATTR_REPETITION, default="everyday"): vol.In(list(REPETITIONS)),
+        vol.Required(ATTR_START_TIME): _time_or_sun_event,
+        vol.Required(ATTR_END_TIME): _time_or_sun_event,
+    }
+)
+
+_CALENDAR_ENTRY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_PRESET): cv.string,
+        vol.Required(ATTR_START_DATE): _month_day,
+        vol.Required(ATTR_END_DATE): _month_day,
+        vol.Required(ATTR_START_TIME): _time_or_sun_event,
+        vol.Required(ATTR_END_TIME): _time_or_sun_event,
+    }
+)
+
+SET_CALENDAR_SCHEDULES_SCHEMA = vol.Schema(
+    {
+        **_ENTRY_SCHEMA,
+        vol.Required(ATTR_SCHEDULES): vol.All(cv.ensure_list, [_CALENDAR_ENTRY_SCHEMA]),
+    }
+)
+
+SET_OVERLAYS_SCHEMA = vol.Schema(
+    {
+        **_ENTRY_SCHEMA,
+        vol.Required(ATTR_OVERLAYS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_TYPE): vol.In(list(OVERLAY_TYPES)),
+                        vol.Required(ATTR_PRESET): cv.string,
+                    }
+                )
+            ],
+        ),
+        vol.Optional(ATTR_MODE, default="replace"): vol.In(OVERLAY_MODES),
+    }
+)
+
+BACKUP_SCHEMA = vol.Schema(
+    {
+        **_ENTRY_SCHEMA,
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Optional(ATTR_CLOUD, default=False): cv.boolean,
+    }
+)
+
+RESTORE_SCHEMA = vol.Schema(
+    {
+        **_ENTRY_SCHEMA,
+        vol.Required(ATTR_NAME): cv.string,
+        vol.Optional(ATTR_PRUNE_EFFECTS, default=False): cv.boolean,
+        vol.Optional(ATTR_CLOUD, default=False): cv.boolean,
+    }
+)
+
+BUILD_EFFECT_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **_ENTRY_SCHEMA,
+            vol.Required(ATTR_NAME): cv.string,
+            vol.Optional(ATTR_MODE, default=0): _custom_mode,
+            vol.Optional(ATTR_SPEED, default=100): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+            vol.Optional(ATTR_BRIGHTNESS, default=255): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+            vol.Exclusive(ATTR_COLORS, "pattern"): vol.All(cv.ensure_list, vol.Length(min=1), [_led_color]),
+            vol.Optional(ATTR_PIXELS_PER_COLOR, default=1): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_SEGMENT_PIXELS)
+            ),
+            vol.Exclusive(ATTR_GRADIENT, "pattern"): vol.All(
+                cv.ensure_list, vol.Length(min=1), [_lit_color]
+            ),
+            vol.Optional(ATTR_LENGTH): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_PIXEL_SEGMENTS * MAX_SEGMENT_PIXELS)
+            ),
+            vol.Optional(ATTR_BANDS): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_PIXEL_SEGMENTS)),
+            vol.Exclusive(ATTR_LEDS, "pattern"): vol.All(cv.ensure_list, vol.Length(min=1), [_led_color]),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_COLORS, ATTR_GRADIENT, ATTR_LEDS),
+)
+
+PRESET_FILE_SCHEMA = vol.Schema({**_ENTRY_SCHEMA, vol.Required(ATTR_PATH): cv.string})
+
+
+def _resolve_entry(hass: HomeAssistant, call: ServiceCall) -> TrimlightData:
+    entries: dict[str, TrimlightData] = hass.data.get(DOMAIN) or {}
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id:
+        data = entries.get(entry_id)
+        if data is None:
+            raise HomeAssistantError(f"Trimlight config entry '{entry_id}' is not loaded")
+        return data
+    if len(entries) != 1:
+        raise HomeAssistantError(
+            f"{len(entries)} Trimlight controllers are loaded; set {ATTR_CONFIG_ENTRY_ID} to pick one"
+        )
+    return next(iter(entries.values()))
+
+
+def _raise_for_result(action: str, response: dict[str, Any] | None) -> None:
+    code = response.get("code") if isinstance(response, dict) else None
+    if code not in (None, 0):
+        raise HomeAssistantError(f"Trimlight {action} failed: code={code} desc={response.get('desc')}")
+
+
+async def _async_set_playlist(hass: HomeAssistant, call: ServiceCall) -> None:
+    data = _resolve_entry(hass, call)
+    coordinator = data.coordinator
+    coord = coordinator.data or {}
+    custom_effects = coord.get("custom_effects") or data.custom_cache
+    builtin_effects = coord.get("builtin_effects") or []
+
+    effect_ids: list[int] = []
+    missing: list[str] = []
+    for name in call.data[ATTR_PRESETS]:
+        effect = find_saved_effect_by_name(custom_effects, builtin_effects, name)
+        if effect is None or effect.get("id") is None:
+            missing.append(name)
+            continue
+        effect_ids.append(int(effect["id"]))
+    if missing:
+        raise HomeAssistantError(f"Presets not saved on the controller: {', '.join(missing)}")
+
+    interval = call.data[ATTR_INTERVAL]
+    current = coord.get("combined_effect") or {}
+    if list(current.get("effectIds") or []) == effect_ids and current.get("interval") == interval:
+        await async_log_event(
+            hass,
+            data,
+            "playlist_unchanged",
+            coordinator_data=coord,
+            effect_ids=effect_ids,
+            interval=interval,
+        )
+        return
+
+    response = await data.api.set_combined_effect(effect_ids, interval)
+    await async_log_event(
+        hass,
+        data,
+        "playlist_saved",
+        coordinator_data=coord,
+        effect_ids=effect_ids,
+        interval=interval,
+        response=response,
+    )
+    _raise_for_result("set combined effect", response)
+    await coordinator.async_refresh()
+
+
+def _resolve_schedule_time(hass: HomeAssistant, value: str) -> dict[str, int]:
+    """Turn "HH:MM", "sunset" or "sunrise-00:30" into a controller schedule time for today."""
+    match = _SUN_TIME.match(value)
+    if match is None:
+        parsed = cv.time(value)
+        return schedule_time(parsed.hour, parsed.minute)
+
+    event = SUN_EVENT_SUNRISE if match.group(1) == "sunrise" else SUN_EVENT_SUNSET
+    when = get_astral_event_date(hass, event, dt_util.now().date())
+    if when is None:
+        raise HomeAssistantError(f"No {event} today at the configured location")
+    when = dt_util.as_local(when)
+    if match.group(2):
+        offset = timedelta(hours=int(match.group(3)), minutes=int(match.group(4)))
+        when = when + offset if match.group(2) == "+" else when - offset
+    return schedule_time(when.hour, when.minute)
+
+
+def _resolve_schedule_effect_id(data: TrimlightData, preset: str) -> int:
+    if preset.strip().lower() == PLAYLIST_PRESET:
+        return COMBINED_EFFECT_ID
+    coord = data.coordinator.data or {}
+    effect = find_saved_effect_by_name(
+        coord.get("custom_effects") or data.custom_cache,
+        coord.get("builtin_effects") or [],
+        preset,
+    )
+    if effect is None or effect.get("id") is None:
+        raise HomeAssistantError(f"Preset '{preset}' is not saved on the controller")
+    return int(effect["id"])
+
+
+async def _async_apply_schedule_plan(
+    hass: HomeAssistant, data: TrimlightData, plan: SchedulePlan, *, source: str
+) -> None:
+    coordinator = data.coordinator
+    await async_log_event(
+        hass,
+        data,
+        "schedule_plan",
+        coordinator_data=coordinator.data or {},
+        source=source,
+        **plan.as_dict(),
+    )
+    if not plan:
+        return
+
+    try:
+        await _async_write_schedule_plan(data, plan)
+    finally:
+        # Some slots may have been written before a failure; re-read them either way.
+        await coordinator.async_refresh()
+
+
+async def _async_write_schedule_plan(data: TrimlightData, plan: SchedulePlan) -> None:
+    api = data.api
+    for schedule in plan.daily_saves:
+        _raise_for_result(f"save daily schedule {schedule['id']}", await api.save_daily_schedule(schedule))
+    for schedule in plan.calendar_saves:
+        _raise_for_result(
+            f"save calendar schedule {schedule['id']}", await api.save_calendar_schedule(schedule)
+        )
+    for slot in plan.calendar_deletes:
+        _raise_for_result(f"delete calendar schedule {slot}", await api.delete_calendar_schedule(slot))
+
+
+async def _async_set_daily_schedule(hass: HomeAssistant, call: ServiceCall) -> None:
+    data = _resolve_entry(hass, call)
+    coord = data.coordinator.data or {}
+    slot = call.data[ATTR_SCHEDULE] - 1
+    current = list(coord.get("daily") or [])
+    existing = next((row for row in current if row.get("id") == slot), {})
+
+    preset = call.data.get(ATTR_PRESET)
+    if preset is not None:
+        effect_id = _resolve_schedule_effect_id(data, preset)
+    elif existing.get("effectId") is not None:
+        effect_id = int(existing["effectId"])
+    else:
+        raise HomeAssistantError(f"Daily schedule {slot + 1} has no preset yet; set '{ATTR_PRESET}'")
+
+    desired = {
+        "enable": call.data[ATTR_ENABLED],
+        "effectId": effect_id,
+        "repetition": REPETITIONS[call.data[ATTR_REPETITION]],
+        "startTime": _resolve_schedule_time(hass, call.data[ATTR_START_TIME]),
+        "endTime": _resolve_schedule_time(hass, call.data[ATTR_END_TIME]),
+    }
+    plan = plan_daily({slot: desired}, current, SchedulePlan())
+    await _async_apply_schedule_plan(hass, data, plan, source=SERVICE_SET_DAILY_SCHEDULE)
+
+
+async def _async_set_calendar_schedules(hass: HomeAssistant, call: ServiceCall) -> None:
+    data = _resolve_entry(hass, call)
+    coord = data.coordinator.data or {}
+    desired = [
+        {
+            "effectId": _resolve_schedule_effect_id(data, entry[ATTR_PRESET]),
+            "startDate": entry[ATTR_START_DATE],
+            "endDate": entry[ATTR_END_DATE],
+            "startTime": _resolve_schedule_time(hass, entry[ATTR_START_TIME]),
+            "endTime": _resolve_schedule_time(hass, entry[ATTR_END_TIME]),
+        }
+        for entry in call.data[ATTR_SCHEDULES]
+    ]
+    try:
+        plan = plan_calendar(desired, list(coord.get("calendar") or []), SchedulePlan())
+    except ValueError as exc:
+        raise HomeAssistantError(str(exc)) from exc
+    await _async_apply_schedule_plan(hass, data, plan, source=SERVICE_SET_CALENDAR_SCHEDULES)
+
+
+async def _async_set_overlays(hass: HomeAssistant, call: ServiceCall) -> None:
+    data = _resolve_entry(hass, call)
+    coord = data.coordinator.data or {}
+    custom_effects = coord.get("custom_effects") or data.custom_cache
+    builtin_effects = coord.get("builtin_effects") or []
+    overlays: list[dict[str, int]] = []
+    for entry in call.data[ATTR_OVERLAYS]:
+        effect = find_saved_effect_by_name(custom_effects, builtin_effects, entry[ATTR_PRESET])
+        if effect is None or effect.get("id") is None:
+            raise HomeAssistantError(f"Preset '{entry[ATTR_PRESET]}' is not saved on the controller")
+        overlays.append({"overlayType": OVERLAY_TYPES[entry[ATTR_TYPE]], "targetEffect": int(effect["id"])})
+
+    response = await apply_overlay_update(
+        data, **{call.data[ATTR_MODE]: overlays}, source=SERVICE_SET_OVERLAYS
+    )
+    if response is not None:
+        _raise_for_result("update overlay effects", response)
+
+
+async def _async_backup(hass: HomeAssistant, call: ServiceCall) -> None:
+    data = _resolve_entry(hass, call)
+    coordinator = data.coordinator
+    store = get_backup_store(hass)
+    await store.async_load()
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        raise HomeAssistantError("Could not read the controller state; nothing was backed up")
+    coord = coordinator.data or {}
+
+    now = dt_util.now()
+    cloud_backup = None
+    if call.data[ATTR_CLOUD]:
+        _raise_for_result("backup", await data.api.backup_device_data(backup_timestamp(now)))
+        response = await data.api.get_device_backup()
+        _raise_for_result("get backup", response)
+        cloud_backup = response.get("payload") or None
+
+    info = await store.async_save(
+        call.data[ATTR_NAME],
+        capture_snapshot(coord),
+        device_id=data.api._creds.device_id,
+        created_at=now.isoformat(),
+        cloud_backup=cloud_backup,
+    )
+    await async_log_event(hass, data, "backup_saved", coordinator_data=coord, **info)
+
+
+async def _async_restore(hass: HomeAssistant, call: ServiceCall) -> None:
+    data = _resolve_entry(hass, call)
+    coordinator = data.coordinator
+    store = get_backup_store(hass)
+    await store.async_load()
+    name = call.data[ATTR_NAME]
+    snapshot = store.get(name)
+    info = store.info(name)
+    if snapshot is None or info is None:
+        raise HomeAssistantError(f"No Trimlight backup named '{name}'")
+
+    api = data.api
+    if call.data[ATTR_CLOUD]:
+        cloud_backup = info.get("cloud_backup") or {}
+        if info.get("device_id") != api._creds.device_id or not cloud_backup.get("backupKey"):
+            raise HomeAssistantError(f"Backup '{name}' has no cloud backup for this controller")
+        try:
+            _raise_for_result("restore", await api.restore_device_backup(cloud_backup["backupKey"]))
+        finally:
+            await coordinator.async_refresh()
+        return
+
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        raise HomeAssistantError("Could not read the controller state; nothing was restored")
+    current = capture_snapshot(coordinator.data or {})
+    plan = plan_effect_restore(
+        snapshot,
+        current,
+        same_device=info.get("device_id") == api._creds.device_id,
+        prune_effects=call.data[ATTR_PRUNE_EFFECTS],
+    )
+
+    # Effects go first so schedules, the playlist and overlays can point at them.
+    try:
+        # Deletes before saves, so new effects fit under the controller's limit.
+        for effect_id in plan.effect_deletes:
+            _raise_for_result(f"delete effect {effect_id}", await api.delete_effect(effect_id))
+        for effect in plan.effect_saves:
+            response = await api.save_effect(effect, int(effect.get("brightness", 255)))
+            _raise_for_result(f"save effect '{effect.get('name')}'", response)
+        if plan.new_effects:
+            # New effects only get their ids once the controller has stored them.
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                raise HomeAssistantError("Could not read the restored effects; schedules were not restored")
+            current = capture_snapshot(coordinator.data or {})
+            missing = resolve_new_effect_ids(plan, current["custom_effects"])
+            if missing:
+                raise HomeAssistantError(f"Restored effects not found on the controller: {', '.join(missing)}")
+        plan_link_restore(snapshot, current, plan)
+        await async_log_event(
+            hass, data, "restore_plan", coordinator_data=coordinator.data or {}, backup=name, **plan.as_dict()
+        )
+        await _async_write_schedule_plan(data, plan.schedules)
+        if plan.combined_effect is not None:
+            response = await api.set_combined_effect(
+                plan.combined_effect["effectIds"], plan.combined_effect["interval"]
+            )
+            _raise_for_result("set combined effect", response)
+        if plan.overlay_effects is not None:
+            response = await apply_overlay_update(data, replace=plan.overlay_effects, source=SERVICE_RESTORE)
+            if response is not None:
+                _raise_for_result("update overlay effects", response)
+    finally:
+        await coordinator.async_refresh()
+
+
+def _pattern_leds(call: ServiceCall, port_pixels: int) -> list[LedColor]:
+    if ATTR_COLORS in call.data:
+        return repeat_colors(call.data[ATTR_COLORS], call.data[ATTR_PIXELS_PER_COLOR])
+    if ATTR_GRADIENT in call.data:
+        length = call.data.get(ATTR_LENGTH) or min(
+            port_pixels or MAX_SEGMENT_PIXELS, MAX_PIXEL_SEGMENTS * MAX_SEGMENT_PIXELS
+        )
+        return gradient_colors(call.data[ATTR_GRADIENT], length, call.data.get(ATTR_BANDS))
+    leds = call.data[ATTR_LEDS]
+    if port_pixels and len(leds) > port_pixels:
+        raise HomeAssistantError(f"{len(leds)} LED colors given; the controller's ports cover {port_pixels}")
+    return leds
+
+
+async def _async_build_effect(hass: HomeAssistant, call: ServiceCall) -> None:
+    data = _resolve_entry(hass, call)
+    coordinator = data.coordinator
+    coord = coordinator.data or {}
+    leds = _pattern_leds(call, port_pixel_total(coord.get("ports")))
+    try:
+        pixels = encode_pixel_runs(leds)
+    except ValueError as exc:
+        raise HomeAssistantError(str(exc)) from exc
+
+    name = call.data[ATTR_NAME]
+    existing = find_custom_preset_by_name(coord.get("custom_effects") or data.custom_cache, name)
+    effect = {
+        "id": existing.get("id", -1) if existing is not None else -1,
+        "name": name,
+        "category": 1,
+        "mode": call.data[ATTR_MODE],
+        "speed": call.data[ATTR_SPEED],
+        "brightness": call.data[ATTR_BRIGHTNESS],
+        "pixels": pixels,
+    }
+    unchanged = existing is not None and all(
+        existing.get(key) == effect[key] for key in ("mode", "speed", "brightness", "pixels")
+    )
+    response = None
+    if not unchanged:
+        response = await data.api.save_effect(effect, effect["brightness"])
+    await async_log_event(
+        hass,
+        data,
+        "effect_built",
+        coordinator_data=coord,
+        name=name,
+        effect_id=effect["id"],
+        leds=len(leds),
+        segments=len(pixels),
+        unchanged=unchanged,
+        response=response,
+    )
+    if response is not None:
+        _raise_for_result(f"save effect '{name}'", response)
+        await coordinator.async_refresh()
+
+
+def _resolve_file_path(hass: HomeAssistant, path: str) -> str:
+    full_path = path if os.path.isabs(path) else hass.config.path(path)
+    if not hass.config.is_allowed_path(full_path):
+        raise HomeAssistantError(f"Path '{full_path}' is not in allowlist_external_dirs")
+    return full_path
+
+
+async def _async_export_presets(hass: HomeAssistant, call: ServiceCall) -> None:
+    data = _resolve_entry(hass, call)
+    path = _resolve_file_path(hass, call.data[ATTR_PATH])
+    header = {"exported_at": dt_util.now().isoformat(), "device_id": data.api._creds.device_id}
+    try:
+        count = await hass.async_add_executor_job(
+            write_preset_file, path, header, data.builtins, data.custom_cache
+        )
+    except OSError as exc:
+        raise HomeAssistantError(f"Could not write {path}: {exc}") from exc
+    await async_log_event(
+        hass,
+        data,
+        "presets_exported",
+        coordinator_data=data.coordinator.data or {},
+        path=path,
+        custom_presets=count,
+        builtin_presets=len(data.builtins),
+    )
+
+
+async def _async_import_presets(hass: HomeAssistant, call: ServiceCall) -> None:
+    data = _resolve_entry(hass, call)
+    coordinator = data.coordinator
+    path = _resolve_file_path(hass, call.data[ATTR_PATH])
+    try:
+        handle, header = await hass.async_add_executor_job(open_preset_file, path)
+    except (OSError, ValueError) as exc:
+        raise HomeAssistantError(f"Could not read {path}: {exc}") from exc
+
+    existing: dict[str, dict[str, Any]] = {}
+    for effect in (coordinator.data or {}).get("custom_effects") or data.custom_cache:
+        existing.setdefault((effect.get("name") or "").strip(), effect)
+
+    progress = {"read": 0, "saved": 0, "unchanged": 0, "failed": 0}
+    failures: list[str] = []
+    semaphore = asyncio.Semaphore(_IMPORT_CONCURRENCY)
+
+    async def _save(effect: dict[str, Any]) -> None:
+        name = effect.get("name")
+        async with semaphore:
+            try:
+                response = await data.api.save_effect(effect, int(effect.get("brightness", 255)))
+            except Exception as exc:  # noqa: BLE001
+                response = {"code": None, "desc": str(exc)}
+        if isinstance(response, dict) and response.get("code") == 0:
+            progress["saved"] += 1
+        else:
+            progress["failed"] += 1
+            failures.append(f"{name}: {response.get('desc') if isinstance(response, dict) else response}")
+
+    def _fire_progress(done: bool) -> None:
+        hass.bus.async_fire(
+            EVENT_PRESET_IMPORT_PROGRESS,
+            {"device_id": data.api._creds.device_id, "path": path, "done": done, **progress},
+        )
+
+    try:
+        while batch := await hass.async_add_executor_job(read_custom_presets, handle, _IMPORT_BATCH_SIZE):
+            saves: list[dict[str, Any]] = []
+            for effect in batch:
+                progress["read"] += 1
+                current = existing.get((effect.get("name") or "").strip())
+                if current is not None and preset_content_hash(current) == preset_content_hash(effect):
+                    progress["unchanged"] += 1
+                    continue
+                # Ids are per controller: update the preset of the same name or save a new one.
+                saves.append({**effect, "id": current.get("id", -1) if current is not None else -1})
+            await asyncio.gather(*(_save(effect) for effect in saves))
+            _fire_progress(False)
+    except (OSError, ValueError) as exc:
+        raise HomeAssistantError(f"Could not read {path}: {exc}") from exc
+    finally:
+        await hass.async_add_executor_job(handle.close)
+        _fire_progress(True)
+        if progress["saved"]:
+            await coordinator.async_refresh()
+
+    await async_log_event(
+        hass,
+        data,
+        "presets_imported",
+        coordinator_data=coordinator.data or {},
+        path=path,
+        source_device_id=header.get("device_id"),
+        failures=failures,
+        **progress,
+    )
+    if failures:
+        raise HomeAssistantError(f"{len(failures)} presets failed to import: {'; '.join(failures)}")
+
+
+_SERVICES: dict[str, tuple[Any, vol.Schema]] = {
+    SERVICE_SET_PLAYLIST: (_async_set_playlist, SET_PLAYLIST_SCHEMA),
+    SERVICE_SET_DAILY_SCHEDULE: (_async_set_daily_schedule, SET_DAILY_SCHEDULE_SCHEMA),
+    SERVICE_SET_CALENDAR_SCHEDULES: (_async_set_calendar_schedules, SET_CALENDAR_SCHEDULES_SCHEMA),
+    SERVICE_SET_OVERLAYS: (_async_set_overlays, SET_OVERLAYS_SCHEMA),
+    SERVICE_BACKUP: (_async_backup, BACKUP_SCHEMA),
+    SERVICE_RESTORE: (_async_restore, RESTORE_SCHEMA),
+    SERVICE_BUILD_EFFECT: (_async_build_effect, BUILD_EFFECT_SCHEMA),
+    SERVICE_EXPORT_PRESETS: (_async_export_presets, PRESET_FILE_SCHEMA),
+    SERVICE_IMPORT_PRESETS: (_async_import_presets, PRESET_FILE_SCHEMA),
+}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the domain services once; each call resolves its config entry."""
+    for service, (handler, schema) in _SERVICES.items():
+
+        async def _handle(call: ServiceCall, handler=handler) -> None:
+            await handler(hass, call)
+
+        hass.services.async_register(DOMAIN, service, _handle, schema=schema)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from typing import Any, Callable
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.storage import Store
@@ -43,12 +43,15 @@ async def save_preset_cache(
 
 def setup_preset_cache_listener(
     hass: HomeAssistant, data: TrimlightData, coordinator: TrimlightCoordinator
-) -> None:
+) -> Callable[[], None]:
     async def _save_cache() -> None:
         await save_preset_cache(hass, data, coordinator.data or {})
 
     def _schedule_cache_write() -> None:
         hass.async_create_task(_save_cache())
 
-    coordinator.async_add_listener(_schedule_cache_write)
+    # The cache only depends on the catalog, so status-only refreshes (including
+    # verification refreshes after each command) do not rewrite it.
+    remove_listener = coordinator.async_add_catalog_listener(_schedule_cache_write)
     _schedule_cache_write()
+    return remove_listener
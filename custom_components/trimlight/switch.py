@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .controller import apply_overlay_update
+from .data import get_data
+from .entity import TrimlightEntity
+from .overlays import OVERLAY_TYPES
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    data = get_data(hass, entry.entry_id)
+    coordinator = data.coordinator
+    async_add_entities(
+        TrimlightOverlaySwitch(hass, entry.entry_id, coordinator, name, overlay_type)
+        for name, overlay_type in OVERLAY_TYPES.items()
+    )
+
+
+class TrimlightOverlaySwitch(TrimlightEntity, SwitchEntity):
+    """Lightning or snow overlay on the saved effect that is currently running."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, coordinator, name: str, overlay_type: int
+    ) -> None:
+        super().__init__(hass, entry_id, coordinator)
+        self._overlay_type = overlay_type
+        self._attr_name = f"Trimlight {name.title()} Overlay"
+        self._attr_unique_id = f"{entry_id}_overlay_{name}"
+
+    def _target_effect(self) -> int | None:
+        effect_id = (self.coordinator.data or {}).get("current_effect_id")
+        try:
+            effect_id = int(effect_id)
+        except (TypeError, ValueError):
+            return None
+        # Previews report -1 and cannot carry an overlay.
+        return effect_id if effect_id >= 0 else None
+
+    def _overlay(self) -> dict[str, int] | None:
+        target = self._target_effect()
+        if target is None:
+            return None
+        return {"overlayType": self._overlay_type, "targetEffect": target}
+
+    @property
+    def is_on(self) -> bool | None:
+        overlay = self._overlay()
+        if overlay is None:
+            return False
+        overlays = (self.coordinator.data or {}).get("overlay_effects") or []
+        return any(
+            o.get("overlayType") == overlay["overlayType"] and o.get("targetEffect") == overlay["targetEffect"]
+            for o in overlays
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        overlays = (self.coordinator.data or {}).get("overlay_effects") or []
+        return {
+            "target_effect_id": self._target_effect(),
+            "target_effect_ids": sorted(
+                o.get("targetEffect") for o in overlays if o.get("overlayType") == self._overlay_type
+            ),
+        }
+
+    async def _async_update(self, *, enable: bool) -> None:
+        overlay = self._overlay()
+        if overlay is None:
+            raise HomeAssistantError("Overlays apply to saved presets; run a saved preset first")
+        action = "add" if enable else "remove"
+        response = await apply_overlay_update(
+            self._data, **{action: [overlay]}, source=f"switch:{self.unique_id}"
+        )
+        if response is not None and response.get("code") != 0:
+            raise HomeAssistantError(
+                f"Trimlight overlay update failed: code={response.get('code')} desc={response.get('desc')}"
+            )
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        await self._async_update(enable=True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        await self._async_update(enable=False)
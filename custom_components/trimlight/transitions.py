@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from .data import TrimlightData
+
+# Command pipeline intent of a running fade; any new command must supersede it.
+TRANSITION_INTENT = "brightness_transition"
+# Never send brightness previews faster than this, whatever the API latency.
+TRANSITION_MIN_STEP_SECONDS = 0.5
+TRANSITION_MAX_STEPS = 30
+_DEFAULT_PREVIEW_LATENCY_SECONDS = 0.4
+_LATENCY_SMOOTHING = 0.3
+# Leave headroom over the measured latency so requests do not queue up.
+_LATENCY_HEADROOM = 1.5
+
+
+def transition_step_interval(data: TrimlightData, duration_s: float, delta: int) -> float:
+    """Seconds between preview steps for a fade of ``delta`` brightness levels."""
+    latency = data.preview_latency_s or _DEFAULT_PREVIEW_LATENCY_SECONDS
+    interval = max(TRANSITION_MIN_STEP_SECONDS, latency * _LATENCY_HEADROOM)
+    steps = max(1, min(TRANSITION_MAX_STEPS, abs(delta), int(duration_s / interval)))
+    return max(interval, duration_s / steps)
+
+
+def brightness_at(start: int, target: int, fraction: float) -> int:
+    fraction = min(1.0, max(0.0, fraction))
+    return max(1, min(255, round(start + (target - start) * fraction)))
+
+
+def _record_latency(data: TrimlightData, elapsed_s: float) -> None:
+    previous = data.preview_latency_s
+    if previous is None:
+        data.preview_latency_s = elapsed_s
+    else:
+        data.preview_latency_s = previous + _LATENCY_SMOOTHING * (elapsed_s - previous)
+
+
+async def async_run_brightness_transition(
+    data: TrimlightData,
+    *,
+    start: int,
+    target: int,
+    duration_s: float,
+    preview: Callable[[int], Awaitable[None]],
+) -> list[int]:
+    """Fade from ``start`` towards ``target`` with preview-only steps.
+
+    Each step is picked from the elapsed time rather than a fixed schedule, so
+    a slow API call shortens the fade to fewer, larger steps instead of
+    running late. The final ``target`` value is not sent; the caller commits it
+    once. Cancelling the task stops the fade at its next step.
+    """
+    sent: list[int] = []
+    interval = transition_step_interval(data, duration_s, target - start)
+    began = time.monotonic()
+    next_step = began
+    while True:
+        now = time.monotonic()
+        # Aim each step at the time its request is expected to land.
+        landing = now - began + (data.preview_latency_s or _DEFAULT_PREVIEW_LATENCY_SECONDS)
+        if landing >= duration_s:
+            break
+        value = brightness_at(start, target, landing / duration_s)
+        if not sent or value != sent[-1]:
+            await preview(value)
+            _record_latency(data, time.monotonic() - now)
+            sent.append(value)
+            interval = max(interval, data.preview_latency_s * _LATENCY_HEADROOM)
+        next_step += interval
+        delay = next_step - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        else:
+            # The call overran its slot; reschedule from now instead of bursting.
+            next_step = time.monotonic()
+    return sent
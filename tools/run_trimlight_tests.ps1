@@ -1,6 +1,10 @@
 param(
     [string]$Config = ".\\tools\\trimlight_test_runner.local.json",
-    [string[]]$Scenario
+    [string[]]$Scenario,
+    [switch]$AsyncClient,
+    [switch]$WebSocket,
+    [int]$Repeat = 0,
+    [string]$Compare
 )
 
 $scriptRoot = Split-Path -Parent $MyInvocation.MyCommand.Path
@@ -11,6 +15,18 @@ $argsList = @(".\\tools\\trimlight_test_runner.py", "--config", $Config)
 foreach ($item in $Scenario) {
     $argsList += @("--scenario", $item)
 }
+if ($AsyncClient) {
+    $argsList += "--async-client"
+}
+if ($WebSocket) {
+    $argsList += "--websocket"
+}
+if ($Repeat -gt 0) {
+    $argsList += @("--repeat", $Repeat)
+}
+if ($Compare) {
+    $argsList += @("--compare", $Compare)
+}
 
 & python @argsList
 exit $LASTEXITCODE
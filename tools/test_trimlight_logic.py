@@ -0,0 +1,581 @@
+"""Checks for the integration's pure-logic modules.
+
+Run from the repository root with ``python -m unittest discover -s tools``.
+The package is registered without running its __init__, the same way
+tools/trimlight_benchmarks.py loads it, so most checks run without Home
+Assistant; the ones that import it are skipped when it is missing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+INTEGRATION_DIR = REPO_ROOT / "custom_components" / "trimlight"
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+HAS_HOMEASSISTANT = importlib.util.find_spec("homeassistant") is not None
+
+
+def load(module: str) -> types.ModuleType:
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    for name, path in (
+        ("custom_components", INTEGRATION_DIR.parent),
+        ("custom_components.trimlight", INTEGRATION_DIR),
+    ):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = [str(path)]
+            sys.modules[name] = package
+    return importlib.import_module(f"custom_components.trimlight.{module}")
+
+
+@unittest.skipUnless(HAS_AIOHTTP, "aiohttp is not installed")
+class CassetteTests(unittest.TestCase):
+    def test_schedule_save_replays_on_a_later_day(self) -> None:
+        api_module = load("api")
+        cassette = load("cassette")
+        schedule = {"id": 1, "enable": True, "effectId": 3, "repetition": 1}
+
+        class FakeDate:
+            def __init__(self, month: int, day: int) -> None:
+                self.month = month
+                self.day = day
+
+        class AcceptingApi(api_module.TrimlightApi):
+            async def _send(self, method, path, *, params=None, payload=None):
+                return {"code": 0, "desc": "ok"}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "cassette.jsonl")
+            recorder = cassette.CassetteRecorder(path)
+            recording = AcceptingApi(
+                None, api_module.TrimlightCredentials("id", "secret", "device-a"), recorder=recorder
+            )
+            with mock.patch.object(api_module, "datetime") as fake_datetime:
+                fake_datetime.now.return_value = FakeDate(12, 1)
+                asyncio.run(recording.save_daily_schedule(schedule))
+            recorder.flush()
+
+            player = cassette.CassettePlayer.from_file(path, strict=True)
+            replay = cassette.ReplayTrimlightApi(
+                player, api_module.TrimlightCredentials("id", "secret", "device-b")
+            )
+            with mock.patch.object(api_module, "datetime") as fake_datetime:
+                fake_datetime.now.return_value = FakeDate(12, 2)
+                response = asyncio.run(replay.save_daily_schedule(schedule))
+        self.assertEqual(response, {"code": 0, "desc": "ok"})
+        self.assertEqual(player.remaining, 0)
+
+
+def custom_effect(effect_id: int, name: str, **overrides) -> dict:
+    effect = {
+        "id": effect_id,
+        "name": name,
+        "category": 2,
+        "mode": 1,
+        "speed": 100,
+        "brightness": 255,
+        "pixels": [{"index": 0, "count": 5, "color": 0xFF0000, "disable": False}],
+    }
+    effect.update(overrides)
+    return effect
+
+
+class EffectCatalogTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.catalog_module = load("catalog")
+        self.effects = [
+            {"id": 0, "name": "Rainbow", "category": 0, "mode": 0},
+            custom_effect(7, "Seven"),
+            custom_effect(3, "Three"),
+        ]
+
+    def test_first_update_adds_every_effect(self) -> None:
+        catalog = self.catalog_module.EffectCatalog()
+        changes = catalog.update(self.effects)
+        self.assertEqual(changes.added, [0, 3, 7])
+        self.assertEqual([e["id"] for e in catalog.custom_effects], [3, 7])
+        self.assertEqual([p["name"] for p in catalog.builtin_presets], ["Rainbow"])
+
+    def test_unchanged_update_reports_nothing_and_keeps_rows(self) -> None:
+        catalog = self.catalog_module.EffectCatalog()
+        catalog.update(self.effects)
+        custom = catalog.custom_effects
+        changes = catalog.update([dict(effect) for effect in self.effects])
+        self.assertFalse(changes)
+        self.assertIs(catalog.custom_effects, custom)
+
+    def test_modified_effect_is_rebuilt_and_others_reused(self) -> None:
+        catalog = self.catalog_module.EffectCatalog()
+        catalog.update(self.effects)
+        three = catalog.custom_effects[0]
+        changes = catalog.update([self.effects[0], custom_effect(7, "Seven", speed=5), self.effects[2]])
+        self.assertEqual(changes.as_dict(), {"added": [], "removed": [], "modified": [7]})
+        self.assertIs(catalog.custom_effects[0], three)
+        self.assertEqual(catalog.custom_effects[1]["speed"], 5)
+
+    def test_added_and_removed_ids(self) -> None:
+        catalog = self.catalog_module.EffectCatalog()
+        catalog.update(self.effects)
+        changes = catalog.update([self.effects[0], self.effects[2], custom_effect(9, "Nine")])
+        self.assertEqual(changes.added, [9])
+        self.assertEqual(changes.removed, [7])
+
+    def test_content_hash_ignores_key_order(self) -> None:
+        effect_content_hash = self.catalog_module.effect_content_hash
+        self.assertEqual(effect_content_hash({"a": 1, "b": 2}), effect_content_hash({"b": 2, "a": 1}))
+        self.assertNotEqual(effect_content_hash({"a": 1}), effect_content_hash({"a": 2}))
+
+
+def calendar_row(slot: int, effect_id: int, month: int) -> dict:
+    return {
+        "id": slot,
+        "effectId": effect_id,
+        "startDate": {"month": month, "day": 1},
+        "endDate": {"month": month, "day": 28},
+        "startTime": {"hours": 17, "minutes": 0},
+        "endTime": {"hours": 23, "minutes": 0},
+    }
+
+
+class SchedulePlanTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.schedules = load("schedules")
+        self.daily = {
+            "enable": True,
+            "effectId": 3,
+            "repetition": 1,
+            "startTime": {"hours": 18, "minutes": 0},
+            "endTime": {"hours": 23, "minutes": 30},
+        }
+
+    def test_daily_slot_with_same_content_is_not_written(self) -> None:
+        current = [{"id": 0, **self.daily}]
+        plan = self.schedules.plan_daily({0: self.daily}, current, self.schedules.SchedulePlan())
+        self.assertFalse(plan)
+        self.assertEqual(plan.unchanged, 1)
+
+    def test_daily_slot_change_is_saved(self) -> None:
+        current = [{"id": 1, **self.daily, "effectId": 4}]
+        plan = self.schedules.plan_daily({1: self.daily}, current, self.schedules.SchedulePlan())
+        self.assertEqual(plan.daily_saves, [{"id": 1, **self.daily}])
+
+    def test_daily_slot_out_of_range(self) -> None:
+        with self.assertRaises(ValueError):
+            self.schedules.plan_daily({2: self.daily}, [], self.schedules.SchedulePlan())
+
+    def test_calendar_keeps_stored_rows_and_reuses_unwanted_slots(self) -> None:
+        current = [calendar_row(0, 1, 2), calendar_row(4, 2, 10), calendar_row(5, 3, 12)]
+        desired = [calendar_row(99, 3, 12), calendar_row(99, 5, 7)]
+        plan = self.schedules.plan_calendar(desired, current, self.schedules.SchedulePlan())
+        self.assertEqual(plan.unchanged, 1)
+        # The new row overwrites the lowest unwanted slot; the other unwanted slot is deleted.
+        self.assertEqual([row["id"] for row in plan.calendar_saves], [0])
+        self.assertEqual(plan.calendar_saves[0]["effectId"], 5)
+        self.assertEqual(plan.calendar_deletes, [4])
+
+    def test_calendar_takes_free_slots_when_nothing_is_reusable(self) -> None:
+        current = [calendar_row(0, 1, 2)]
+        desired = [calendar_row(99, 1, 2), calendar_row(99, 2, 3), calendar_row(99, 3, 4)]
+        plan = self.schedules.plan_calendar(desired, current, self.schedules.SchedulePlan())
+        self.assertEqual([row["id"] for row in plan.calendar_saves], [1, 2])
+        self.assertEqual(plan.calendar_deletes, [])
+
+    def test_calendar_limit(self) -> None:
+        desired = [calendar_row(0, 1, 1)] * (self.schedules.CALENDAR_SCHEDULE_SLOTS + 1)
+        with self.assertRaises(ValueError):
+            self.schedules.plan_calendar(desired, [], self.schedules.SchedulePlan())
+
+
+class OverlayPlanTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.overlays = load("overlays")
+        self.current = [{"overlayType": 1, "targetEffect": 4}, {"overlayType": 0, "targetEffect": 2}]
+
+    def test_normalize_sorts_and_drops_duplicates(self) -> None:
+        normalized = self.overlays.normalize_overlays(
+            self.current + [{"overlayType": "1", "targetEffect": 4}]
+        )
+        self.assertEqual(
+            normalized, [{"overlayType": 0, "targetEffect": 2}, {"overlayType": 1, "targetEffect": 4}]
+        )
+
+    def test_replace_with_same_list_in_other_order_is_a_no_op(self) -> None:
+        self.assertIsNone(self.overlays.plan_overlays(self.current, replace=list(reversed(self.current))))
+
+    def test_replace_with_empty_list_clears(self) -> None:
+        self.assertEqual(self.overlays.plan_overlays(self.current, replace=[]), [])
+
+    def test_add_and_remove_keep_the_rest(self) -> None:
+        planned = self.overlays.plan_overlays(
+            self.current,
+            add=[{"overlayType": 1, "targetEffect": 9}],
+            remove=[{"overlayType": 0, "targetEffect": 2}],
+        )
+        self.assertEqual(
+            planned, [{"overlayType": 1, "targetEffect": 4}, {"overlayType": 1, "targetEffect": 9}]
+        )
+
+    def test_adding_an_existing_overlay_is_a_no_op(self) -> None:
+        self.assertIsNone(self.overlays.plan_overlays(self.current, add=[self.current[0]]))
+
+
+class RestorePlanTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backups = load("backups")
+        self.snapshot = {
+            "custom_effects": [custom_effect(3, "A"), custom_effect(4, "B"), custom_effect(5, "C", mode=3)],
+            "daily": [
+                {
+                    "id": 0,
+                    "enable": True,
+                    "effectId": 5,
+                    "repetition": 1,
+                    "startTime": {"hours": 18, "minutes": 0},
+                    "endTime": {"hours": 23, "minutes": 0},
+                }
+            ],
+            "calendar": [calendar_row(0, 4, 12)],
+            "combined_effect": {"effectIds": [3, 4, 5], "interval": 5},
+            "overlay_effects": [{"overlayType": 1, "targetEffect": 4}],
+        }
+
+    def _current(self, effects: list[dict]) -> dict:
+        return {
+            "custom_effects": effects,
+            "daily": [],
+            "calendar": [],
+            "combined_effect": None,
+            "overlay_effects": [],
+        }
+
+    def test_same_controller_unchanged_plans_nothing(self) -> None:
+        plan = self.backups.plan_effect_restore(self.snapshot, self.snapshot, same_device=True)
+        self.backups.plan_link_restore(self.snapshot, self.snapshot, plan)
+        self.assertFalse(plan)
+        self.assertEqual(plan.unchanged_effects, 3)
+        self.assertEqual(plan.id_map, {3: 3, 4: 4, 5: 5})
+
+    def test_same_controller_matches_by_id(self) -> None:
+        current = self._current(
+            [custom_effect(3, "Renamed"), custom_effect(4, "B"), custom_effect(5, "C", mode=3)]
+        )
+        plan = self.backups.plan_effect_restore(self.snapshot, current, same_device=True)
+        self.assertEqual([(e["id"], e["name"]) for e in plan.effect_saves], [(3, "A")])
+        self.assertEqual(plan.new_effects, {})
+
+    def test_other_controller_matches_by_content_then_name(self) -> None:
+        current = self._current(
+            [custom_effect(0, "A"), custom_effect(1, "B", speed=5), custom_effect(3, "Unrelated", mode=9)]
+        )
+        plan = self.backups.plan_effect_restore(self.snapshot, current, same_device=False, prune_effects=True)
+        self.assertEqual(plan.unchanged_effects, 1)
+        self.assertEqual(plan.id_map, {3: 0, 4: 1})
+        self.assertEqual([(e["id"], e["name"]) for e in plan.effect_saves], [(1, "B"), (-1, "C")])
+        self.assertEqual(list(plan.new_effects), [5])
+        # Id 3 on this controller is another preset; it is pruned, not overwritten.
+        self.assertEqual(plan.effect_deletes, [3])
+
+    def test_links_are_remapped_to_new_ids(self) -> None:
+        current = self._current([custom_effect(0, "A"), custom_effect(1, "B")])
+        plan = self.backups.plan_effect_restore(self.snapshot, current, same_device=False)
+        stored = current["custom_effects"] + [custom_effect(7, "C", mode=3, category=1)]
+        self.assertEqual(self.backups.resolve_new_effect_ids(plan, stored), [])
+        self.backups.plan_link_restore(self.snapshot, self._current(stored), plan)
+        self.assertEqual(plan.id_map, {3: 0, 4: 1, 5: 7})
+        self.assertEqual(plan.schedules.daily_saves[0]["effectId"], 7)
+        self.assertEqual(plan.schedules.calendar_saves[0]["effectId"], 1)
+        self.assertEqual(plan.combined_effect, {"effectIds": [0, 1, 7], "interval": 5})
+        self.assertEqual(plan.overlay_effects, [{"overlayType": 1, "targetEffect": 1}])
+
+    def test_missing_new_effect_is_reported(self) -> None:
+        plan = self.backups.plan_effect_restore(self.snapshot, self._current([]), same_device=False)
+        self.assertEqual(self.backups.resolve_new_effect_ids(plan, [custom_effect(0, "A")]), ["B", "C"])
+
+
+class PixelEncodingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.pixels = load("pixels")
+
+    def test_runs_merge_same_color_neighbours(self) -> None:
+        encoded = self.pixels.encode_pixel_runs([1, 1, 2, None, None])
+        self.assertEqual(
+            encoded,
+            [
+                {"index": 0, "count": 2, "color": 1, "disable": False},
+                {"index": 1, "count": 1, "color": 2, "disable": False},
+                {"index": 2, "count": 2, "color": 0, "disable": True},
+            ],
+        )
+
+    def test_long_run_is_split_at_60(self) -> None:
+        encoded = self.pixels.encode_pixel_runs([5] * 150)
+        self.assertEqual([p["count"] for p in encoded], [60, 60, 30])
+        self.assertEqual([p["index"] for p in encoded], [0, 1, 2])
+
+    def test_thirty_segments_fit_and_thirty_one_do_not(self) -> None:
+        self.assertEqual(len(self.pixels.encode_pixel_runs([i % 2 for i in range(30)])), 30)
+        with self.assertRaises(ValueError):
+            self.pixels.encode_pixel_runs([i % 2 for i in range(31)])
+        with self.assertRaises(ValueError):
+            self.pixels.encode_pixel_runs([7] * (60 * 30 + 1))
+
+    def test_gradient_defaults_to_thirty_even_bands(self) -> None:
+        leds = self.pixels.gradient_colors([0x000000, 0xFFFFFF], 95)
+        self.assertEqual(len(leds), 95)
+        self.assertEqual(leds[0], 0x000000)
+        self.assertEqual(leds[-1], 0xFFFFFF)
+        self.assertEqual(len(self.pixels.encode_pixel_runs(leds)), 30)
+
+    def test_repeat_colors(self) -> None:
+        self.assertEqual(self.pixels.repeat_colors([1, None], 2), [1, 1, None, None])
+
+
+class PresetFileTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.preset_files = load("preset_files")
+        self.builtins = [{"id": 0, "mode": 0, "name": "Rainbow"}]
+        self.custom = [custom_effect(i, f"Preset {i}") for i in range(45)]
+
+    def _round_trip(self, filename: str) -> tuple[dict, list[list[dict]]]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / filename)
+            written = self.preset_files.write_preset_file(
+                path, {"device_id": "a"}, self.builtins, self.custom
+            )
+            self.assertEqual(written, 45)
+            handle, header = self.preset_files.open_preset_file(path)
+            batches = []
+            with handle:
+                while batch := self.preset_files.read_custom_presets(handle, 20):
+                    batches.append(batch)
+        return header, batches
+
+    def test_plain_round_trip_in_batches(self) -> None:
+        header, batches = self._round_trip("presets.jsonl")
+        self.assertEqual(header["device_id"], "a")
+        self.assertEqual([len(batch) for batch in batches], [20, 20, 5])
+        self.assertEqual([effect for batch in batches for effect in batch], self.custom)
+
+    def test_gzip_round_trip(self) -> None:
+        _, batches = self._round_trip("presets.jsonl.gz")
+        self.assertEqual(sum(len(batch) for batch in batches), 45)
+
+    def test_rejects_other_files_and_newer_versions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            other = Path(tmp) / "other.jsonl"
+            other.write_text('{"format": "something-else"}\n', encoding="utf-8")
+            newer = Path(tmp) / "newer.jsonl"
+            newer.write_text('{"format": "trimlight-presets", "version": 99}\n', encoding="utf-8")
+            for path in (other, newer):
+                with self.assertRaises(ValueError):
+                    self.preset_files.open_preset_file(str(path))
+
+    def test_content_hash_ignores_id_and_category(self) -> None:
+        preset_content_hash = self.preset_files.preset_content_hash
+        self.assertEqual(
+            preset_content_hash(custom_effect(1, "A")), preset_content_hash(custom_effect(9, "A", category=1))
+        )
+        self.assertNotEqual(
+            preset_content_hash(custom_effect(1, "A")), preset_content_hash(custom_effect(1, "A", speed=1))
+        )
+
+
+@unittest.skipUnless(HAS_HOMEASSISTANT, "Home Assistant is not installed")
+class SolidColorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.controller = load("controller")
+        self.sent: list[str] = []
+        patcher = mock.patch.object(self.controller, "_SOLID_COLOR_BATCH_SECONDS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _data(self) -> types.SimpleNamespace:
+        sent = self.sent
+
+        class Api:
+            async def preview_solid(self, color, brightness, *, pixel_count):
+                sent.append(color)
+                await asyncio.sleep(0)
+                return {"code": 0}
+
+        coordinator = types.SimpleNamespace(data={}, hass=None)
+        coordinator.async_set_updated_data = lambda value: setattr(coordinator, "data", value)
+        return types.SimpleNamespace(
+            api=Api(),
+            coordinator=coordinator,
+            pending_solid_color=None,
+            solid_color_requests=0,
+            solid_color_queued=0,
+            solid_color_lock=asyncio.Lock(),
+            debug_logging=False,
+        )
+
+    def test_older_request_never_follows_a_newer_one(self) -> None:
+        async def scenario() -> None:
+            data = self._data()
+            older = self.controller.next_solid_color_request(data)
+            newer = self.controller.next_solid_color_request(data)
+            await self.controller.apply_solid_color(data, 0x0000FF, 255, request=newer)
+            self.assertIsNone(await self.controller.apply_solid_color(data, 0xFF0000, 255, request=older))
+
+        asyncio.run(scenario())
+        self.assertEqual(self.sent, ["0000ff"])
+
+    def test_color_set_while_switching_on_replaces_the_holder_color(self) -> None:
+        async def scenario() -> None:
+            data = self._data()
+            switched = asyncio.Event()
+            release = asyncio.Event()
+
+            async def switch_on() -> None:
+                switched.set()
+                await release.wait()
+
+            holder = asyncio.create_task(
+                self.controller.apply_solid_color(data, 0xFF0000, 255, before_send=switch_on)
+            )
+            await switched.wait()
+            self.assertIsNone(await self.controller.apply_solid_color(data, 0x0000FF, 255))
+            release.set()
+            await holder
+
+        asyncio.run(scenario())
+        self.assertEqual(self.sent, ["0000ff"])
+
+    def test_color_set_while_the_holder_logs_is_sent(self) -> None:
+        logging = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_log(*args, **kwargs) -> None:
+            if not logging.is_set():
+                logging.set()
+                await release.wait()
+
+        async def scenario() -> None:
+            data = self._data()
+            holder = asyncio.create_task(self.controller.apply_solid_color(data, 0xFF0000, 255))
+            await logging.wait()
+            response = await self.controller.apply_solid_color(data, 0x0000FF, 255)
+            release.set()
+            await holder
+            self.assertEqual(response, {"code": 0})
+
+        with mock.patch.object(self.controller, "async_log_event", slow_log):
+            asyncio.run(scenario())
+        self.assertEqual(self.sent, ["ff0000", "0000ff"])
+
+
+@unittest.skipUnless(HAS_HOMEASSISTANT, "Home Assistant is not installed")
+class GroupCommandTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.groups = load("groups")
+        self.synced: list[str] = []
+        self.group = self.groups.TrimlightGroup("g1", "Roof", "master", ["master", "member", "missing"])
+
+    def _device(self, device_id: str, *, sync_code: int = 0) -> types.SimpleNamespace:
+        synced = self.synced
+
+        class Api:
+            _creds = types.SimpleNamespace(device_id=device_id)
+
+            async def sync_group(self, group_id):
+                synced.append(group_id)
+                return {"code": sync_code, "desc": "ok" if sync_code == 0 else "failed"}
+
+        async def refresh() -> None:
+            return None
+
+        coordinator = types.SimpleNamespace(async_request_refresh=refresh)
+        return types.SimpleNamespace(api=Api(), coordinator=coordinator)
+
+    def _run(self, master, members, command) -> dict:
+        hass = types.SimpleNamespace(data={"trimlight": members}, async_create_task=lambda coro: coro.close())
+        return asyncio.run(self.groups.async_group_command(hass, master, self.group, command))
+
+    def test_master_failure_skips_the_sync(self) -> None:
+        async def command(device):
+            return {"code": 1, "desc": "offline"}
+
+        result = self._run(self._device("master"), {}, command)
+        self.assertEqual(self.synced, [])
+        self.assertIn("master master failed", result["error"])
+
+    def test_fanout_reports_failed_and_unloaded_members(self) -> None:
+        master = self._device("master", sync_code=1)
+        member = self._device("member")
+
+        async def command(device):
+            return {"code": 0} if device is master else None
+
+        result = self._run(master, {"a": master, "b": member}, command)
+        self.assertEqual(result["mode"], "fanout")
+        self.assertEqual(result["failed_members"], ["member"])
+        self.assertEqual(result["skipped_members"], ["missing"])
+        self.assertIn("failed on member", result["error"])
+        self.assertIn("not loaded for missing", result["error"])
+
+    def test_successful_sync_has_no_error(self) -> None:
+        async def command(device):
+            return {"code": 0}
+
+        result = self._run(self._device("master"), {}, command)
+        self.assertEqual(self.synced, ["g1"])
+        self.assertNotIn("error", result)
+
+
+@unittest.skipUnless(HAS_HOMEASSISTANT, "Home Assistant is not installed")
+class CustomPresetSaveTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.controller = load("controller")
+        patcher = mock.patch.object(self.controller, "_CUSTOM_EFFECT_SAVE_BATCH_SECONDS", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _save_with_edit_queued_during(self, first_result) -> tuple[list[int], dict | None, dict | None]:
+        data = types.SimpleNamespace(
+            pending_custom_saves={3: custom_effect(3, "A", brightness=10)},
+            custom_save_in_flight_id=None,
+            custom_save_lock=asyncio.Lock(),
+        )
+        saved: list[int] = []
+
+        class Api:
+            async def save_effect(self, effect, brightness, *, speed):
+                saved.append(brightness)
+                if len(saved) == 1:
+                    # A second caller queues a newer edit while this save is in flight.
+                    data.pending_custom_saves[3] = custom_effect(3, "A", brightness=20)
+                    if isinstance(first_result, Exception):
+                        raise first_result
+                    return first_result
+                return {"code": 0}
+
+        response, effect = asyncio.run(self.controller._save_custom_preset_batched(Api(), data, 3))
+        self.assertEqual(data.pending_custom_saves, {})
+        self.assertIsNone(data.custom_save_in_flight_id)
+        return saved, response, effect
+
+    def test_queued_edit_is_saved_after_a_failed_save(self) -> None:
+        saved, response, effect = self._save_with_edit_queued_during({"code": 1, "desc": "busy"})
+        self.assertEqual(saved, [10, 20])
+        self.assertEqual(response, {"code": 0})
+        self.assertEqual(effect["brightness"], 20)
+
+    def test_queued_edit_is_saved_after_a_save_error(self) -> None:
+        saved, response, _ = self._save_with_edit_queued_during(RuntimeError("timeout"))
+        self.assertEqual(saved, [10, 20])
+        self.assertEqual(response, {"code": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.util
+import json
+import platform
+import random
+import sys
+import timeit
+import types
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+INTEGRATION_DIR = REPO_ROOT / "custom_components" / "trimlight"
+DEFAULT_BASELINE_PATH = REPO_ROOT / "tools" / "benchmarks" / "baseline.json"
+
+BUILTIN_COUNT = 180
+CUSTOM_COUNTS = (10, 100, 1000)
+PIXEL_SEGMENT_COUNTS = (1, 20, 200)
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 5
+BENCH_ENTRY_ID = "bench"
+
+
+def now_iso() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def load_json(path: Path) -> dict[str, Any]:
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def dump_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+
+
+def load_integration() -> tuple[types.ModuleType, bool]:
+    """Import the integration package, returning (effects module, entities available).
+
+    Without Home Assistant installed only the pure helper modules can be
+    imported, so the package is registered without running its __init__ and
+    the entity benchmarks are skipped.
+    """
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    if importlib.util.find_spec("homeassistant") is None:
+        for name, path in (
+            ("custom_components", INTEGRATION_DIR.parent),
+            ("custom_components.trimlight", INTEGRATION_DIR),
+        ):
+            if name not in sys.modules:
+                package = types.ModuleType(name)
+                package.__path__ = [str(path)]
+                sys.modules[name] = package
+        return importlib.import_module("custom_components.trimlight.effects"), False
+    return importlib.import_module("custom_components.trimlight.effects"), True
+
+
+@dataclass(slots=True)
+class Catalog:
+    builtins: list[dict[str, Any]]
+    builtin_effects: list[dict[str, Any]]
+    custom_effects: list[dict[str, Any]]
+
+
+def build_catalog(custom_count: int, pixel_segments: int, *, seed: int = 1234) -> Catalog:
+    rng = random.Random(seed + custom_count * 1000 + pixel_segments)
+    builtins = [{"id": mode, "mode": mode, "name": f"Builtin {mode:03d}"} for mode in range(BUILTIN_COUNT)]
+    builtin_effects = [
+        {
+            "id": mode,
+            "name": f"Builtin {mode:03d}",
+            "category": 0,
+            "mode": mode,
+            "speed": 100,
+            "brightness": 200,
+            "pixelLen": 30,
+            "reverse": False,
+        }
+        for mode in range(BUILTIN_COUNT)
+    ]
+    custom_effects = []
+    for index in range(custom_count):
+        custom_effects.append(
+            {
+                "id": BUILTIN_COUNT + index,
+                "name": f"Custom {index:04d}",
+                "category": 2,
+                "mode": rng.randrange(17),
+                "speed": rng.randrange(256),
+                "brightness": rng.randrange(256),
+                "pixels": [
+                    {
+                        "index": segment % 30,
+                        "count": rng.randrange(1, 61),
+                        "color": rng.randrange(0x1000000),
+                        "disable": False,
+                    }
+                    for segment in range(pixel_segments)
+                ],
+            }
+        )
+    return Catalog(builtins=builtins, builtin_effects=builtin_effects, custom_effects=custom_effects)
+
+
+def custom_preview_state(catalog: Catalog) -> dict[str, Any]:
+    # A preview (id -1) of the last custom preset forces the full pixel scan.
+    target = catalog.custom_effects[-1]
+    return {key: value for key, value in target.items() if key not in ("id", "name")}
+
+
+def builtin_state(catalog: Catalog) -> dict[str, Any]:
+    target = catalog.builtin_effects[-1]
+    return {key: value for key, value in target.items() if key != "name"}
+
+
+def effect_scenarios(effects: types.ModuleType) -> dict[str, Callable[[], Any]]:
+    scenarios: dict[str, Callable[[], Any]] = {}
+    for custom_count in CUSTOM_COUNTS:
+        for pixel_segments in PIXEL_SEGMENT_COUNTS:
+            catalog = build_catalog(custom_count, pixel_segments)
+            suffix = f"custom={custom_count},pixels={pixel_segments}"
+            custom_state = custom_preview_state(catalog)
+            target = catalog.custom_effects[-1]
+            all_effects = catalog.builtin_effects + catalog.custom_effects
+            scenarios[f"find_custom_preset_by_state[{suffix}]"] = (
+                lambda c=catalog, s=custom_state: effects.find_custom_preset_by_state(c.custom_effects, s, -1)
+            )
+            scenarios[f"matches_custom_target[{suffix}]"] = (
+                lambda c=catalog, s=custom_state, t=target: effects.matches_custom_target(
+                    c.custom_effects,
+                    s,
+                    2,
+                    -1,
+                    target_name=t["name"],
+                    target_id=t["id"],
+                    builtins=c.builtins,
+                )
+            )
+            scenarios[f"is_builtin_like_state[custom,{suffix}]"] = (
+                lambda c=catalog, s=custom_state: effects.is_builtin_like_state(c.builtins, s, 2, -1)
+            )
+            scenarios[f"infer_builtin_preview_params[{suffix}]"] = (
+                lambda s=custom_state, e=all_effects: effects.infer_builtin_preview_params(
+                    BUILTIN_COUNT - 1, s, e
+                )
+            )
+    catalog = build_catalog(CUSTOM_COUNTS[0], PIXEL_SEGMENT_COUNTS[0])
+    scenarios["is_builtin_like_state[builtin]"] = (
+        lambda c=catalog, s=builtin_state(catalog): effects.is_builtin_like_state(
+            c.builtins, s, 1, BUILTIN_COUNT - 1
+        )
+    )
+    return scenarios
+
+
+def entity_scenarios() -> dict[str, Callable[[], Any]]:
+    """Property benchmarks for entities, run against in-memory runtime data."""
+    const = importlib.import_module("custom_components.trimlight.const")
+    coordinator_module = importlib.import_module("custom_components.trimlight.coordinator")
+    data_module = importlib.import_module("custom_components.trimlight.data")
+    select = importlib.import_module("custom_components.trimlight.select")
+    number = importlib.import_module("custom_components.trimlight.number")
+    sensor = importlib.import_module("custom_components.trimlight.sensor")
+
+    scenarios: dict[str, Callable[[], Any]] = {}
+    for custom_count in CUSTOM_COUNTS:
+        for pixel_segments in PIXEL_SEGMENT_COUNTS:
+            catalog = build_catalog(custom_count, pixel_segments)
+            suffix = f"custom={custom_count},pixels={pixel_segments}"
+            coordinator_data = {
+                "builtin_effects": catalog.builtin_effects,
+                "custom_effects": catalog.custom_effects,
+                "switch_state": 1,
+                "current_effect": custom_preview_state(catalog),
+                "current_effect_id": -1,
+                "current_effect_category": 2,
+                "brightness": 200,
+            }
+            coordinator = SimpleNamespace(
+                data=coordinator_data,
+                power_state=coordinator_module.ConfirmedPowerState(),
+            )
+            runtime = data_module.TrimlightData(
+                api=None,
+                coordinator=coordinator,
+                store=None,
+                debug_path="",
+                debug_log_path="",
+                builtins=catalog.builtins,
+                custom_cache=catalog.custom_effects,
+                builtins_refreshed=True,
+                commit_custom_preset=True,
+                debug_logging=False,
+            )
+            hass = SimpleNamespace(
+                data={const.DOMAIN: {BENCH_ENTRY_ID: runtime}},
+                states=SimpleNamespace(get=lambda entity_id: None),
+            )
+
+            def make(cls: type) -> Any:
+                return cls(hass, BENCH_ENTRY_ID, coordinator)
+
+            custom_select = make(select.TrimlightCustomSelect)
+            builtin_select = make(select.TrimlightBuiltInSelect)
+            speed_number = make(number.TrimlightSpeedNumber)
+            preset_sensor = make(sensor.TrimlightCurrentPresetSensor)
+            scenarios[f"custom_select.current_option[{suffix}]"] = lambda e=custom_select: e.current_option
+            scenarios[f"builtin_select.current_option[{suffix}]"] = lambda e=builtin_select: e.current_option
+            scenarios[f"speed_number.native_value[{suffix}]"] = lambda e=speed_number: e.native_value
+            scenarios[f"preset_sensor.native_value[{suffix}]"] = lambda e=preset_sensor: e.native_value
+    return scenarios
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """Return the best per-call time in nanoseconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return best / number * 1e9
+
+
+def run_benchmarks(name_filter: str | None, repeat: int) -> dict[str, Any]:
+    effects, entities_available = load_integration()
+    scenarios = effect_scenarios(effects)
+    skipped: list[str] = []
+    if entities_available:
+        scenarios.update(entity_scenarios())
+    else:
+        skipped.append("entity properties (Home Assistant is not installed)")
+
+    results: dict[str, float] = {}
+    for name, func in scenarios.items():
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = round(measure(func, repeat), 1)
+        print(f"{results[name]:>14,.1f} ns  {name}")
+    return {
+        "meta": {
+            "created_at": now_iso(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "skipped": skipped,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    regressions: list[str] = []
+    baseline_results = baseline.get("results") or {}
+    print()
+    print(f"{'change':>8}  {'baseline ns':>14}  {'current ns':>14}  scenario")
+    for name, value in current["results"].items():
+        reference = baseline_results.get(name)
+        if not reference:
+            print(f"{'new':>8}  {'-':>14}  {value:>14,.1f}  {name}")
+            continue
+        change = value / reference - 1.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{change:>+8.1%}  {reference:>14,.1f}  {value:>14,.1f}  {name}{flag}")
+    return regressions
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Trimlight effect matching and entity state-resolution hot paths."
+    )
+    parser.add_argument("--filter", help="Only run scenarios whose name contains this text.")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Timing repeats per scenario; the best is kept. Defaults to {DEFAULT_REPEAT}.",
+    )
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help=f"Overwrite the stored baseline at {DEFAULT_BASELINE_PATH.relative_to(REPO_ROOT)}.",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const=str(DEFAULT_BASELINE_PATH),
+        help="Compare against a baseline file (defaults to the stored baseline) and exit 1 on regressions.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Slowdown fraction reported as a regression. Defaults to {DEFAULT_THRESHOLD}.",
+    )
+    return parser
+
+
+def main() -> int:
+    args = build_arg_parser().parse_args()
+    report = run_benchmarks(args.filter, max(1, args.repeat))
+    for skipped in report["meta"]["skipped"]:
+        print(f"Skipped: {skipped}")
+
+    if args.save:
+        save_path = Path(args.save)
+        if not save_path.is_absolute():
+            save_path = REPO_ROOT / save_path
+        dump_json(save_path, report)
+        print(f"Results written to: {save_path}")
+    if args.update_baseline:
+        dump_json(DEFAULT_BASELINE_PATH, report)
+        print(f"Baseline updated: {DEFAULT_BASELINE_PATH}")
+
+    if args.compare:
+        baseline_path = Path(args.compare)
+        if not baseline_path.is_absolute():
+            baseline_path = REPO_ROOT / baseline_path
+        if not baseline_path.exists():
+            print(f"Baseline file not found: {baseline_path}", file=sys.stderr)
+            return 2
+        regressions = compare(report, load_json(baseline_path), args.threshold)
+        if regressions:
+            print()
+            print(f"{len(regressions)} scenario(s) regressed by more than {args.threshold:.0%}.")
+            return 1
+        print()
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,660 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import copy
+import hashlib
+import hmac
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from aiohttp import web
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+API_PREFIX = "/trimlight"
+RESOURCE_PREFIX = "/v1/oauth/resources"
+
+RESULT_SUCCESS = 0
+RESULT_ERROR = 10001
+RESULT_WRONG_PASSWORD = 10002
+
+MAX_SAVED_EFFECTS = 60
+MAX_CALENDAR_SCHEDULES = 60
+DAILY_SCHEDULE_COUNT = 2
+
+# Content of the off payload some controllers report right after a
+# power-on or custom apply: no effect data, but garbage category/mode values.
+PLACEHOLDER_CURRENT_EFFECT = {"category": 7, "mode": 243}
+
+
+def now_iso() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def access_token(client_id: str, client_secret: str, timestamp_ms: str | int) -> str:
+    msg = f"Trimlight|{client_id}|{timestamp_ms}".encode("utf-8")
+    digest = hmac.new(client_secret.encode("utf-8"), msg, hashlib.sha256).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def default_effects() -> list[dict[str, Any]]:
+    return [
+        {"id": 0, "name": "Rainbow Spin", "category": 0, "mode": 9, "speed": 100, "brightness": 200, "pixelLen": 30, "reverse": False},
+        {"id": 1, "name": "Rainbow Comet", "category": 0, "mode": 1, "speed": 100, "brightness": 200, "pixelLen": 30, "reverse": False},
+        {
+            "id": 2,
+            "name": "Easter",
+            "category": 2,
+            "mode": 0,
+            "speed": 100,
+            "brightness": 200,
+            "pixels": [
+                {"index": 0, "count": 3, "color": 16761035, "disable": False},
+                {"index": 1, "count": 3, "color": 11393254, "disable": False},
+                {"index": 2, "count": 3, "color": 16777088, "disable": False},
+            ],
+        },
+        {
+            "id": 3,
+            "name": "Seahawks",
+            "category": 2,
+            "mode": 2,
+            "speed": 120,
+            "brightness": 220,
+            "pixels": [
+                {"index": 0, "count": 4, "color": 2051, "disable": False},
+                {"index": 1, "count": 4, "color": 6931226, "disable": False},
+                {"index": 2, "count": 2, "color": 10921638, "disable": False},
+            ],
+        },
+        {
+            "id": 4,
+            "name": "Red White Green",
+            "category": 2,
+            "mode": 1,
+            "speed": 90,
+            "brightness": 255,
+            "pixels": [
+                {"index": 0, "count": 2, "color": 16711680, "disable": False},
+                {"index": 1, "count": 2, "color": 16777215, "disable": False},
+                {"index": 2, "count": 2, "color": 65280, "disable": False},
+            ],
+        },
+    ]
+
+
+@dataclass(slots=True)
+class EmulatorConfig:
+    client_id: str = "emulator"
+    client_secret: str = "emulator_secret"
+    device_ids: list[str] = field(default_factory=lambda: ["emulator-device-1"])
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_code: int = RESULT_ERROR
+    placeholder_off_polls: int = 0
+    reject_category_2: bool = False
+    reject_builtin_preview: bool = False
+    max_clock_skew_s: float | None = 300.0
+    seed: int | None = None
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> "EmulatorConfig":
+        known = {f.name for f in fields(cls)}
+        unknown = sorted(set(raw) - known)
+        if unknown:
+            raise ValueError(f"Unknown emulator config keys: {unknown}")
+        return cls(**raw)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "EmulatorConfig":
+        with path.open("r", encoding="utf-8") as handle:
+            return cls.from_dict(json.load(handle))
+
+
+@dataclass(slots=True)
+class EmulatedDevice:
+    device_id: str
+    name: str
+    switch_state: int = 0
+    effects: dict[int, dict[str, Any]] = field(default_factory=dict)
+    current_effect: dict[str, Any] = field(default_factory=dict)
+    combined_effect: dict[str, Any] = field(default_factory=lambda: {"effectIds": [], "interval": 5})
+    daily: list[dict[str, Any]] = field(default_factory=list)
+    calendar: dict[int, dict[str, Any]] = field(default_factory=dict)
+    overlay_effects: list[dict[str, Any]] = field(default_factory=list)
+    ports: list[dict[str, int]] = field(
+        default_factory=lambda: [{"id": port, "start": 1, "end": 1024 if port == 0 else 1} for port in range(4)]
+    )
+    placeholder_polls_remaining: int = 0
+    backup: dict[str, Any] | None = None
+
+    @classmethod
+    def create(cls, device_id: str, name: str) -> "EmulatedDevice":
+        device = cls(device_id=device_id, name=name)
+        for effect in default_effects():
+            device.effects[effect["id"]] = effect
+        device.daily = [
+            {
+                "id": schedule_id,
+                "enable": False,
+                "effectId": 0,
+                "repetition": 0,
+                "startTime": {"hours": 18, "minutes": 0},
+                "endTime": {"hours": 23, "minutes": 0},
+            }
+            for schedule_id in range(DAILY_SCHEDULE_COUNT)
+        ]
+        device.current_effect = dict(device.effects[2])
+        return device
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "deviceId": self.device_id,
+            "name": self.name,
+            "switchState": self.switch_state,
+            "connectivity": 1,
+            "state": 0,
+            "fwVersionName": "emulator",
+        }
+
+    def detail(self) -> dict[str, Any]:
+        if self.placeholder_polls_remaining > 0:
+            self.placeholder_polls_remaining -= 1
+            switch_state = 0
+            current_effect = dict(PLACEHOLDER_CURRENT_EFFECT)
+        else:
+            switch_state = self.switch_state
+            current_effect = copy.deepcopy(self.current_effect)
+        now = datetime.now()
+        return {
+            "deviceId": self.device_id,
+            "name": self.name,
+            "switchState": switch_state,
+            "connectivity": 1,
+            "state": 0,
+            "colorOrder": 0,
+            "ic": 0,
+            "ports": copy.deepcopy(self.ports),
+            "fwVersionName": "emulator",
+            "effects": [copy.deepcopy(self.effects[effect_id]) for effect_id in sorted(self.effects)],
+            "combinedEffect": copy.deepcopy(self.combined_effect),
+            "daily": copy.deepcopy(self.daily),
+            "calendar": [copy.deepcopy(self.calendar[slot]) for slot in sorted(self.calendar)],
+            "currentEffect": current_effect,
+            "overlayEffects": copy.deepcopy(self.overlay_effects),
+            "currentDatetime": {
+                "year": now.year - 2000,
+                "month": now.month,
+                "day": now.day,
+                "hours": now.hour,
+                "minutes": now.minute,
+                "seconds": now.second,
+            },
+        }
+
+
+@dataclass(slots=True)
+class InjectedFault:
+    path: str
+    code: int
+    remaining: int
+    desc: str = "injected error"
+    http_status: int | None = None
+
+
+Handler = Callable[[EmulatedDevice | None, dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+class TrimlightCloudEmulator:
+    """In-memory stand-in for the Trimlight Edge cloud API.
+
+    Point ``TrimlightApi(base_url=emulator.base_url)`` at a running instance.
+    Control endpoints under ``/_emulator`` inject faults, change the config,
+    reset state and expose call counts for load tests.
+    """
+
+    def __init__(self, config: EmulatorConfig | None = None) -> None:
+        self.config = config or EmulatorConfig()
+        self.random = random.Random(self.config.seed)
+        self.devices: dict[str, EmulatedDevice] = {}
+        self.faults: list[InjectedFault] = []
+        self.calls: list[dict[str, Any]] = []
+        self.base_url: str | None = None
+        self._runner: web.AppRunner | None = None
+        self._routes: dict[str, tuple[bool, Handler]] = {
+            "/device/get": (True, self._device_detail),
+            "/device/update": (True, self._device_update),
+            "/device/effect/preview": (True, self._effect_preview),
+            "/device/effect/save": (True, self._effect_save),
+            "/device/effect/view": (True, self._effect_view),
+            "/device/effect/delete": (True, self._effect_delete),
+            "/device/daily/save": (True, self._daily_save),
+            "/device/calendar/save": (True, self._calendar_save),
+            "/device/calendar/delete": (True, self._calendar_delete),
+            "/device/combined-effect/save": (True, self._combined_effect_save),
+            "/device/effect/overlay": (True, self._overlay_update),
+            "/device/data/backup": (True, self._backup_save),
+            "/device/data/backup/get": (True, self._backup_get),
+            "/device/data/backup/restore": (True, self._backup_restore),
+        }
+        self.reset()
+
+    def reset(self) -> None:
+        self.devices = {
+            device_id: EmulatedDevice.create(device_id, f"Trimlight {index + 1}")
+            for index, device_id in enumerate(self.config.device_ids)
+        }
+        self.faults.clear()
+        self.calls.clear()
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", f"{API_PREFIX}{RESOURCE_PREFIX}/devices", self._handle_devices)
+        app.router.add_route("POST", f"{API_PREFIX}{RESOURCE_PREFIX}/{{tail:.+}}", self._handle_resource)
+        app.router.add_get("/_emulator/state", self._handle_state)
+        app.router.add_post("/_emulator/faults", self._handle_faults)
+        app.router.add_post("/_emulator/config", self._handle_config)
+        app.router.add_post("/_emulator/reset", self._handle_reset)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{bound_host}:{bound_port}{API_PREFIX}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        self.base_url = None
+
+    def call_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for call in self.calls:
+            counts[call["path"]] = counts.get(call["path"], 0) + 1
+        return counts
+
+    @staticmethod
+    def _result(code: int = RESULT_SUCCESS, desc: str = "success", payload: Any = None) -> dict[str, Any]:
+        result: dict[str, Any] = {"code": code, "desc": desc}
+        if payload is not None:
+            result["payload"] = payload
+        return result
+
+    def _check_auth(self, request: web.Request) -> str | None:
+        client_id = request.headers.get("S-ClientId", "")
+        timestamp = request.headers.get("S-Timestamp", "")
+        token = request.headers.get("authorization", "")
+        if client_id != self.config.client_id:
+            return "unknown client id"
+        try:
+            timestamp_ms = int(timestamp)
+        except ValueError:
+            return "invalid timestamp"
+        skew = self.config.max_clock_skew_s
+        if skew is not None and abs(time.time() * 1000 - timestamp_ms) > skew * 1000:
+            return "timestamp outside allowed clock skew"
+        expected = access_token(self.config.client_id, self.config.client_secret, timestamp)
+        if not hmac.compare_digest(token, expected):
+            return "access token mismatch"
+        return None
+
+    async def _simulate_latency(self) -> None:
+        delay_ms = self.config.latency_ms
+        if self.config.latency_jitter_ms:
+            delay_ms += self.random.uniform(0, self.config.latency_jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000.0)
+
+    def _take_fault(self, path: str) -> InjectedFault | None:
+        for fault in self.faults:
+            if path.endswith(fault.path) and fault.remaining != 0:
+                fault.remaining -= 1
+                return fault
+        if self.config.error_rate and self.random.random() < self.config.error_rate:
+            return InjectedFault(path=path, code=self.config.error_code, remaining=0, desc="random error")
+        return None
+
+    async def _respond(
+        self, request: web.Request, path: str, body: dict[str, Any], handle: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> web.Response:
+        started = time.monotonic()
+        await self._simulate_latency()
+        auth_error = self._check_auth(request)
+        if auth_error is not None:
+            result = self._result(RESULT_WRONG_PASSWORD, auth_error)
+            status = 401
+        else:
+            fault = self._take_fault(path)
+            if fault is not None:
+                result = self._result(fault.code, fault.desc)
+                status = fault.http_status or 200
+            else:
+                result = await handle()
+                status = 200
+        self.calls.append(
+            {
+                "ts": now_iso(),
+                "method": request.method,
+                "path": path,
+                "body": body,
+                "code": result.get("code"),
+                "status": status,
+                "duration_ms": round((time.monotonic() - started) * 1000, 2),
+            }
+        )
+        return web.json_response(result, status=status)
+
+    @staticmethod
+    async def _read_body(request: web.Request) -> dict[str, Any]:
+        if not request.can_read_body:
+            return {}
+        try:
+            body = await request.json()
+        except json.JSONDecodeError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    async def _handle_devices(self, request: web.Request) -> web.Response:
+        body = await self._read_body(request)
+
+        async def _list() -> dict[str, Any]:
+            data = [device.summary() for device in self.devices.values()]
+            return self._result(payload={"total": len(data), "current": 1, "data": data})
+
+        return await self._respond(request, f"{RESOURCE_PREFIX}/devices", body, _list)
+
+    async def _handle_resource(self, request: web.Request) -> web.Response:
+        tail = "/" + request.match_info["tail"]
+        path = f"{RESOURCE_PREFIX}{tail}"
+        body = await self._read_body(request)
+        route = self._routes.get(tail)
+        if route is None:
+            raise web.HTTPNotFound()
+        needs_device, handler = route
+
+        async def _dispatch() -> dict[str, Any]:
+            device = None
+            if needs_device:
+                device = self.devices.get(str(body.get("deviceId")))
+                if device is None:
+                    return self._result(RESULT_ERROR, "device not found")
+            return await handler(device, body.get("payload") or {})
+
+        return await self._respond(request, path, body, _dispatch)
+
+    async def _device_detail(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        return self._result(payload=device.detail())
+
+    async def _device_update(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        switch_state = payload.get("switchState")
+        if switch_state not in (0, 1, 2):
+            return self._result(RESULT_ERROR, "invalid switchState")
+        was_off = device.switch_state == 0
+        device.switch_state = int(switch_state)
+        if was_off and device.switch_state != 0:
+            device.placeholder_polls_remaining = self.config.placeholder_off_polls
+        return self._result()
+
+    def _category_rejected(self, payload: dict[str, Any]) -> bool:
+        return self.config.reject_category_2 and payload.get("category") == 2
+
+    async def _effect_preview(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        category = payload.get("category")
+        if self._category_rejected(payload):
+            return self._result(RESULT_ERROR, "category 2 rejected")
+        if category == 0 and self.config.reject_builtin_preview:
+            return self._result(RESULT_ERROR, "built-in preview rejected")
+        if category not in (0, 1, 2) or payload.get("mode") is None:
+            return self._result(RESULT_ERROR, "invalid effect")
+        device.current_effect = {**copy.deepcopy(payload), "id": -1}
+        device.switch_state = 1
+        return self._result()
+
+    async def _effect_save(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        if self._category_rejected(payload):
+            return self._result(RESULT_ERROR, "category 2 rejected")
+        effect_id = payload.get("id")
+        effect = copy.deepcopy(payload)
+        if effect_id is None or int(effect_id) == -1:
+            if len(device.effects) >= MAX_SAVED_EFFECTS:
+                return self._result(RESULT_ERROR, "effect storage full")
+            effect_id = max(device.effects, default=-1) + 1
+        effect_id = int(effect_id)
+        # The controller reports saved custom effects as category 2.
+        if effect.get("category") == 1:
+            effect["category"] = 2
+        effect["id"] = effect_id
+        device.effects[effect_id] = effect
+        return self._result()
+
+    async def _effect_view(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        effect = device.effects.get(payload.get("id"))
+        if effect is None:
+            return self._result(RESULT_ERROR, "effect not found")
+        was_off = device.switch_state == 0
+        device.current_effect = copy.deepcopy(effect)
+        device.switch_state = 1
+        if was_off or effect.get("category") in (1, 2):
+            device.placeholder_polls_remaining = self.config.placeholder_off_polls
+        return self._result()
+
+    async def _effect_delete(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        if device.effects.pop(payload.get("id"), None) is None:
+            return self._result(RESULT_ERROR, "effect not found")
+        return self._result()
+
+    async def _daily_save(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        schedule_id = payload.get("id")
+        if schedule_id not in range(DAILY_SCHEDULE_COUNT):
+            return self._result(RESULT_ERROR, "invalid daily schedule id")
+        schedule = {key: copy.deepcopy(value) for key, value in payload.items() if key != "currentDate"}
+        device.daily[schedule_id] = schedule
+        return self._result()
+
+    async def _calendar_save(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        slot = payload.get("id")
+        if slot not in range(MAX_CALENDAR_SCHEDULES):
+            return self._result(RESULT_ERROR, "invalid calendar schedule id")
+        device.calendar[slot] = copy.deepcopy(payload)
+        return self._result()
+
+    async def _calendar_delete(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        if device.calendar.pop(payload.get("id"), None) is None:
+            return self._result(RESULT_ERROR, "calendar schedule not found")
+        return self._result()
+
+    async def _combined_effect_save(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        effect_ids = payload.get("effectIds") or []
+        if any(effect_id not in device.effects for effect_id in effect_ids):
+            return self._result(RESULT_ERROR, "effect not found")
+        device.combined_effect = {"effectIds": list(effect_ids), "interval": int(payload.get("interval") or 0)}
+        return self._result()
+
+    async def _overlay_update(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        overlays = payload.get("overlayEffects") or []
+        if any(overlay.get("overlayType") not in (0, 1) for overlay in overlays):
+            return self._result(RESULT_ERROR, "invalid overlay type")
+        if any(overlay.get("targetEffect") not in device.effects for overlay in overlays):
+            return self._result(RESULT_ERROR, "effect not found")
+        device.overlay_effects = copy.deepcopy(overlays)
+        return self._result()
+
+    # The cloud keeps a single backup per device; saving again replaces it.
+    _BACKUP_FIELDS = ("effects", "daily", "calendar", "combined_effect", "overlay_effects")
+
+    async def _backup_save(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        backup_time = payload.get("backupTime")
+        if not backup_time:
+            return self._result(RESULT_ERROR, "missing backupTime")
+        device.backup = {
+            "backupKey": hashlib.sha1(f"{device.device_id}:{backup_time}:{time.time()}".encode()).hexdigest(),
+            "backupTime": backup_time,
+            "state": {name: copy.deepcopy(getattr(device, name)) for name in self._BACKUP_FIELDS},
+        }
+        return self._result()
+
+    async def _backup_get(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        if device.backup is None:
+            return self._result(RESULT_ERROR, "no backup")
+        return self._result(
+            payload={"backupKey": device.backup["backupKey"], "backupTime": device.backup["backupTime"]}
+        )
+
+    async def _backup_restore(self, device: EmulatedDevice | None, payload: dict[str, Any]) -> dict[str, Any]:
+        assert device is not None
+        if device.backup is None or payload.get("backupKey") != device.backup["backupKey"]:
+            return self._result(RESULT_ERROR, "backup not found")
+        for name, value in device.backup["state"].items():
+            setattr(device, name, copy.deepcopy(value))
+        return self._result()
+
+    async def _handle_state(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "config": asdict(self.config),
+                "devices": {device_id: device.detail() for device_id, device in self.devices.items()},
+                "call_counts": self.call_counts(),
+                "calls": self.calls[-200:],
+            }
+        )
+
+    async def _handle_faults(self, request: web.Request) -> web.Response:
+        body = await self._read_body(request)
+        if body.get("clear"):
+            self.faults.clear()
+        elif body.get("path"):
+            self.faults.append(
+                InjectedFault(
+                    path=str(body["path"]),
+                    code=int(body.get("code", RESULT_ERROR)),
+                    remaining=int(body.get("count", 1)),
+                    desc=str(body.get("desc", "injected error")),
+                    http_status=body.get("http_status"),
+                )
+            )
+        return web.json_response({"faults": [asdict(fault) for fault in self.faults]})
+
+    async def _handle_config(self, request: web.Request) -> web.Response:
+        body = await self._read_body(request)
+        try:
+            merged = {**asdict(self.config), **body}
+            self.config = EmulatorConfig.from_dict(merged)
+        except (TypeError, ValueError) as exc:
+            return web.json_response({"error": str(exc)}, status=400)
+        return web.json_response(asdict(self.config))
+
+    async def _handle_reset(self, request: web.Request) -> web.Response:
+        self.reset()
+        return web.json_response({"reset": True})
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run a local emulator of the Trimlight Edge cloud API."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind. Defaults to 127.0.0.1.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind. Defaults to 8765.")
+    parser.add_argument("--config", help="Optional JSON file with emulator settings.")
+    parser.add_argument("--latency-ms", type=float, help="Fixed latency added to every request.")
+    parser.add_argument("--jitter-ms", type=float, help="Random extra latency, up to this many milliseconds.")
+    parser.add_argument("--error-rate", type=float, help="Fraction of requests that fail with --error-code.")
+    parser.add_argument("--error-code", type=int, help="Result code used for random failures. Defaults to 10001.")
+    parser.add_argument(
+        "--placeholder-off-polls",
+        type=int,
+        help="Number of detail polls that report a placeholder off state after power-on or a custom apply.",
+    )
+    parser.add_argument(
+        "--reject-category-2",
+        action="store_true",
+        help="Reject preview/save payloads that use category 2.",
+    )
+    parser.add_argument(
+        "--reject-builtin-preview",
+        action="store_true",
+        help="Reject built-in (category 0) previews so callers must fall back to effect/view.",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for latency jitter and random failures.")
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> EmulatorConfig:
+    config = EmulatorConfig()
+    if args.config:
+        config_path = Path(args.config)
+        if not config_path.is_absolute():
+            config_path = REPO_ROOT / config_path
+        config = EmulatorConfig.from_file(config_path)
+    overrides = {
+        "latency_ms": args.latency_ms,
+        "latency_jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "error_code": args.error_code,
+        "placeholder_off_polls": args.placeholder_off_polls,
+        "seed": args.seed,
+    }
+    for key, value in overrides.items():
+        if value is not None:
+            setattr(config, key, value)
+    if args.reject_category_2:
+        config.reject_category_2 = True
+    if args.reject_builtin_preview:
+        config.reject_builtin_preview = True
+    return config
+
+
+async def serve(config: EmulatorConfig, host: str, port: int) -> None:
+    emulator = TrimlightCloudEmulator(config)
+    base_url = await emulator.start(host, port)
+    print(f"Trimlight cloud emulator listening on {base_url}")
+    print(f"Client id: {config.client_id}  Client secret: {config.client_secret}")
+    print(f"Devices: {', '.join(config.device_ids)}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await emulator.stop()
+
+
+def main() -> int:
+    args = build_arg_parser().parse_args()
+    try:
+        config = config_from_args(args)
+    except Exception as exc:  # noqa: BLE001
+        print(f"Failed to load config: {exc}", file=sys.stderr)
+        return 2
+    try:
+        asyncio.run(serve(config, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
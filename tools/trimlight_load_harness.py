@@ -0,0 +1,479 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import inspect
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
+
+from trimlight_cloud_emulator import EmulatorConfig, TrimlightCloudEmulator
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+INTEGRATION_DIR = REPO_ROOT / "custom_components" / "trimlight"
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "debug"
+
+DOMAIN = "trimlight"
+ACTION_KINDS = ("select_builtin", "select_custom", "brightness", "speed")
+ENTITY_UNIQUE_SUFFIXES = {
+    "light": ("light", "light"),
+    "builtin_select": ("select", "builtin_select"),
+    "custom_select": ("select", "custom_select"),
+    "speed_number": ("number", "effect_speed"),
+}
+RUNTIME_TIMER_FIELDS = (
+    "verify_refresh_handle",
+    "builtin_reapply_handle",
+    "custom_reapply_handle",
+    "speed_reapply_handle",
+)
+LOOP_LAG_INTERVAL_S = 0.02
+
+
+def now_iso() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def dump_json(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+
+
+def summarize(values: list[float]) -> dict[str, float | int | None]:
+    if not values:
+        return {"count": 0, "min": None, "median": None, "p95": None, "max": None, "mean": None}
+    ordered = sorted(values)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "count": len(ordered),
+        "min": round(ordered[0], 3),
+        "median": round(statistics.median(ordered), 3),
+        "p95": round(ordered[p95_index], 3),
+        "max": round(ordered[-1], 3),
+        "mean": round(statistics.fmean(ordered), 3),
+    }
+
+
+class LoopLagMonitor:
+    """Samples how late a fixed-interval sleep wakes up on the event loop."""
+
+    def __init__(self, interval_s: float = LOOP_LAG_INTERVAL_S) -> None:
+        self.interval_s = interval_s
+        self.samples_ms: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            self.samples_ms.append(max(0.0, (loop.time() - expected) * 1000))
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+@dataclass(slots=True)
+class HarnessConfig:
+    entries: int
+    actions_per_entry: int
+    concurrency: int
+    think_time_s: float
+    settle_s: float
+    latency_ms: float
+    jitter_ms: float
+    seed: int
+    output_dir: Path
+
+
+@dataclass(slots=True)
+class EntryUnderLoad:
+    index: int
+    entry_id: str
+    device_id: str
+    entity_ids: dict[str, str]
+    coordinator_update_ms: list[float] = field(default_factory=list)
+    actions: list[dict[str, Any]] = field(default_factory=list)
+
+
+def make_config_entry(config_entries: Any, *, index: int, device_id: str, base_url: str, emulator: EmulatorConfig) -> Any:
+    # ConfigEntry grew required keyword arguments across Home Assistant
+    # releases; only pass the ones this version accepts.
+    params = inspect.signature(config_entries.ConfigEntry).parameters
+    kwargs = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": DOMAIN,
+        "title": f"Trimlight load {index}",
+        "data": {
+            "client_id": emulator.client_id,
+            "client_secret": emulator.client_secret,
+            "device_id": device_id,
+            "base_url": base_url,
+        },
+        "options": {"commit_custom_preset": True, "debug_logging": False},
+        "source": config_entries.SOURCE_USER,
+        "unique_id": device_id,
+        "discovery_keys": MappingProxyType({}),
+        "subentries_data": (),
+    }
+    return config_entries.ConfigEntry(**{key: value for key, value in kwargs.items() if key in params})
+
+
+async def create_hass(config_dir: Path) -> Any:
+    from homeassistant import bootstrap, config_entries, loader
+    from homeassistant.core import HomeAssistant
+    from homeassistant.setup import async_setup_component
+
+    custom_components = config_dir / "custom_components"
+    custom_components.mkdir(parents=True, exist_ok=True)
+    target = custom_components / DOMAIN
+    try:
+        target.symlink_to(INTEGRATION_DIR, target_is_directory=True)
+    except OSError:
+        shutil.copytree(INTEGRATION_DIR, target)
+
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    if hasattr(bootstrap, "async_load_base_functionality"):
+        await bootstrap.async_load_base_functionality(hass)
+    else:
+        # Mirror what older bootstrap._async_set_up_integrations did before
+        # the base setup moved into its own function; without entity.async_setup
+        # every platform fails with KeyError 'entity_info'.
+        from homeassistant.helpers import (
+            area_registry,
+            device_registry,
+            entity,
+            entity_registry,
+            issue_registry,
+            restore_state,
+            template,
+        )
+
+        entity.async_setup(hass)
+        template.async_setup(hass)
+        for registry in (area_registry, device_registry, entity_registry, issue_registry, restore_state):
+            await registry.async_load(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await async_setup_component(hass, "homeassistant", {})
+    await hass.async_start()
+    return hass
+
+
+def instrument_coordinator(coordinator: Any, sink: list[float]) -> None:
+    original = coordinator._async_update_data
+
+    async def _timed_update() -> Any:
+        started = time.perf_counter()
+        try:
+            return await original()
+        finally:
+            sink.append((time.perf_counter() - started) * 1000)
+
+    coordinator._async_update_data = _timed_update
+
+
+def device_call_count(emulator: TrimlightCloudEmulator, device_id: str, since: int = 0) -> int:
+    return sum(1 for call in emulator.calls[since:] if (call.get("body") or {}).get("deviceId") == device_id)
+
+
+def pending_timer_count(hass: Any, entry: EntryUnderLoad) -> int:
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    return sum(1 for name in RUNTIME_TIMER_FIELDS if getattr(runtime, name) is not None)
+
+
+class LoadHarness:
+    def __init__(self, config: HarnessConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.emulator = TrimlightCloudEmulator(
+            EmulatorConfig(
+                device_ids=[f"load-device-{index:03d}" for index in range(config.entries)],
+                latency_ms=config.latency_ms,
+                latency_jitter_ms=config.jitter_ms,
+                seed=config.seed,
+            )
+        )
+        self.entries: list[EntryUnderLoad] = []
+        self.lag = LoopLagMonitor()
+        self.report: dict[str, Any] = {"started_at": now_iso(), "config": {}}
+
+    async def setup_entries(self, hass: Any, base_url: str) -> dict[str, Any]:
+        from homeassistant import config_entries
+        from homeassistant.helpers import entity_registry
+
+        memory_before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        for index, device_id in enumerate(self.emulator.config.device_ids):
+            entry = make_config_entry(
+                config_entries,
+                index=index,
+                device_id=device_id,
+                base_url=base_url,
+                emulator=self.emulator.config,
+            )
+            await hass.config_entries.async_add(entry)
+            self.entries.append(EntryUnderLoad(index=index, entry_id=entry.entry_id, device_id=device_id, entity_ids={}))
+        await hass.async_block_till_done()
+        setup_s = time.perf_counter() - started
+        memory_after, _ = tracemalloc.get_traced_memory()
+
+        registry = entity_registry.async_get(hass)
+        for entry in self.entries:
+            for key, (platform, suffix) in ENTITY_UNIQUE_SUFFIXES.items():
+                entity_id = registry.async_get_entity_id(platform, DOMAIN, f"{entry.entry_id}_{suffix}")
+                if entity_id is None:
+                    raise RuntimeError(f"Entity {key} missing for entry {entry.entry_id}")
+                if hass.states.get(entity_id) is None:
+                    raise RuntimeError(f"Entity {entity_id} has no state for entry {entry.entry_id}")
+                entry.entity_ids[key] = entity_id
+            instrument_coordinator(hass.data[DOMAIN][entry.entry_id].coordinator, entry.coordinator_update_ms)
+
+        return {
+            "setup_s": round(setup_s, 3),
+            "memory_bytes_total": memory_after - memory_before,
+            "memory_bytes_per_entry": round((memory_after - memory_before) / max(1, len(self.entries))),
+        }
+
+    def _options(self, hass: Any, entity_id: str) -> list[str]:
+        state = hass.states.get(entity_id)
+        return list((state.attributes.get("options") if state else None) or [])
+
+    async def run_action(self, hass: Any, entry: EntryUnderLoad) -> None:
+        kind = self.rng.choice(ACTION_KINDS)
+        service_domain, service, data = "", "", {}
+        if kind in ("select_builtin", "select_custom"):
+            entity_id = entry.entity_ids["builtin_select" if kind == "select_builtin" else "custom_select"]
+            options = self._options(hass, entity_id)
+            if not options:
+                # The emulator always has presets, so an empty select is a failure, not a no-op.
+                entry.actions.append(
+                    {
+                        "kind": kind,
+                        "duration_ms": 0.0,
+                        "api_calls": 0,
+                        "pending_timers": pending_timer_count(hass, entry),
+                        "error": f"skipped: {entity_id} has no options",
+                    }
+                )
+                return
+            service_domain, service = "select", "select_option"
+            data = {"entity_id": entity_id, "option": self.rng.choice(options)}
+        elif kind == "brightness":
+            service_domain, service = "light", "turn_on"
+            data = {"entity_id": entry.entity_ids["light"], "brightness": self.rng.randint(1, 255)}
+        else:
+            service_domain, service = "number", "set_value"
+            data = {"entity_id": entry.entity_ids["speed_number"], "value": self.rng.randint(0, 100)}
+
+        calls_before = len(self.emulator.calls)
+        started = time.perf_counter()
+        error = None
+        try:
+            await hass.services.async_call(service_domain, service, data, blocking=True)
+        except Exception as exc:  # noqa: BLE001
+            error = str(exc)
+        entry.actions.append(
+            {
+                "kind": kind,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                "api_calls": device_call_count(self.emulator, entry.device_id, calls_before),
+                "pending_timers": pending_timer_count(hass, entry),
+                "error": error,
+            }
+        )
+
+    async def drive_entry(self, hass: Any, entry: EntryUnderLoad, semaphore: asyncio.Semaphore) -> None:
+        for _ in range(self.config.actions_per_entry):
+            async with semaphore:
+                await self.run_action(hass, entry)
+            if self.config.think_time_s:
+                await asyncio.sleep(self.rng.uniform(0, self.config.think_time_s))
+
+    async def refresh_storm(self, hass: Any) -> dict[str, Any]:
+        coordinators = [hass.data[DOMAIN][entry.entry_id].coordinator for entry in self.entries]
+        started = time.perf_counter()
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+        return {"entries": len(coordinators), "wall_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    def build_report(self, hass: Any, setup: dict[str, Any], storm: dict[str, Any], load_s: float) -> dict[str, Any]:
+        actions = [action for entry in self.entries for action in entry.actions]
+        total_device_calls = sum(device_call_count(self.emulator, entry.device_id) for entry in self.entries)
+        by_kind = {
+            kind: {
+                "duration_ms": summarize([a["duration_ms"] for a in actions if a["kind"] == kind]),
+                "api_calls": summarize([float(a["api_calls"]) for a in actions if a["kind"] == kind]),
+            }
+            for kind in ACTION_KINDS
+        }
+        scheduled = getattr(hass.loop, "_scheduled", None)
+        return {
+            **self.report,
+            "finished_at": now_iso(),
+            "setup": setup,
+            "load": {
+                "duration_s": round(load_s, 3),
+                "actions": len(actions),
+                "errors": sum(1 for a in actions if a["error"]),
+                "actions_per_s": round(len(actions) / load_s, 2) if load_s else None,
+                "by_kind": by_kind,
+            },
+            "api": {
+                "calls_total": len(self.emulator.calls),
+                "calls_per_action_including_followups": round(total_device_calls / max(1, len(actions)), 2),
+                "calls_by_endpoint": self.emulator.call_counts(),
+            },
+            "event_loop_lag_ms": summarize(self.lag.samples_ms),
+            "coordinator_update_ms": summarize([ms for entry in self.entries for ms in entry.coordinator_update_ms]),
+            "refresh_storm": storm,
+            "timers": {
+                "loop_scheduled_handles": len(scheduled) if scheduled is not None else None,
+                "runtime_pending_timers": sum(pending_timer_count(hass, entry) for entry in self.entries),
+            },
+            "entries": [
+                {
+                    "index": entry.index,
+                    "device_id": entry.device_id,
+                    "actions": len(entry.actions),
+                    "api_calls": device_call_count(self.emulator, entry.device_id),
+                    "coordinator_update_ms": summarize(entry.coordinator_update_ms),
+                }
+                for entry in self.entries
+            ],
+        }
+
+    async def run(self) -> dict[str, Any]:
+        base_url = await self.emulator.start()
+        tracemalloc.start()
+        with tempfile.TemporaryDirectory(prefix="trimlight_load_") as config_dir:
+            hass = await create_hass(Path(config_dir))
+            try:
+                setup = await self.setup_entries(hass, base_url)
+                self.lag.start()
+                semaphore = asyncio.Semaphore(max(1, self.config.concurrency))
+                started = time.perf_counter()
+                await asyncio.gather(*(self.drive_entry(hass, entry, semaphore) for entry in self.entries))
+                load_s = time.perf_counter() - started
+                # Let delayed reapplies and verification refreshes fire so they
+                # count towards API calls per action.
+                await asyncio.sleep(self.config.settle_s)
+                storm = await self.refresh_storm(hass)
+                await self.lag.stop()
+                report = self.build_report(hass, setup, storm, load_s)
+            finally:
+                await self.lag.stop()
+                await hass.async_stop()
+                tracemalloc.stop()
+                await self.emulator.stop()
+        return report
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Load test many Trimlight config entries in one Home Assistant instance against the local cloud emulator."
+    )
+    parser.add_argument("--entries", type=int, default=10, help="Number of config entries (controllers). Defaults to 10.")
+    parser.add_argument("--actions", type=int, default=20, help="Randomized actions per entry. Defaults to 20.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum service calls in flight across all entries. Defaults to 8.",
+    )
+    parser.add_argument("--think-time", type=float, default=0.5, help="Maximum random pause between actions per entry, in seconds.")
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=20.0,
+        help="Seconds to wait after the load phase for delayed reapplies and verification refreshes.",
+    )
+    parser.add_argument("--latency-ms", type=float, default=120.0, help="Emulated API latency. Defaults to 120 ms.")
+    parser.add_argument("--jitter-ms", type=float, default=80.0, help="Extra random API latency. Defaults to 80 ms.")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the action mix and emulator jitter.")
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR), help="Directory for the JSON report.")
+    return parser
+
+
+def print_summary(report: dict[str, Any], report_path: Path) -> None:
+    print()
+    print(f"Report written to: {report_path}")
+    setup = report["setup"]
+    load = report["load"]
+    print(f"Entries: {len(report['entries'])}  setup: {setup['setup_s']}s  memory/entry: {setup['memory_bytes_per_entry']:,} bytes")
+    print(f"Actions: {load['actions']} in {load['duration_s']}s ({load['actions_per_s']}/s), errors: {load['errors']}")
+    print(f"API calls per action (incl. follow-ups): {report['api']['calls_per_action_including_followups']}")
+    for kind, stats in load["by_kind"].items():
+        duration = stats["duration_ms"]
+        calls = stats["api_calls"]
+        print(f"  {kind:<15} median {duration['median']} ms  p95 {duration['p95']} ms  calls median {calls['median']}")
+    lag = report["event_loop_lag_ms"]
+    print(f"Event loop lag: median {lag['median']} ms  p95 {lag['p95']} ms  max {lag['max']} ms")
+    updates = report["coordinator_update_ms"]
+    print(f"Coordinator updates: {updates['count']}  median {updates['median']} ms  p95 {updates['p95']} ms")
+    print(f"Refresh storm: {report['refresh_storm']['wall_ms']} ms for {report['refresh_storm']['entries']} entries")
+
+
+def main() -> int:
+    args = build_arg_parser().parse_args()
+    if importlib.util.find_spec("homeassistant") is None:
+        print("Home Assistant is not installed in this Python environment.", file=sys.stderr)
+        return 2
+
+    output_dir = Path(args.output_dir)
+    if not output_dir.is_absolute():
+        output_dir = REPO_ROOT / output_dir
+    config = HarnessConfig(
+        entries=max(1, args.entries),
+        actions_per_entry=max(0, args.actions),
+        concurrency=args.concurrency,
+        think_time_s=max(0.0, args.think_time),
+        settle_s=max(0.0, args.settle),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        seed=args.seed,
+        output_dir=output_dir,
+    )
+    harness = LoadHarness(config)
+    harness.report["config"] = {
+        "entries": config.entries,
+        "actions_per_entry": config.actions_per_entry,
+        "concurrency": config.concurrency,
+        "think_time_s": config.think_time_s,
+        "settle_s": config.settle_s,
+        "latency_ms": config.latency_ms,
+        "jitter_ms": config.jitter_ms,
+        "seed": config.seed,
+    }
+    report = asyncio.run(harness.run())
+    report_path = output_dir / f"trimlight_load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    dump_json(report_path, report)
+    print_summary(report, report_path)
+    return 0 if report["load"]["errors"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
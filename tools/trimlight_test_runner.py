@@ -1,13 +1,18 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
+import math
 import os
+import random
 import shutil
 import ssl
 import sys
+import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable
@@ -50,9 +55,22 @@ DEFAULT_TIMING_S = {
     "settle_cold_start": 20,
     "after_power_off": 5,
     "after_refresh": 5,
+    "poll_interval": 0.5,
+    "stable_hold": 3,
 }
 
 TURN_OFF_SETTLE_BUFFER_S = 1.0
+ASYNC_CLIENT_MAX_CONNECTIONS = 10
+HTTP_TIMEOUT_S = 30
+WEBSOCKET_HEARTBEAT_S = 30
+
+# Repeated-run comparison: a latency change counts as a regression only when it
+# exceeds the threshold and the Mann-Whitney test rejects "same distribution".
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+DEFAULT_SIGNIFICANCE = 0.05
+MIN_COMPARISON_SAMPLES = 3
+
+DEFAULT_MAX_CONCURRENT_DEVICES = 4
 
 DEFAULT_SCENARIOS = [
     "refresh_presets",
@@ -106,6 +124,216 @@ def is_known_state(value: Any) -> bool:
     return text not in {"", "unknown", "unavailable", "none"}
 
 
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * pct / 100.0
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def distribution(values: list[float]) -> dict[str, Any]:
+    if not values:
+        return {"count": 0, "samples": []}
+    return {
+        "count": len(values),
+        "min": round(min(values), 3),
+        "median": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "max": round(max(values), 3),
+        "samples": [round(value, 3) for value in values],
+    }
+
+
+def mann_whitney_p(first: list[float], second: list[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test, normal approximation with tie correction."""
+    combined = sorted((value, group) for group, values in enumerate((first, second)) for value in values)
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        rank = (index + end) / 2 + 1
+        for position in range(index, end + 1):
+            ranks[position] = rank
+        tied = end - index + 1
+        tie_term += tied**3 - tied
+        index = end + 1
+
+    n1, n2 = len(first), len(second)
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u_stat = rank_sum - n1 * (n1 + 1) / 2
+    total = n1 + n2
+    variance = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z_score = (u_stat - n1 * n2 / 2) / math.sqrt(variance)
+    return math.erfc(abs(z_score) / math.sqrt(2))
+
+
+def fisher_greater_p(failed: int, runs: int, baseline_failed: int, baseline_runs: int) -> float:
+    """One-sided Fisher exact p-value that the current failure rate is higher than the baseline's."""
+    total_failed = failed + baseline_failed
+    total = runs + baseline_runs
+    denominator = math.comb(total, runs)
+    upper = min(total_failed, runs)
+    return sum(
+        math.comb(total_failed, count) * math.comb(total - total_failed, runs - count)
+        for count in range(failed, upper + 1)
+    ) / denominator
+
+
+def scenario_stable_latency(scenario: dict[str, Any]) -> float | None:
+    """Sum of time-to-stable across condition steps, or None when any step did not converge."""
+    total = 0.0
+    for step in scenario["steps"]:
+        convergence = step.get("convergence")
+        if convergence is None:
+            continue
+        if convergence["time_to_stable_s"] is None:
+            return None
+        total += convergence["time_to_stable_s"]
+    return total
+
+
+def compute_statistics(scenarios: list[dict[str, Any]]) -> dict[str, Any]:
+    by_scenario: dict[str, list[dict[str, Any]]] = {}
+    step_samples: dict[str, dict[str, list[float]]] = {}
+    for scenario in scenarios:
+        by_scenario.setdefault(scenario["name"], []).append(scenario)
+        for step in scenario["steps"]:
+            convergence = step.get("convergence")
+            if convergence is None:
+                continue
+            samples = step_samples.setdefault(
+                f"{scenario['name']}/{step['name']}",
+                {"time_to_first_correct_s": [], "time_to_stable_s": []},
+            )
+            for metric, values in samples.items():
+                if convergence[metric] is not None:
+                    values.append(convergence[metric])
+
+    scenario_stats: dict[str, Any] = {}
+    for name, runs in by_scenario.items():
+        failed = sum(1 for run in runs if not run["passed"])
+        latencies = [value for value in (scenario_stable_latency(run) for run in runs) if value is not None]
+        scenario_stats[name] = {
+            "runs": len(runs),
+            "failed": failed,
+            "flake_rate": round(failed / len(runs), 3),
+            "flaky": 0 < failed < len(runs),
+            "duration_s": distribution([run["duration_s"] for run in runs if "duration_s" in run]),
+            "time_to_stable_s": distribution(latencies),
+        }
+    return {
+        "scenarios": scenario_stats,
+        "steps": {
+            key: {metric: distribution(values) for metric, values in samples.items()}
+            for key, samples in step_samples.items()
+        },
+    }
+
+
+def compare_latency(
+    name: str,
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+    significance: float,
+) -> dict[str, Any] | None:
+    current_samples = current.get("samples") or []
+    baseline_samples = baseline.get("samples") or []
+    if not current_samples or not baseline_samples:
+        return None
+    change = (current["median"] - baseline["median"]) / baseline["median"] if baseline["median"] else 0.0
+    result = {
+        "metric": name,
+        "baseline_median": baseline["median"],
+        "median": current["median"],
+        "change": round(change, 3),
+        "p_value": None,
+        "verdict": "insufficient samples",
+    }
+    if min(len(current_samples), len(baseline_samples)) < MIN_COMPARISON_SAMPLES:
+        return result
+    p_value = mann_whitney_p(current_samples, baseline_samples)
+    result["p_value"] = round(p_value, 4)
+    if p_value >= significance or abs(change) <= threshold:
+        result["verdict"] = "no significant change"
+    else:
+        result["verdict"] = "regression" if change > 0 else "improvement"
+    return result
+
+
+def compare_statistics(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+    significance: float = DEFAULT_SIGNIFICANCE,
+) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    baseline_scenarios = baseline.get("scenarios") or {}
+    for name, stats in current["scenarios"].items():
+        reference = baseline_scenarios.get(name)
+        if reference is None:
+            continue
+        latency = compare_latency(
+            f"{name} time_to_stable_s", stats["time_to_stable_s"], reference["time_to_stable_s"], threshold, significance
+        )
+        if latency is not None:
+            results.append(latency)
+        if stats["failed"] > reference["failed"] * stats["runs"] / max(reference["runs"], 1):
+            p_value = fisher_greater_p(stats["failed"], stats["runs"], reference["failed"], reference["runs"])
+            results.append(
+                {
+                    "metric": f"{name} flake_rate",
+                    "baseline_median": reference["flake_rate"],
+                    "median": stats["flake_rate"],
+                    "change": round(stats["flake_rate"] - reference["flake_rate"], 3),
+                    "p_value": round(p_value, 4),
+                    "verdict": "regression" if p_value < significance else "no significant change",
+                }
+            )
+    baseline_steps = baseline.get("steps") or {}
+    for key, metrics in current["steps"].items():
+        reference = baseline_steps.get(key)
+        if reference is None:
+            continue
+        for metric, values in metrics.items():
+            latency = compare_latency(f"{key} {metric}", values, reference.get(metric) or {}, threshold, significance)
+            if latency is not None:
+                results.append(latency)
+    return {
+        "threshold": threshold,
+        "significance": significance,
+        "results": results,
+        "regressions": [result["metric"] for result in results if result["verdict"] == "regression"],
+        "improvements": [result["metric"] for result in results if result["verdict"] == "improvement"],
+    }
+
+
+def load_baseline_statistics(path: Path) -> dict[str, Any]:
+    """Read statistics from an earlier runner report, or from a bare statistics file."""
+    raw = load_json(path)
+    statistics = raw.get("statistics", raw)
+    if "scenarios" not in statistics:
+        raise ValueError(f"No runner statistics found in {path}")
+    return statistics
+
+
+@dataclass(slots=True)
+class DeviceConfig:
+    name: str
+    entity_ids: dict[str, str]
+    presets: dict[str, str]
+    speed_values: dict[str, float]
+
+
 @dataclass(slots=True)
 class RunnerConfig:
     ha_url: str
@@ -118,6 +346,22 @@ class RunnerConfig:
     presets: dict[str, str]
     speed_values: dict[str, float]
     timing_s: dict[str, float]
+    async_client: bool = False
+    websocket: bool = False
+    repeat: int = 1
+    seed: int | None = None
+    devices: list[DeviceConfig] = field(default_factory=list)
+    max_concurrent_devices: int = DEFAULT_MAX_CONCURRENT_DEVICES
+
+    def for_device(self, device: DeviceConfig, index: int = 0) -> "RunnerConfig":
+        return replace(
+            self,
+            entity_ids=device.entity_ids,
+            presets=device.presets,
+            speed_values=device.speed_values,
+            seed=self.seed + index if self.seed is not None else None,
+            devices=[device],
+        )
 
     @classmethod
     def from_file(cls, path: Path) -> "RunnerConfig":
@@ -153,6 +397,26 @@ class RunnerConfig:
             for key, value in {**DEFAULT_TIMING_S, **dict(raw.get("timing_s") or {})}.items()
         }
 
+        # Each device entry overrides the top-level entity map, presets and speed values.
+        devices: list[DeviceConfig] = []
+        for index, raw_device in enumerate(raw.get("devices") or []):
+            device_name = str(raw_device.get("name") or f"device_{index + 1}")
+            devices.append(
+                DeviceConfig(
+                    name=device_name,
+                    entity_ids={**entity_ids, **dict(raw_device.get("entity_ids") or {})},
+                    presets={**presets, **dict(raw_device.get("presets") or {})},
+                    speed_values={
+                        **speed_values,
+                        **{key: float(value) for key, value in dict(raw_device.get("speed_values") or {}).items()},
+                    },
+                )
+            )
+        if len({device.name for device in devices}) != len(devices):
+            raise ValueError("Device names in 'devices' must be unique.")
+        if not devices:
+            devices.append(DeviceConfig("default", entity_ids, presets, speed_values))
+
         output_dir = to_path(str(raw.get("output_dir", "debug"))) or (REPO_ROOT / "debug")
         share_path = to_path(str(raw.get("ha_share_path", "")).strip()) if raw.get("ha_share_path") else None
 
@@ -167,6 +431,12 @@ class RunnerConfig:
             presets=presets,
             speed_values=speed_values,
             timing_s=timing_s,
+            async_client=bool(raw.get("async_client", False)),
+            websocket=bool(raw.get("websocket", False)),
+            repeat=max(int(raw.get("repeat", 1)), 1),
+            seed=int(raw["seed"]) if raw.get("seed") is not None else None,
+            devices=devices,
+            max_concurrent_devices=max(int(raw.get("max_concurrent_devices", DEFAULT_MAX_CONCURRENT_DEVICES)), 1),
         )
 
 
@@ -187,7 +457,7 @@ class HomeAssistantClient:
 
         request = Request(url, data=body, headers=self._headers, method=method)
         try:
-            with urlopen(request, timeout=30, context=self._ssl_context) as response:
+            with urlopen(request, timeout=HTTP_TIMEOUT_S, context=self._ssl_context) as response:
                 raw = response.read()
         except HTTPError as exc:
             raw = exc.read().decode("utf-8", errors="replace")
@@ -202,22 +472,294 @@ class HomeAssistantClient:
     def get_state(self, entity_id: str) -> dict[str, Any]:
         return self._request("GET", f"/api/states/{quote(entity_id, safe='')}")
 
+    def get_states(self, entity_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return {entity_id: self.get_state(entity_id) for entity_id in entity_ids}
+
     def call_service(self, domain: str, service: str, service_data: dict[str, Any]) -> Any:
         return self._request("POST", f"/api/services/{domain}/{service}", service_data)
 
+    def close(self) -> None:
+        pass
 
-class TrimlightTestRunner:
-    def __init__(self, config: RunnerConfig) -> None:
-        self.config = config
-        self.client = HomeAssistantClient(
+
+class AsyncHomeAssistantClient:
+    """Home Assistant REST client on a pooled aiohttp session.
+
+    The session lives on a background event loop so the scenario code can
+    stay synchronous; ``get_states`` fetches all entities concurrently.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        *,
+        verify_ssl: bool = True,
+        max_connections: int = ASYNC_CLIENT_MAX_CONNECTIONS,
+    ) -> None:
+        try:
+            import aiohttp
+        except ImportError as exc:
+            raise RuntimeError("The async client needs aiohttp. Install it with: pip install aiohttp") from exc
+
+        self._aiohttp = aiohttp
+        self._base_url = base_url.rstrip("/")
+        self._token = token
+        self._headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+        }
+        self._verify_ssl = verify_ssl
+        self._max_connections = max_connections
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="ha-client-loop", daemon=True)
+        self._thread.start()
+        self.session = self.run(self._create_session())
+
+    async def _create_session(self) -> Any:
+        aiohttp = self._aiohttp
+        connector_kwargs: dict[str, Any] = {"limit": self._max_connections}
+        if not self._verify_ssl:
+            connector_kwargs["ssl"] = False
+        connector = aiohttp.TCPConnector(**connector_kwargs)
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self._headers,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_S),
+        )
+
+    def run(self, coro: Any) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def request(self, method: str, path: str, payload: dict[str, Any] | None = None) -> Any:
+        try:
+            async with self.session.request(method, f"{self._base_url}{path}", json=payload) as response:
+                raw = await response.text()
+                if response.status >= 400:
+                    raise RuntimeError(f"{method} {path} failed with HTTP {response.status}: {raw}")
+        except self._aiohttp.ClientError as exc:
+            raise RuntimeError(f"{method} {path} failed: {exc}") from exc
+        if not raw:
+            return None
+        return json.loads(raw)
+
+    async def get_states_async(self, entity_ids: list[str]) -> dict[str, dict[str, Any]]:
+        states = await asyncio.gather(
+            *(self.request("GET", f"/api/states/{quote(entity_id, safe='')}") for entity_id in entity_ids)
+        )
+        return dict(zip(entity_ids, states))
+
+    def get_state(self, entity_id: str) -> dict[str, Any]:
+        return self.run(self.request("GET", f"/api/states/{quote(entity_id, safe='')}"))
+
+    def get_states(self, entity_ids: list[str]) -> dict[str, dict[str, Any]]:
+        return self.run(self.get_states_async(entity_ids))
+
+    def call_service(self, domain: str, service: str, service_data: dict[str, Any]) -> Any:
+        return self.run(self.request("POST", f"/api/services/{domain}/{service}", service_data))
+
+    def close(self) -> None:
+        if not self.loop.is_running():
+            return
+        self.run(self.session.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+class HomeAssistantEventStream:
+    """Mirror of entity states kept current by the websocket ``state_changed`` feed.
+
+    Runs on the async client's loop. Every change for a tracked entity is
+    appended to ``timeline`` with a millisecond offset from ``origin``.
+    """
+
+    def __init__(self, client: AsyncHomeAssistantClient, entity_ids: dict[str, str]) -> None:
+        self._client = client
+        self._keys_by_entity = {entity_id: key for key, entity_id in entity_ids.items()}
+        self._states: dict[str, dict[str, Any]] = {}
+        self._changed = threading.Condition()
+        self._version = 0
+        self._ws: Any = None
+        self._receive_task: asyncio.Task | None = None
+        self.origin = time.monotonic()
+        self.timeline: list[dict[str, Any]] = []
+        self.error: str | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed and self.error is None
+
+    @property
+    def version(self) -> int:
+        with self._changed:
+            return self._version
+
+    def offset_ms(self, monotonic_value: float) -> float:
+        return round((monotonic_value - self.origin) * 1000, 1)
+
+    def start(self) -> None:
+        self._client.run(self._connect())
+
+    async def _connect(self) -> None:
+        ws_url = f"{self._client._base_url}/api/websocket"
+        self._ws = await self._client.session.ws_connect(ws_url, heartbeat=WEBSOCKET_HEARTBEAT_S)
+        message = await self._ws.receive_json()
+        if message.get("type") != "auth_required":
+            raise RuntimeError(f"Unexpected websocket greeting: {message}")
+        await self._ws.send_json({"type": "auth", "access_token": self._client._token})
+        message = await self._ws.receive_json()
+        if message.get("type") != "auth_ok":
+            raise RuntimeError(f"Websocket authentication failed: {message.get('message') or message}")
+        await self._ws.send_json({"id": 1, "type": "subscribe_events", "event_type": "state_changed"})
+        message = await self._ws.receive_json()
+        if not message.get("success"):
+            raise RuntimeError(f"Websocket subscription failed: {message.get('error') or message}")
+
+        # Seed after subscribing so no change can fall between the two.
+        states = await self._client.get_states_async(list(self._keys_by_entity))
+        with self._changed:
+            for entity_id, state in states.items():
+                self._states.setdefault(entity_id, state)
+        self._receive_task = asyncio.create_task(self._receive_loop())
+
+    async def _receive_loop(self) -> None:
+        aiohttp = self._client._aiohttp
+        try:
+            async for message in self._ws:
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                payload = json.loads(message.data)
+                if payload.get("type") != "event":
+                    continue
+                self._handle_state_changed(payload["event"])
+        except Exception as exc:  # noqa: BLE001
+            self.error = f"{type(exc).__name__}: {exc}"
+        else:
+            self.error = "Websocket closed"
+        with self._changed:
+            self._changed.notify_all()
+
+    def _handle_state_changed(self, event: dict[str, Any]) -> None:
+        data = event.get("data") or {}
+        entity_id = data.get("entity_id")
+        key = self._keys_by_entity.get(entity_id)
+        if key is None:
+            return
+        received = time.monotonic()
+        old_state = data.get("old_state") or {}
+        new_state = data.get("new_state") or {}
+        old_attributes = old_state.get("attributes") or {}
+        new_attributes = new_state.get("attributes") or {}
+        entry = {
+            "offset_ms": self.offset_ms(received),
+            "received_at": datetime.now().isoformat(timespec="milliseconds"),
+            "fired_at": event.get("time_fired"),
+            "key": key,
+            "entity_id": entity_id,
+            "old_state": old_state.get("state"),
+            "new_state": new_state.get("state"),
+            "attributes_changed": {
+                name: new_attributes.get(name)
+                for name in set(old_attributes) | set(new_attributes)
+                if old_attributes.get(name) != new_attributes.get(name)
+            },
+        }
+        with self._changed:
+            self._states[entity_id] = new_state
+            self.timeline.append(entry)
+            self._version += 1
+            self._changed.notify_all()
+
+    def get_states(self) -> dict[str, dict[str, Any]]:
+        with self._changed:
+            return dict(self._states)
+
+    def wait_for_change(self, since_version: int, timeout: float) -> bool:
+        """Block until a tracked entity changes after ``since_version`` or the timeout passes."""
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self._version != since_version or self.error is not None,
+                timeout=max(timeout, 0.0),
+            ) and self._version != since_version
+
+    def events_between(self, start_monotonic: float, end_monotonic: float) -> list[dict[str, Any]]:
+        start_ms = self.offset_ms(start_monotonic)
+        end_ms = self.offset_ms(end_monotonic)
+        with self._changed:
+            return [entry for entry in self.timeline if start_ms <= entry["offset_ms"] <= end_ms]
+
+    def close(self) -> None:
+        if self._ws is None:
+            return
+        self._client.run(self._close())
+
+    async def _close(self) -> None:
+        await self._ws.close()
+        if self._receive_task is not None:
+            await asyncio.gather(self._receive_task, return_exceptions=True)
+
+
+def copy_latest_debug_log(config: RunnerConfig) -> str | None:
+    if not config.copy_debug_log or config.share_path is None:
+        return None
+
+    share_path = config.share_path
+    if not share_path.exists():
+        return None
+
+    candidates = sorted(
+        share_path.rglob("trimlight_debug_*.jsonl"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    if not candidates:
+        return None
+
+    latest = candidates[0]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    destination = config.output_dir / f"{timestamp}_{latest.name}"
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(latest, destination)
+    return str(destination)
+
+
+def create_client(config: RunnerConfig) -> HomeAssistantClient | AsyncHomeAssistantClient:
+    if config.async_client or config.websocket:
+        return AsyncHomeAssistantClient(
             config.ha_url,
             config.token,
             verify_ssl=config.verify_ssl,
+            max_connections=ASYNC_CLIENT_MAX_CONNECTIONS * min(config.max_concurrent_devices, len(config.devices) or 1),
         )
+    return HomeAssistantClient(config.ha_url, config.token, verify_ssl=config.verify_ssl)
+
+
+class TrimlightTestRunner:
+    def __init__(
+        self,
+        config: RunnerConfig,
+        *,
+        client: HomeAssistantClient | AsyncHomeAssistantClient | None = None,
+    ) -> None:
+        self.config = config
+        self._owns_client = client is None
+        self.client = client if client is not None else create_client(config)
+        self.events: HomeAssistantEventStream | None = None
+        if config.websocket:
+            self.events = HomeAssistantEventStream(self.client, config.entity_ids)
+            try:
+                self.events.start()
+            except Exception:
+                if self._owns_client:
+                    self.client.close()
+                raise
         self.run_started_at = now_iso()
         self.report: dict[str, Any] = {
             "started_at": self.run_started_at,
             "ha_url": config.ha_url,
+            "device": config.devices[0].name if config.devices else None,
+            "client": "async" if isinstance(self.client, AsyncHomeAssistantClient) else "sync",
+            "state_source": "websocket" if config.websocket else "rest",
             "share_path": str(config.share_path) if config.share_path else None,
             "scenarios": [],
             "copied_debug_log": None,
@@ -229,8 +771,12 @@ class TrimlightTestRunner:
 
     def capture_snapshot(self) -> dict[str, Any]:
         entities: dict[str, Any] = {}
+        if self.events is not None and self.events.connected:
+            states = self.events.get_states()
+        else:
+            states = self.client.get_states(list(self.config.entity_ids.values()))
         for key, entity_id in self.config.entity_ids.items():
-            state = self.client.get_state(entity_id)
+            state = states[entity_id]
             entities[key] = {
                 "entity_id": entity_id,
                 "state": state.get("state"),
@@ -262,28 +808,26 @@ class TrimlightTestRunner:
     ) -> tuple[dict[str, Any], dict[str, Any]]:
         before = self.capture_snapshot()
         started_at = now_iso()
+        started = time.monotonic()
         response = self.client.call_service(domain, service, service_data)
+        service_duration_s = time.monotonic() - started
 
-        capture_after = self.config.timing_s["capture_after_action"]
-        self.sleep(capture_after)
-        after_action = self.capture_snapshot()
-
-        remaining = max(float(settle_s) - capture_after, 0.0)
-        settled = after_action
-        condition_met = settle_condition(after_action) if settle_condition else None
-        deadline = time.monotonic() + remaining
-
+        convergence: dict[str, Any] | None = None
+        condition_met = None
         if settle_condition is None:
-            self.sleep(remaining)
+            capture_after = self.config.timing_s["capture_after_action"]
+            self.sleep(capture_after)
+            after_action = self.capture_snapshot()
+            self.sleep(max(float(settle_s) - capture_after, 0.0))
             settled = self.capture_snapshot()
         else:
-            while time.monotonic() < deadline:
-                sleep_for = min(1.0, max(deadline - time.monotonic(), 0.0))
-                if sleep_for <= 0:
-                    break
-                self.sleep(sleep_for)
-                settled = self.capture_snapshot()
-                condition_met = bool(condition_met) or settle_condition(settled)
+            after_action, settled, convergence = self.wait_until_converged(
+                settle_condition,
+                started=started,
+                timeout_s=float(settle_s),
+                hold_s=self.config.timing_s["stable_hold"],
+            )
+            condition_met = convergence["time_to_first_correct_s"] is not None
 
         step = {
             "name": name,
@@ -299,9 +843,83 @@ class TrimlightTestRunner:
             "checks": [],
             "passed": True,
             "settle_condition_met": condition_met,
+            "service_duration_s": round(service_duration_s, 3),
+            "convergence": convergence,
         }
+        if self.events is not None:
+            step["timeline_offset_ms"] = self.events.offset_ms(started)
+            step["timeline"] = self.events.events_between(started, time.monotonic())
         return step, settled
 
+    def wait_until_converged(
+        self,
+        condition: Callable[[dict[str, Any]], bool],
+        *,
+        started: float,
+        timeout_s: float,
+        hold_s: float,
+    ) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+        """Poll until ``condition`` has held for ``hold_s`` without flapping, or until the timeout.
+
+        Times are measured from ``started``, just before the service call.
+        With the websocket feed the condition is re-checked on each state change
+        instead of every ``poll_interval``.
+        Returns the after-action snapshot, the final snapshot, and the convergence metrics.
+        """
+        poll_interval = self.config.timing_s["poll_interval"]
+        capture_after = self.config.timing_s["capture_after_action"]
+        deadline = started + timeout_s
+        after_action: dict[str, Any] | None = None
+        first_correct_s: float | None = None
+        stable_since_s: float | None = None
+        converged = False
+        flaps = 0
+        polls = 0
+
+        while True:
+            version = self.events.version if self.events is not None else 0
+            snapshot = self.capture_snapshot()
+            polls += 1
+            elapsed = time.monotonic() - started
+            if after_action is None and elapsed >= capture_after:
+                after_action = snapshot
+            if condition(snapshot):
+                if first_correct_s is None:
+                    first_correct_s = elapsed
+                if stable_since_s is None:
+                    stable_since_s = elapsed
+                if elapsed - stable_since_s >= hold_s:
+                    converged = True
+                    break
+            else:
+                if stable_since_s is not None:
+                    flaps += 1
+                stable_since_s = None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self.events is not None and self.events.connected:
+                elapsed = time.monotonic() - started
+                wake_after = remaining
+                if stable_since_s is not None:
+                    wake_after = min(wake_after, stable_since_s + hold_s - elapsed)
+                if after_action is None:
+                    wake_after = min(wake_after, capture_after - elapsed)
+                self.events.wait_for_change(version, wake_after)
+            else:
+                self.sleep(min(poll_interval, remaining))
+
+        convergence = {
+            "converged": converged,
+            "time_to_first_correct_s": round(first_correct_s, 3) if first_correct_s is not None else None,
+            "time_to_stable_s": round(stable_since_s, 3) if converged and stable_since_s is not None else None,
+            "flaps": flaps,
+            "polls": polls,
+            "timeout_s": timeout_s,
+            "hold_s": hold_s,
+        }
+        return after_action or snapshot, snapshot, convergence
+
     def add_checks(self, step: dict[str, Any], checks: list[dict[str, Any]]) -> None:
         step["checks"] = checks
         step["passed"] = all(check["passed"] for check in checks)
@@ -527,24 +1145,27 @@ class TrimlightTestRunner:
         self.add_checks(step, checks)
         return step
 
-    def run_scenario(self, name: str) -> dict[str, Any]:
+    def run_scenario(self, name: str, *, iteration: int = 1) -> dict[str, Any]:
         handler = getattr(self, f"scenario_{name}", None)
         if handler is None:
             raise RuntimeError(f"Unknown scenario '{name}'.")
 
         scenario: dict[str, Any] = {
             "name": name,
+            "iteration": iteration,
             "started_at": now_iso(),
             "steps": [],
             "passed": True,
             "error": None,
         }
+        started = time.monotonic()
         try:
             handler(scenario)
         except Exception as exc:  # noqa: BLE001
             scenario["passed"] = False
             scenario["error"] = str(exc)
         scenario["finished_at"] = now_iso()
+        scenario["duration_s"] = round(time.monotonic() - started, 3)
         scenario["passed"] = scenario["passed"] and all(step["passed"] for step in scenario["steps"])
         self.report["scenarios"].append(scenario)
         return scenario
@@ -639,34 +1260,106 @@ class TrimlightTestRunner:
             )
         )
 
-    def copy_latest_debug_log(self) -> str | None:
-        if not self.config.copy_debug_log or self.config.share_path is None:
-            return None
+    def close(self) -> None:
+        if self.events is not None:
+            if self.events.error:
+                self.report["websocket_error"] = self.events.error
+            self.report["timeline"] = self.events.timeline
+            self.events.close()
+        if self._owns_client:
+            self.client.close()
+
+    def run_iterations(self, scenarios: list[str]) -> None:
+        """Run the scenarios ``repeat`` times; repeated runs shuffle the order each iteration."""
+        rng = random.Random(self.config.seed)
+        self.report["repeat"] = self.config.repeat
+        self.report["seed"] = self.config.seed
+        self.report["iterations"] = []
+        for iteration in range(1, self.config.repeat + 1):
+            order = list(scenarios)
+            if self.config.repeat > 1:
+                rng.shuffle(order)
+            self.report["iterations"].append(order)
+            for scenario_name in order:
+                self.run_scenario(scenario_name, iteration=iteration)
+        self.report["statistics"] = compute_statistics(self.report["scenarios"])
 
-        share_path = self.config.share_path
-        if not share_path.exists():
-            return None
+    def write_report(self) -> Path:
+        self.report["finished_at"] = now_iso()
+        self.report["copied_debug_log"] = copy_latest_debug_log(self.config)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = self.config.output_dir / f"trimlight_test_run_{timestamp}.json"
+        dump_json(report_path, self.report)
+        return report_path
 
-        candidates = sorted(
-            share_path.rglob("trimlight_debug_*.jsonl"),
-            key=lambda path: path.stat().st_mtime,
-            reverse=True,
-        )
-        if not candidates:
-            return None
 
-        latest = candidates[0]
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        destination = self.config.output_dir / f"{timestamp}_{latest.name}"
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(latest, destination)
-        return str(destination)
+class FleetTestRunner:
+    """Runs the scenario set on several devices at once.
+
+    Each device gets its own TrimlightTestRunner, so steps stay strictly
+    serialized within a device; up to ``max_concurrent_devices`` devices run
+    in parallel threads over one shared Home Assistant client.
+    """
+
+    def __init__(self, config: RunnerConfig) -> None:
+        self.config = config
+        self.client = create_client(config)
+        self.device_reports: dict[str, dict[str, Any]] = {}
+        self.report: dict[str, Any] = {
+            "started_at": now_iso(),
+            "ha_url": config.ha_url,
+            "client": "async" if isinstance(self.client, AsyncHomeAssistantClient) else "sync",
+            "state_source": "websocket" if config.websocket else "rest",
+            "share_path": str(config.share_path) if config.share_path else None,
+            "repeat": config.repeat,
+            "seed": config.seed,
+            "max_concurrent_devices": config.max_concurrent_devices,
+            "devices": self.device_reports,
+            "scenarios": [],
+            "copied_debug_log": None,
+        }
+
+    def _run_device(self, index: int, device: DeviceConfig, scenarios: list[str]) -> dict[str, Any]:
+        started = time.monotonic()
+        try:
+            runner = TrimlightTestRunner(self.config.for_device(device, index), client=self.client)
+        except Exception as exc:  # noqa: BLE001
+            return {"device": device.name, "error": str(exc), "scenarios": [], "passed": False}
+        try:
+            runner.run_iterations(scenarios)
+        finally:
+            runner.close()
+        report = runner.report
+        report["wall_time_s"] = round(time.monotonic() - started, 3)
+        report["passed"] = all(scenario["passed"] for scenario in report["scenarios"])
+        return report
+
+    def run_iterations(self, scenarios: list[str]) -> None:
+        started = time.monotonic()
+        workers = min(self.config.max_concurrent_devices, len(self.config.devices))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="trimlight-device") as executor:
+            futures = [
+                executor.submit(self._run_device, index, device, scenarios)
+                for index, device in enumerate(self.config.devices)
+            ]
+            for device, future in zip(self.config.devices, futures):
+                self.device_reports[device.name] = future.result()
+
+        for name, device_report in self.device_reports.items():
+            for scenario in device_report["scenarios"]:
+                self.report["scenarios"].append({**scenario, "device": name})
+        self.report["wall_time_s"] = round(time.monotonic() - started, 3)
+        self.report["statistics"] = compute_statistics(self.report["scenarios"])
+        self.report["passed"] = all(report["passed"] for report in self.device_reports.values())
+
+    def close(self) -> None:
+        self.client.close()
 
     def write_report(self) -> Path:
         self.report["finished_at"] = now_iso()
-        self.report["copied_debug_log"] = self.copy_latest_debug_log()
+        self.report["copied_debug_log"] = copy_latest_debug_log(self.config)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_path = self.config.output_dir / f"trimlight_test_run_{timestamp}.json"
+        report_path = self.config.output_dir / f"trimlight_fleet_run_{timestamp}.json"
         dump_json(report_path, self.report)
         return report_path
 
@@ -683,6 +1376,41 @@ def build_arg_parser() -> argparse.ArgumentParser:
         action="append",
         help="Run only the named scenario. Repeat to run more than one. Defaults to the standard scenario set.",
     )
+    parser.add_argument(
+        "--async-client",
+        action="store_true",
+        help="Use the asyncio client: pooled aiohttp session and concurrent snapshot fetches.",
+    )
+    parser.add_argument(
+        "--websocket",
+        action="store_true",
+        help="Track entity states through the websocket state_changed feed instead of REST polling. Implies --async-client.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        help="Run the scenario set N times in a shuffled order each time and report latency and flake statistics.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed for the scenario order of repeated runs.",
+    )
+    parser.add_argument(
+        "--compare",
+        help="Earlier report (or statistics JSON) to compare latency distributions and flake rates against.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help=f"Median slowdown fraction that can count as a regression. Defaults to {DEFAULT_REGRESSION_THRESHOLD}.",
+    )
+    parser.add_argument(
+        "--max-concurrent-devices",
+        type=int,
+        help=f"How many devices from the 'devices' list run at the same time. Defaults to {DEFAULT_MAX_CONCURRENT_DEVICES}.",
+    )
     parser.add_argument(
         "--list-scenarios",
         action="store_true",
@@ -700,18 +1428,68 @@ def print_summary(report: dict[str, Any], report_path: Path) -> None:
     print()
     for scenario in report["scenarios"]:
         status = "PASS" if scenario["passed"] else "FAIL"
-        print(f"[{status}] {scenario['name']}")
+        label = scenario["name"]
+        if scenario.get("device"):
+            label = f"{scenario['device']}: {label}"
+        if report.get("repeat", 1) > 1:
+            label = f"{label} (run {scenario['iteration']})"
+        print(f"[{status}] {label}")
         if scenario.get("error"):
             print(f"  Error: {scenario['error']}")
         for step in scenario["steps"]:
             step_status = "PASS" if step["passed"] else "FAIL"
-            print(f"  [{step_status}] {step['name']}")
+            convergence = step.get("convergence")
+            timing = ""
+            if convergence:
+                first_correct = convergence["time_to_first_correct_s"]
+                stable = convergence["time_to_stable_s"]
+                timing = (
+                    f" (first correct {first_correct if first_correct is not None else '-'}s,"
+                    f" stable {stable if stable is not None else '-'}s, flaps {convergence['flaps']})"
+                )
+            print(f"  [{step_status}] {step['name']}{timing}")
             for check in step["checks"]:
                 if not check["passed"]:
                     print(
                         f"    - {check['name']}: expected {check['expected']!r}, got {check['actual']!r}"
                     )
 
+    device_reports = report.get("devices")
+    if device_reports:
+        print()
+        print(f"Devices ({report['max_concurrent_devices']} at a time, {report['wall_time_s']}s wall time):")
+        for name, device_report in device_reports.items():
+            status = "PASS" if device_report["passed"] else "FAIL"
+            detail = device_report.get("error") or f"{device_report.get('wall_time_s')}s"
+            print(f"  [{status}] {name} ({detail})")
+
+    statistics = report.get("statistics")
+    if statistics and report.get("repeat", 1) > 1:
+        print()
+        print(f"{'scenario':<28} {'runs':>4} {'flake':>6} {'min':>7} {'median':>7} {'p95':>7} {'max':>7}  (time to stable, s)")
+        for name, stats in statistics["scenarios"].items():
+            latency = stats["time_to_stable_s"]
+            columns = (
+                " ".join(f"{latency[key]:>7.2f}" for key in ("min", "median", "p95", "max"))
+                if latency["count"]
+                else f"{'-':>7} {'-':>7} {'-':>7} {'-':>7}"
+            )
+            print(f"{name:<28} {stats['runs']:>4} {stats['flake_rate']:>6.0%} {columns}")
+
+    comparison = report.get("comparison")
+    if comparison:
+        print()
+        print(f"Compared with: {comparison['baseline']}")
+        for result in comparison["results"]:
+            if result["verdict"] not in {"regression", "improvement"}:
+                continue
+            print(
+                f"  {result['verdict'].upper():<11} {result['metric']}: {result['baseline_median']} -> {result['median']}"
+                f" ({result['change']:+.1%}, p={result['p_value']})"
+            )
+        if not comparison["regressions"] and not comparison["improvements"]:
+            print("  No statistically meaningful changes.")
+
 
 def main() -> int:
     parser = build_arg_parser()
@@ -744,13 +1522,51 @@ def main() -> int:
         print(f"Available scenarios: {available}", file=sys.stderr)
         return 2
 
-    runner = TrimlightTestRunner(config)
-    for scenario_name in scenarios:
-        runner.run_scenario(scenario_name)
+    if args.async_client:
+        config.async_client = True
+    if args.websocket:
+        config.websocket = True
+    if args.repeat is not None:
+        config.repeat = max(args.repeat, 1)
+    if args.seed is not None:
+        config.seed = args.seed
+    if args.max_concurrent_devices is not None:
+        config.max_concurrent_devices = max(args.max_concurrent_devices, 1)
+
+    baseline: dict[str, Any] | None = None
+    if args.compare:
+        baseline_path = to_path(args.compare)
+        try:
+            baseline = load_baseline_statistics(baseline_path)
+        except Exception as exc:  # noqa: BLE001
+            print(f"Failed to load comparison baseline: {exc}", file=sys.stderr)
+            return 2
+
+    try:
+        if len(config.devices) > 1:
+            runner: TrimlightTestRunner | FleetTestRunner = FleetTestRunner(config)
+        else:
+            runner = TrimlightTestRunner(config.for_device(config.devices[0]))
+    except Exception as exc:  # noqa: BLE001
+        print(str(exc), file=sys.stderr)
+        return 2
+    try:
+        runner.run_iterations(scenarios)
+    finally:
+        runner.close()
+
+    if baseline is not None:
+        runner.report["comparison"] = {
+            "baseline": str(to_path(args.compare)),
+            **compare_statistics(runner.report["statistics"], baseline, threshold=args.threshold),
+        }
 
     report_path = runner.write_report()
     print_summary(runner.report, report_path)
-    return 0 if all(s["passed"] for s in runner.report["scenarios"]) else 1
+    if runner.report.get("comparison", {}).get("regressions"):
+        return 1
+    passed = runner.report.get("passed", all(s["passed"] for s in runner.report["scenarios"]))
+    return 0 if passed else 1
 
 
 if __name__ == "__main__":